@@ -0,0 +1,40 @@
+"""partial (user_id, created_at DESC, id DESC) index on live ocr_documents
+
+Revision ID: 0701812c3bd0
+Revises: 7461d1985024
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0701812c3bd0'
+down_revision: Union[str, Sequence[str], None] = '7461d1985024'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the per-user, newest-first document listing."""
+    # GET /documents/ pages WHERE user_id = :u AND is_deleted = false ORDER BY
+    # created_at DESC, id DESC; this index returns rows already in that order,
+    # so the page is a bounded index scan with no sort step.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_ocr_documents_user_created_active',
+            'ocr_documents',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop the per-user listing index."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_ocr_documents_user_created_active', table_name='ocr_documents', postgresql_concurrently=True)
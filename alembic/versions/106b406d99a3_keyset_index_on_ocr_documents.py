@@ -0,0 +1,39 @@
+"""(user_id, is_deleted, id DESC) keyset index on ocr_documents
+
+Revision ID: 106b406d99a3
+Revises: 5773137e6460
+Create Date: 2026-10-16 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '106b406d99a3'
+down_revision: Union[str, Sequence[str], None] = '5773137e6460'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Extend the (user_id, is_deleted) index with id DESC for keyset pagination."""
+    # The new index has the old one as its prefix, so the old one is dropped.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_ocr_documents_user_deleted_id',
+            'ocr_documents',
+            ['user_id', 'is_deleted', sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_ocr_documents_user_deleted', table_name='ocr_documents', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Restore the two-column index."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_ocr_documents_user_deleted', 'ocr_documents', ['user_id', 'is_deleted'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_ocr_documents_user_deleted_id', table_name='ocr_documents', postgresql_concurrently=True)
@@ -0,0 +1,50 @@
+"""partial indexes on nullable users.google_id / free_trial_users.cookie_id
+
+Revision ID: 1337454545f3
+Revises: d010182b3386
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1337454545f3'
+down_revision: Union[str, Sequence[str], None] = 'd010182b3386'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _swap_index(table: str, column: str, name: str, unique: bool, partial: bool) -> None:
+    """Build the replacement under a temp name, drop the old one, then take over its name."""
+    tmp_name = f"{name}_new"
+    op.create_index(
+        tmp_name,
+        table,
+        [column],
+        unique=unique,
+        postgresql_concurrently=True,
+        postgresql_where=sa.text(f"{column} IS NOT NULL") if partial else None,
+    )
+    op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    op.execute(f"ALTER INDEX {tmp_name} RENAME TO {name}")
+
+
+def upgrade() -> None:
+    """Index only rows that actually carry a google_id / cookie_id."""
+    # Local-auth users and cookie-less trials are the majority; NULLs never
+    # match an equality lookup, so keeping them in the btree is pure bloat.
+    # The unique index is swapped without a window where uniqueness is unenforced.
+    with op.get_context().autocommit_block():
+        _swap_index('users', 'google_id', 'ix_users_google_id', unique=True, partial=True)
+        _swap_index('free_trial_users', 'cookie_id', 'ix_free_trial_users_cookie_id', unique=False, partial=True)
+
+
+def downgrade() -> None:
+    """Restore full-column indexes."""
+    with op.get_context().autocommit_block():
+        _swap_index('users', 'google_id', 'ix_users_google_id', unique=True, partial=False)
+        _swap_index('free_trial_users', 'cookie_id', 'ix_free_trial_users_cookie_id', unique=False, partial=False)
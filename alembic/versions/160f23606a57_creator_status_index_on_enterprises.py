@@ -0,0 +1,35 @@
+"""composite (created_by, payment_status) index on enterprises
+
+Revision ID: 160f23606a57
+Revises: de26481233b0
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '160f23606a57'
+down_revision: Union[str, Sequence[str], None] = 'de26481233b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add a (created_by, payment_status) index for per-admin status breakdowns."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_enterprises_creator_status',
+            'enterprises',
+            ['created_by', 'payment_status'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop the creator/status index."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_enterprises_creator_status', table_name='enterprises', postgresql_concurrently=True)
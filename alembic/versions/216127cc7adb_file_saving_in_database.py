@@ -22,8 +22,10 @@ def upgrade() -> None:
     """Upgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
     op.add_column('ocr_documents', sa.Column('file_path', sa.String(length=512), nullable=True))
-    op.create_index(op.f('ix_ocr_documents_file_path'), 'ocr_documents', ['file_path'], unique=False)
     # ### end Alembic commands ###
+    # Build outside the migration transaction so writes aren't blocked meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_ocr_documents_file_path'), 'ocr_documents', ['file_path'], unique=False, postgresql_concurrently=True)
 
 
 def downgrade() -> None:
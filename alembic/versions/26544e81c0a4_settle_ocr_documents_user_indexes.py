@@ -0,0 +1,51 @@
+"""settle the ocr_documents per-user indexes on one (user_id, id DESC) btree
+
+Revision ID: 26544e81c0a4
+Revises: 85e7150a079b
+Create Date: 2026-10-16 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '26544e81c0a4'
+down_revision: Union[str, Sequence[str], None] = '85e7150a079b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the partial (user_id, id DESC) index and the plain user_id index with one full index."""
+    # Per-user document pages seek on (user_id, id DESC).  Building that index
+    # over every row instead of only live ones lets it also answer the FK check
+    # on user deletion and super-user include_deleted lookups, so the
+    # single-column user_id index is redundant and goes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_ocr_documents_user_id_desc',
+            'ocr_documents',
+            ['user_id', sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_ocr_documents_user_active', table_name='ocr_documents', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_ocr_documents_user_id'), table_name='ocr_documents', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Restore the partial live-row index and the plain user_id index."""
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_ocr_documents_user_id'), 'ocr_documents', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(
+            'ix_ocr_documents_user_active',
+            'ocr_documents',
+            ['user_id', sa.text('id DESC')],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_ocr_documents_user_id_desc', table_name='ocr_documents', postgresql_concurrently=True)
@@ -0,0 +1,58 @@
+"""(created_at DESC, id DESC) keyset indexes for newest-first listings
+
+Revision ID: 2f6b2f1a481b
+Revises: 9f74b7c9f87b
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6b2f1a481b'
+down_revision: Union[str, Sequence[str], None] = '9f74b7c9f87b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the (created_at, id) cursor used by document and enterprise OCR histories."""
+    # Cursor pages seek WHERE (created_at, id) < (:ts, :id) ORDER BY created_at
+    # DESC, id DESC; matching indexes make each page an index range scan.
+    # The per-enterprise index leads with enterprise_id, so it replaces the
+    # single-column one for FK lookups as well.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_ocr_documents_created_id',
+            'ocr_documents',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_enterprise_ocr_documents_created_id',
+            'enterprise_ocr_documents',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_enterprise_ocr_documents_enterprise_created',
+            'enterprise_ocr_documents',
+            ['enterprise_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(op.f('ix_enterprise_ocr_documents_enterprise_id'), table_name='enterprise_ocr_documents', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Restore the single-column enterprise_id index and drop the keyset indexes."""
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_enterprise_ocr_documents_enterprise_id'), 'enterprise_ocr_documents', ['enterprise_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_enterprise_ocr_documents_enterprise_created', table_name='enterprise_ocr_documents', postgresql_concurrently=True)
+        op.drop_index('ix_enterprise_ocr_documents_created_id', table_name='enterprise_ocr_documents', postgresql_concurrently=True)
+        op.drop_index('ix_ocr_documents_created_id', table_name='ocr_documents', postgresql_concurrently=True)
@@ -32,8 +32,9 @@ def upgrade() -> None:
         ['id']
     )
     
-    # Create index on user_id
-    op.create_index(op.f('ix_ocr_documents_user_id'), 'ocr_documents', ['user_id'], unique=False)
+    # Create index on user_id (concurrently, outside the transaction, so writes aren't blocked)
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_ocr_documents_user_id'), 'ocr_documents', ['user_id'], unique=False, postgresql_concurrently=True)
     
     # Note: In production, you would need to set user_id values for existing rows
     # before making it non-nullable. For now, we'll leave it nullable to avoid issues.
@@ -0,0 +1,38 @@
+"""composite (user_id, is_deleted) index on ocr_documents
+
+Revision ID: 487981bffe0a
+Revises: d1e2f3a4b5c6
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '487981bffe0a'
+down_revision: Union[str, Sequence[str], None] = 'd1e2f3a4b5c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the single-column user_id / is_deleted indexes with one composite index."""
+    # Every per-user listing filters on user_id AND is_deleted, so a single
+    # composite btree answers the WHERE clause in one lookup.  The leading
+    # user_id column also serves plain user_id lookups (FK checks, counts).
+    with op.get_context().autocommit_block():
+        op.create_index('ix_ocr_documents_user_deleted', 'ocr_documents', ['user_id', 'is_deleted'], unique=False, postgresql_concurrently=True)
+
+        # A boolean index on its own is too low-cardinality to be useful.
+        op.drop_index(op.f('ix_ocr_documents_is_deleted'), table_name='ocr_documents', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_ocr_documents_user_id'), table_name='ocr_documents', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Restore the original single-column indexes."""
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_ocr_documents_user_id'), 'ocr_documents', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_ocr_documents_is_deleted'), 'ocr_documents', ['is_deleted'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_ocr_documents_user_deleted', table_name='ocr_documents', postgresql_concurrently=True)
@@ -23,8 +23,9 @@ def upgrade() -> None:
     # Add is_deleted column with default False
     op.add_column('ocr_documents', sa.Column('is_deleted', sa.Boolean(), nullable=False, server_default='false'))
     
-    # Create index on is_deleted
-    op.create_index(op.f('ix_ocr_documents_is_deleted'), 'ocr_documents', ['is_deleted'], unique=False)
+    # Create index on is_deleted (concurrently, outside the transaction, so writes aren't blocked)
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_ocr_documents_is_deleted'), 'ocr_documents', ['is_deleted'], unique=False, postgresql_concurrently=True)
 
 
 def downgrade() -> None:
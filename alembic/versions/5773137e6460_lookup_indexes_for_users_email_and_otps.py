@@ -0,0 +1,49 @@
+"""lower(email) unique index on users; (email, created_at) index on email_otps
+
+Revision ID: 5773137e6460
+Revises: 1337454545f3
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5773137e6460'
+down_revision: Union[str, Sequence[str], None] = '1337454545f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # get_user_by_email compares lower(email); fails if case-only duplicates exist
+        op.create_index(
+            'ix_users_email_lower',
+            'users',
+            [sa.text('lower(email)')],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        # resend-otp reads the newest row per email; the leading column also
+        # covers plain email lookups, so the single-column index goes.
+        op.create_index(
+            'ix_email_otps_email_created',
+            'email_otps',
+            ['email', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_email_otps_email', table_name='email_otps', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_email_otps_email', 'email_otps', ['email'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_email_otps_email_created', table_name='email_otps', postgresql_concurrently=True)
+        op.drop_index('ix_users_email_lower', table_name='users', postgresql_concurrently=True)
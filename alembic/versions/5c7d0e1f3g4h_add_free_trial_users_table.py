@@ -34,18 +34,13 @@ def upgrade() -> None:
         sa.Column('user_agent', sa.String(length=500), nullable=True),
         sa.Column('ip_address', sa.String(length=45), nullable=True),
         sa.Column('is_blocked', sa.Boolean(), nullable=False, server_default='false'),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id'),
+        # Indexes for fast lookups, declared with the table
+        sa.Index('ix_free_trial_users_device_id', 'device_id', unique=True),
+        sa.Index('ix_free_trial_users_cookie_id', 'cookie_id'),
     )
-    
-    # Create indexes for fast lookups
-    op.create_index(op.f('ix_free_trial_users_id'), 'free_trial_users', ['id'], unique=False)
-    op.create_index(op.f('ix_free_trial_users_device_id'), 'free_trial_users', ['device_id'], unique=True)
-    op.create_index(op.f('ix_free_trial_users_cookie_id'), 'free_trial_users', ['cookie_id'], unique=False)
 
 
 def downgrade() -> None:
     """Drop free_trial_users table"""
-    op.drop_index(op.f('ix_free_trial_users_cookie_id'), table_name='free_trial_users')
-    op.drop_index(op.f('ix_free_trial_users_device_id'), table_name='free_trial_users')
-    op.drop_index(op.f('ix_free_trial_users_id'), table_name='free_trial_users')
     op.drop_table('free_trial_users')
@@ -8,7 +8,6 @@ Create Date: 2026-02-22 12:00:00.000000
 from typing import Sequence, Union
 
 from alembic import op
-import sqlalchemy as sa
 
 
 # revision identifiers, used by Alembic.
@@ -20,13 +19,20 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Add subscription / free-trial quota columns to the users table."""
-    op.add_column('users', sa.Column('free_ocr_used', sa.Integer(), nullable=False, server_default='0'))
-    op.add_column('users', sa.Column('subscription_pages_total', sa.Integer(), nullable=False, server_default='0'))
-    op.add_column('users', sa.Column('subscription_pages_used', sa.Integer(), nullable=False, server_default='0'))
+    # One ALTER TABLE → one ACCESS EXCLUSIVE lock; constant DEFAULTs are metadata-only on PG11+
+    op.execute(
+        "ALTER TABLE users "
+        "ADD COLUMN free_ocr_used INTEGER NOT NULL DEFAULT 0, "
+        "ADD COLUMN subscription_pages_total INTEGER NOT NULL DEFAULT 0, "
+        "ADD COLUMN subscription_pages_used INTEGER NOT NULL DEFAULT 0"
+    )
 
 
 def downgrade() -> None:
     """Remove subscription / free-trial quota columns from the users table."""
-    op.drop_column('users', 'subscription_pages_used')
-    op.drop_column('users', 'subscription_pages_total')
-    op.drop_column('users', 'free_ocr_used')
+    op.execute(
+        "ALTER TABLE users "
+        "DROP COLUMN subscription_pages_used, "
+        "DROP COLUMN subscription_pages_total, "
+        "DROP COLUMN free_ocr_used"
+    )
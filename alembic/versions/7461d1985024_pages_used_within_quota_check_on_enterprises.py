@@ -0,0 +1,43 @@
+"""CHECK pages_used <= total_pages on enterprises
+
+Revision ID: 7461d1985024
+Revises: 78167100bf06
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7461d1985024'
+down_revision: Union[str, Sequence[str], None] = '78167100bf06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Contracts already charged past their allocation (fallback or engine page
+    # counts) would fail the check — and a NOT VALID check is still enforced on
+    # every later UPDATE of those rows. Grow their allocation to what was
+    # actually consumed so every row satisfies it; billed amounts are untouched.
+    op.execute("UPDATE enterprises SET total_pages = pages_used WHERE pages_used > total_pages")
+
+    # NOT VALID only takes a brief ACCESS EXCLUSIVE lock and enforces the check
+    # on new writes straight away.
+    op.execute(
+        "ALTER TABLE enterprises ADD CONSTRAINT ck_enterprises_pages_used_within_quota "
+        "CHECK (pages_used <= total_pages) NOT VALID"
+    )
+    # VALIDATE scans existing rows under SHARE UPDATE EXCLUSIVE, which does not
+    # block writes — but only once the ADD above has committed, so it runs in
+    # its own transaction.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE enterprises VALIDATE CONSTRAINT ck_enterprises_pages_used_within_quota")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ck_enterprises_pages_used_within_quota', 'enterprises', type_='check')
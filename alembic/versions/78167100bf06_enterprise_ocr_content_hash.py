@@ -0,0 +1,40 @@
+"""content_hash on enterprise_ocr_documents for OCR result reuse
+
+Revision ID: 78167100bf06
+Revises: 2f6b2f1a481b
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '78167100bf06'
+down_revision: Union[str, Sequence[str], None] = '2f6b2f1a481b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable with no default — a catalog-only change, existing rows are untouched
+    op.add_column('enterprise_ocr_documents', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    # Build outside the migration transaction so writes aren't blocked meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_enterprise_ocr_documents_enterprise_hash',
+            'enterprise_ocr_documents',
+            ['enterprise_id', 'content_hash'],
+            unique=False,
+            postgresql_where=sa.text('content_hash IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_enterprise_ocr_documents_enterprise_hash', table_name='enterprise_ocr_documents')
+    op.drop_column('enterprise_ocr_documents', 'content_hash')
@@ -41,18 +41,13 @@ def upgrade() -> None:
         sa.Column('paid_at', sa.DateTime(timezone=True), nullable=True),
         sa.ForeignKeyConstraint(['user_id'], ['users.id']),
         sa.PrimaryKeyConstraint('id'),
+        sa.Index('ix_payment_history_invoice_number', 'invoice_number', unique=True),
+        sa.Index('ix_payment_history_user_id', 'user_id'),
+        sa.Index('ix_payment_history_status', 'status'),
     )
-    op.create_index(op.f('ix_payment_history_id'), 'payment_history', ['id'], unique=False)
-    op.create_index(op.f('ix_payment_history_invoice_number'), 'payment_history', ['invoice_number'], unique=True)
-    op.create_index(op.f('ix_payment_history_user_id'), 'payment_history', ['user_id'], unique=False)
-    op.create_index(op.f('ix_payment_history_status'), 'payment_history', ['status'], unique=False)
 
 
 def downgrade() -> None:
     """Drop the payment_history table."""
-    op.drop_index(op.f('ix_payment_history_status'), table_name='payment_history')
-    op.drop_index(op.f('ix_payment_history_user_id'), table_name='payment_history')
-    op.drop_index(op.f('ix_payment_history_invoice_number'), table_name='payment_history')
-    op.drop_index(op.f('ix_payment_history_id'), table_name='payment_history')
     op.drop_table('payment_history')
     op.execute("DROP TYPE IF EXISTS paymentstatus")
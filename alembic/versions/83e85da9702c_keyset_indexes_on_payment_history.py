@@ -0,0 +1,47 @@
+"""newest-first (created_at DESC, id DESC) listing indexes on payment_history
+
+Revision ID: 83e85da9702c
+Revises: 0701812c3bd0
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '83e85da9702c'
+down_revision: Union[str, Sequence[str], None] = '0701812c3bd0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_NEWEST_FIRST = [sa.text('created_at DESC'), sa.text('id DESC')]
+
+
+def upgrade() -> None:
+    """Index the newest-first payment history listings and drop the indexes they subsume."""
+    # /payment/history and /payment/admin/all page ORDER BY created_at DESC,
+    # id DESC (optionally seeked past a (created_at, id) cursor). These indexes
+    # return rows in that order, so each page is a bounded index scan with no sort.
+    # The leading user_id / status columns still serve plain lookups on them.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_payment_history_user_created', 'payment_history', ['user_id', *_NEWEST_FIRST], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_payment_history_status_created', 'payment_history', ['status', *_NEWEST_FIRST], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_payment_history_created_id', 'payment_history', _NEWEST_FIRST, unique=False, postgresql_concurrently=True)
+
+        op.drop_index('ix_payment_history_user_id', table_name='payment_history', postgresql_concurrently=True)
+        op.drop_index('ix_payment_history_status', table_name='payment_history', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Restore the single-column user_id / status indexes."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_payment_history_status', 'payment_history', ['status'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_payment_history_user_id', 'payment_history', ['user_id'], unique=False, postgresql_concurrently=True)
+
+        op.drop_index('ix_payment_history_created_id', table_name='payment_history', postgresql_concurrently=True)
+        op.drop_index('ix_payment_history_status_created', table_name='payment_history', postgresql_concurrently=True)
+        op.drop_index('ix_payment_history_user_created', table_name='payment_history', postgresql_concurrently=True)
@@ -0,0 +1,95 @@
+"""backfill ocr_documents.user_id in batches and make sure it is NOT NULL
+
+Revision ID: 85e7150a079b
+Revises: 83e85da9702c
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '85e7150a079b'
+down_revision: Union[str, Sequence[str], None] = '83e85da9702c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 3a5b8c9d2e1f added user_id as nullable and left existing rows NULL, and
+    # 50c3a20f9a82's NOT NULL flip is not applied everywhere (stamped or
+    # hand-patched databases).  Every step below checks the live schema first,
+    # so a database that is already clean only pays for two catalog lookups.
+    conn = op.get_bind()
+
+    is_nullable = conn.execute(
+        sa.text(
+            "SELECT is_nullable = 'YES' FROM information_schema.columns "
+            "WHERE table_schema = current_schema() "
+            "AND table_name = 'ocr_documents' AND column_name = 'user_id'"
+        )
+    ).scalar()
+    if not is_nullable:
+        return
+
+    has_nulls = conn.execute(
+        sa.text("SELECT EXISTS (SELECT 1 FROM ocr_documents WHERE user_id IS NULL)")
+    ).scalar()
+    if has_nulls:
+        default_uid = conn.execute(
+            sa.text("SELECT id FROM users WHERE role = 'SUPER_USER' ORDER BY id LIMIT 1")
+        ).scalar()
+        if default_uid is None:
+            raise RuntimeError(
+                "ocr_documents has rows without user_id but no SUPER_USER exists "
+                "to assign them to — create one before running this migration."
+            )
+
+    # Everything runs in its own short transaction: the backfill in small
+    # committed batches so no single UPDATE locks the table, and the NOT NULL
+    # proof split so that VALIDATE (SHARE UPDATE EXCLUSIVE, writes continue)
+    # only starts after the instant NOT VALID ADD has committed.  Postgres 12+
+    # then skips the full scan when SET NOT NULL runs.
+    with op.get_context().autocommit_block():
+        if has_nulls:
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS tmp_ocr_documents_null_user_id "
+                "ON ocr_documents (id) WHERE user_id IS NULL"
+            )
+
+            lo, hi = conn.execute(
+                sa.text("SELECT min(id), max(id) FROM ocr_documents WHERE user_id IS NULL")
+            ).one()
+            while lo is not None and lo <= hi:
+                conn.execute(
+                    sa.text(
+                        "UPDATE ocr_documents SET user_id = :uid "
+                        "WHERE id BETWEEN :lo AND :hi AND user_id IS NULL"
+                    ),
+                    {"uid": default_uid, "lo": lo, "hi": lo + BATCH_SIZE - 1},
+                )
+                lo += BATCH_SIZE
+
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS tmp_ocr_documents_null_user_id")
+
+        op.execute(
+            "ALTER TABLE ocr_documents ADD CONSTRAINT ck_ocr_documents_user_id_not_null "
+            "CHECK (user_id IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE ocr_documents VALIDATE CONSTRAINT ck_ocr_documents_user_id_not_null")
+        op.alter_column('ocr_documents', 'user_id', existing_type=sa.INTEGER(), nullable=False)
+        op.drop_constraint('ck_ocr_documents_user_id_not_null', 'ocr_documents', type_='check')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Nothing to undo: on most databases the column was already NOT NULL
+    # before this revision, and backfilled ownership cannot be told apart
+    # from real ownership.
+    pass
@@ -0,0 +1,41 @@
+"""drop redundant ix_<table>_id indexes duplicating primary keys
+
+Revision ID: 96a51c4c90aa
+Revises: e16e57bd26a6
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '96a51c4c90aa'
+down_revision: Union[str, Sequence[str], None] = 'e16e57bd26a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every PRIMARY KEY already carries its own unique btree on id
+REDUNDANT_INDEXES = (
+    ('ix_users_id', 'users'),
+    ('ix_ocr_documents_id', 'ocr_documents'),
+    ('ix_free_trial_users_id', 'free_trial_users'),
+    ('ix_payment_history_id', 'payment_history'),
+    ('ix_enterprises_id', 'enterprises'),
+    ('ix_enterprise_ocr_documents_id', 'enterprise_ocr_documents'),
+)
+
+
+def upgrade() -> None:
+    """Drop indexes that duplicate the primary key index."""
+    with op.get_context().autocommit_block():
+        for index_name, _table in REDUNDANT_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+
+def downgrade() -> None:
+    """Recreate the plain id indexes."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name in REDUNDANT_INDEXES:
+            op.create_index(index_name, table_name, ['id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
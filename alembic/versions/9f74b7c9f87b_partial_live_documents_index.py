@@ -0,0 +1,50 @@
+"""partial (user_id, id DESC) index on live ocr_documents
+
+Revision ID: 9f74b7c9f87b
+Revises: 106b406d99a3
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f74b7c9f87b'
+down_revision: Union[str, Sequence[str], None] = '106b406d99a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index only non-deleted rows for per-user listings; keep a plain user_id index for FK lookups."""
+    # Every user_id-scoped listing filters is_deleted = false, so the deleted
+    # set no longer bloats the btree those scans walk.  Lookups that must see
+    # deleted rows too (FK checks, user cascades) use the single-column index.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_ocr_documents_user_active',
+            'ocr_documents',
+            ['user_id', sa.text('id DESC')],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(op.f('ix_ocr_documents_user_id'), 'ocr_documents', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_ocr_documents_user_deleted_id', table_name='ocr_documents', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Restore the full (user_id, is_deleted, id DESC) index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_ocr_documents_user_deleted_id',
+            'ocr_documents',
+            ['user_id', 'is_deleted', sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(op.f('ix_ocr_documents_user_id'), table_name='ocr_documents', postgresql_concurrently=True)
+        op.drop_index('ix_ocr_documents_user_active', table_name='ocr_documents', postgresql_concurrently=True)
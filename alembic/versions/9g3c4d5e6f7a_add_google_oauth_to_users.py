@@ -19,15 +19,20 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add google_id column (nullable, unique)
-    op.add_column('users', sa.Column('google_id', sa.String(255), nullable=True))
-    op.create_index(op.f('ix_users_google_id'), 'users', ['google_id'], unique=True)
-
-    # Add auth_provider column (default = 'local')
-    op.add_column('users', sa.Column('auth_provider', sa.String(50), nullable=True, server_default='local'))
-
-    # Make hashed_password nullable (OAuth users may not have a password)
-    op.alter_column('users', 'hashed_password', existing_type=sa.String(255), nullable=True)
+    # Single ALTER TABLE so the users table is locked once:
+    #   - google_id (nullable, unique — index below)
+    #   - auth_provider (default = 'local')
+    #   - hashed_password becomes nullable (OAuth users may not have a password)
+    op.execute(
+        "ALTER TABLE users "
+        "ADD COLUMN google_id VARCHAR(255), "
+        "ADD COLUMN auth_provider VARCHAR(50) DEFAULT 'local', "
+        "ALTER COLUMN hashed_password DROP NOT NULL"
+    )
+
+    # Unique index on google_id — built concurrently so sign-ups keep flowing
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_users_google_id'), 'users', ['google_id'], unique=True, postgresql_concurrently=True)
 
 
 def downgrade() -> None:
@@ -36,5 +41,4 @@ def downgrade() -> None:
     op.alter_column('users', 'hashed_password', existing_type=sa.String(255), nullable=False)
 
     op.drop_index(op.f('ix_users_google_id'), table_name='users')
-    op.drop_column('users', 'google_id')
-    op.drop_column('users', 'auth_provider')
+    op.execute("ALTER TABLE users DROP COLUMN google_id, DROP COLUMN auth_provider")
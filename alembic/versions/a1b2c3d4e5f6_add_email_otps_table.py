@@ -32,10 +32,9 @@ def upgrade() -> None:
             nullable=False,
         ),
         sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_email_otps_email", "email"),
     )
-    op.create_index("ix_email_otps_email", "email_otps", ["email"])
 
 
 def downgrade() -> None:
-    op.drop_index("ix_email_otps_email", table_name="email_otps")
     op.drop_table("email_otps")
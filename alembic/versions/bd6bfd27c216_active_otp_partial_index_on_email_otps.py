@@ -0,0 +1,39 @@
+"""partial (email, created_at) WHERE NOT is_used index on email_otps
+
+Revision ID: bd6bfd27c216
+Revises: 160f23606a57
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bd6bfd27c216'
+down_revision: Union[str, Sequence[str], None] = '160f23606a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index only the still-usable OTPs, ordered the way verification reads them."""
+    # verify_email_otp / create_email_otp filter on email AND is_used = false and
+    # take the newest row; used codes (the vast majority) never enter the index.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_email_otps_email_active',
+            'email_otps',
+            ['email', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text('is_used = false'),
+        )
+
+
+def downgrade() -> None:
+    """Drop the active-OTP index."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_email_otps_email_active', table_name='email_otps', postgresql_concurrently=True)
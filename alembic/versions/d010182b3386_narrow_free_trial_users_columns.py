@@ -0,0 +1,55 @@
+"""narrow free_trial_users counters to smallint and ip_address to inet
+
+Revision ID: d010182b3386
+Revises: f260494606ca
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd010182b3386'
+down_revision: Union[str, Sequence[str], None] = 'f260494606ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # usage_count / max_usage never exceed a handful; inet packs an address into
+    # 7–19 bytes instead of up to 45 chars. Values that are not an address
+    # (e.g. test-client hostnames, or hex-only strings like "cafe") are dropped
+    # rather than failing the cast — Postgres is the only reliable judge of
+    # that, so a session-local helper tries the cast and catches the error.
+    op.execute(
+        """
+        CREATE FUNCTION pg_temp.try_inet(value text) RETURNS inet
+        LANGUAGE plpgsql IMMUTABLE AS $$
+        BEGIN
+            RETURN value::inet;
+        EXCEPTION WHEN invalid_text_representation THEN
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        "ALTER TABLE free_trial_users "
+        "ALTER COLUMN usage_count TYPE smallint, "
+        "ALTER COLUMN max_usage TYPE smallint, "
+        "ALTER COLUMN ip_address TYPE inet USING pg_temp.try_inet(ip_address)"
+    )
+    op.execute("DROP FUNCTION pg_temp.try_inet(text)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "ALTER TABLE free_trial_users "
+        "ALTER COLUMN usage_count TYPE integer, "
+        "ALTER COLUMN max_usage TYPE integer, "
+        "ALTER COLUMN ip_address TYPE varchar(45) USING host(ip_address)"
+    )
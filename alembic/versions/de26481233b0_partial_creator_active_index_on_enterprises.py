@@ -0,0 +1,37 @@
+"""partial (created_by) WHERE NOT is_deleted index on enterprises
+
+Revision ID: de26481233b0
+Revises: 487981bffe0a
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'de26481233b0'
+down_revision: Union[str, Sequence[str], None] = '487981bffe0a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add a partial index covering a creator's non-deleted enterprises."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_enterprises_creator_active',
+            'enterprises',
+            ['created_by'],
+            unique=False,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text('is_deleted = false'),
+        )
+
+
+def downgrade() -> None:
+    """Drop the partial creator index."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_enterprises_creator_active', table_name='enterprises', postgresql_concurrently=True)
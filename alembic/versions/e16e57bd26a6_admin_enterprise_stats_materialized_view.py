@@ -0,0 +1,48 @@
+"""admin_enterprise_stats materialized view
+
+Revision ID: e16e57bd26a6
+Revises: bd6bfd27c216
+Create Date: 2026-10-16 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e16e57bd26a6'
+down_revision: Union[str, Sequence[str], None] = 'bd6bfd27c216'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-admin enterprise aggregate view backing /dashboard/admin/stats."""
+    # The query is spelled out here rather than imported from the app, so this
+    # revision keeps creating the same view whatever the models later become.
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW admin_enterprise_stats AS
+        SELECT
+            created_by                                                AS admin_id,
+            count(*)                                                  AS total_enterprises,
+            coalesce(sum(total_pages), 0)                             AS total_pages_allocated,
+            coalesce(sum(pages_used), 0)                              AS total_pages_used,
+            coalesce(sum(advance_bill), 0.0)                          AS total_revenue_collected,
+            coalesce(sum(due_amount), 0.0)                            AS total_due_amount,
+            count(*) FILTER (WHERE payment_status = 'paid')           AS paid_count,
+            count(*) FILTER (WHERE payment_status = 'partial_paid')   AS partial_paid_count,
+            count(*) FILTER (WHERE payment_status = 'due')            AS due_count
+        FROM enterprises
+        WHERE is_deleted = false
+        GROUP BY created_by
+        """
+    )
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('ix_admin_enterprise_stats_admin_id', 'admin_enterprise_stats', ['admin_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Drop the admin stats view."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS admin_enterprise_stats")
@@ -0,0 +1,36 @@
+"""payment_history payload columns json -> jsonb
+
+Revision ID: f260494606ca
+Revises: 96a51c4c90aa
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f260494606ca'
+down_revision: Union[str, Sequence[str], None] = '96a51c4c90aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store PayStation payloads as binary jsonb instead of re-parsed json text."""
+    # Both columns in one ALTER → a single table rewrite
+    op.execute(
+        "ALTER TABLE payment_history "
+        "ALTER COLUMN initiation_response TYPE jsonb USING initiation_response::jsonb, "
+        "ALTER COLUMN callback_payload TYPE jsonb USING callback_payload::jsonb"
+    )
+
+
+def downgrade() -> None:
+    """Revert payload columns to json."""
+    op.execute(
+        "ALTER TABLE payment_history "
+        "ALTER COLUMN initiation_response TYPE json USING initiation_response::json, "
+        "ALTER COLUMN callback_payload TYPE json USING callback_payload::json"
+    )
@@ -2,17 +2,19 @@
 from typing import List
 
 from fastapi import APIRouter, Depends
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_db
 from app.middleware.auth import require_admin
-from app.models.enterprise import Enterprise, EnterprisePaymentStatus
+from app.models.enterprise import admin_enterprise_stats
 from app.models.ocr_document import OCRDocument
 from app.models.user import User, UserRole
 from app.schemas.auth_schemas import UserResponse
 from app.schemas.dashboard_schemas import AdminDashboardStats
+from app.schemas.ocr_schemas import OCRDocumentResponse
 from app.services.enterprise_service import list_enterprises
-from app.services.ocr_crud import get_ocr_documents
+from app.services.ocr_crud import get_ocr_documents_with_total
 
 router = APIRouter()
 
@@ -29,42 +31,55 @@ async def get_admin_dashboard_stats(
     """
     **Role:** ADMIN only. Returns the logged-in admin's enterprise portfolio stats
     and personal OCR activity — scoped to enterprises they created.
+
+    Enterprise figures come from a precomputed view refreshed after enterprise
+    writes, debounced by `ADMIN_STATS_REFRESH_DELAY_SECONDS` (default 30 s), so
+    they can lag the latest change by up to that long. The OCR count is live.
     """
-    enterprises = (
-        db.query(Enterprise)
-        .filter(
-            Enterprise.created_by == current_user.id,
-            Enterprise.is_deleted == False,
+    # Personal OCR count rides along as a scalar subquery → one round-trip total
+    ocr_count_subq = (
+        select(func.count(OCRDocument.id))
+        .where(
+            OCRDocument.user_id == current_user.id,
+            OCRDocument.is_deleted == False,
         )
-        .all()
-    )
-
-    total_enterprises = len(enterprises)
-    total_pages_allocated = sum(e.total_pages for e in enterprises)
-    total_pages_used = sum(e.pages_used for e in enterprises)
-    total_pages_remaining = max(0, total_pages_allocated - total_pages_used)
-    total_revenue_collected = sum(e.advance_bill or 0.0 for e in enterprises)
-    total_due_amount = sum(e.due_amount or 0.0 for e in enterprises)
-    paid_count = sum(
-        1 for e in enterprises if e.payment_status == EnterprisePaymentStatus.PAID
-    )
-    partial_paid_count = sum(
-        1
-        for e in enterprises
-        if e.payment_status == EnterprisePaymentStatus.PARTIAL_PAID
-    )
-    due_count = sum(
-        1 for e in enterprises if e.payment_status == EnterprisePaymentStatus.DUE
+        .scalar_subquery()
     )
 
-    total_ocr_documents_processed = (
-        db.query(OCRDocument)
-        .filter(
-            OCRDocument.user_id == current_user.id,
-            OCRDocument.is_deleted == False,
+    # Enterprise aggregates are precomputed per admin in the
+    # admin_enterprise_stats materialized view (refreshed shortly after enterprise writes)
+    stats = admin_enterprise_stats.c
+    row = (
+        db.query(
+            stats.total_enterprises,
+            stats.total_pages_allocated,
+            stats.total_pages_used,
+            stats.total_revenue_collected,
+            stats.total_due_amount,
+            stats.paid_count,
+            stats.partial_paid_count,
+            stats.due_count,
+            ocr_count_subq,
         )
-        .count()
+        .filter(stats.admin_id == current_user.id)
+        .first()
     )
+    if row is None:
+        # Admin has no live enterprises → no row in the view
+        row = (0, 0, 0, 0.0, 0.0, 0, 0, 0, db.query(ocr_count_subq).scalar())
+
+    (
+        total_enterprises,
+        total_pages_allocated,
+        total_pages_used,
+        total_revenue_collected,
+        total_due_amount,
+        paid_count,
+        partial_paid_count,
+        due_count,
+        total_ocr_documents_processed,
+    ) = row
+    total_pages_remaining = max(0, total_pages_allocated - total_pages_used)
 
     return AdminDashboardStats(
         total_enterprises=total_enterprises,
@@ -98,7 +113,7 @@ async def get_admin_enterprises(
     | skip  | 0       | Offset |
     | limit | 50      | Max records |
     """
-    total, enterprises = list_enterprises(
+    total, enterprises, _ = list_enterprises(
         db, created_by=current_user.id, skip=skip, limit=limit
     )
     return {"total": total, "enterprises": enterprises}
@@ -123,15 +138,25 @@ async def get_users_list(
     | skip  | 0       | Offset |
     | limit | 50      | Max records |
     """
-    users = (
-        db.query(User)
-        .filter(User.role == UserRole.USER)
+    # Core select of just the UserResponse columns — no ORM identity-map hydration
+    stmt = (
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.full_name,
+            User.role,
+            User.is_active,
+            User.is_verified,
+            User.created_at,
+            User.last_login,
+        )
+        .where(User.role == UserRole.USER)
         .order_by(User.created_at.desc())
         .offset(skip)
         .limit(limit)
-        .all()
     )
-    return users
+    return [UserResponse.model_validate(dict(row)) for row in db.execute(stmt).mappings()]
 
 
 @router.get(
@@ -152,13 +177,8 @@ async def get_admin_ocr_documents(
     | skip  | 0       | Offset |
     | limit | 50      | Max records |
     """
-    total = (
-        db.query(OCRDocument)
-        .filter(
-            OCRDocument.user_id == current_user.id,
-            OCRDocument.is_deleted == False,
-        )
-        .count()
+    total, rows = get_ocr_documents_with_total(
+        db, user_id=current_user.id, skip=skip, limit=limit
     )
-    docs = get_ocr_documents(db, user_id=current_user.id, skip=skip, limit=limit)
+    docs = [OCRDocumentResponse.model_validate(dict(row)) for row in rows]
     return {"total": total, "documents": docs}
@@ -1,21 +1,29 @@
 """Authentication endpoints - Simplified and production-ready"""
-from fastapi import APIRouter, Depends, status, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, status, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from datetime import timedelta
+import asyncio
+import hashlib
 import logging
+import math
+import weakref
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_db, get_user_cache
 from app.services.auth_service import (
+    ACCESS_TOKEN_EXPIRES,
     authenticate_user,
     create_user,
     create_access_token,
-    get_user_by_username,
+    find_registration_conflict,
     get_user_by_email,
     get_password_hash,
     verify_password,
     get_or_create_google_user,
     create_email_otp,
     verify_email_otp,
+    remember_user,
 )
 from app.schemas.auth_schemas import (
     UserCreate,
@@ -28,24 +36,102 @@ from app.schemas.auth_schemas import (
     ResendOTPRequest,
 )
 from app.middleware.auth import get_current_active_user
+from app.models.otp import EmailOTP
 from app.models.user import User, UserRole
 from app.core.config import settings
 from app.errors.exceptions import (
     ConflictException,
     UnauthorizedException,
     NotFoundException,
-    BadRequestException
+    BadRequestException,
+    TooManyRequestsException
 )
 from app.utils.email import send_otp_email
+from app.utils.rate_limit import RateLimiter, RecentlySeen
 from google.oauth2 import id_token as google_id_token
 from google.auth.transport import requests as google_requests
+import cachecontrol
+import requests
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# One transport for all Google sign-ins. CacheControl honours the Cache-Control
+# max-age Google sends with its signing certs, so they are fetched once per
+# rotation window instead of on every verify_oauth2_token call.
+_GOOGLE_REQUEST = google_requests.Request(session=cachecontrol.CacheControl(requests.Session()))
+
+# Identical ID tokens arriving together (client retries, duplicated tabs) share
+# one verification; per-"sub" locks serialise first-login user creation.
+_google_inflight: "dict[bytes, asyncio.Future]" = {}
+_google_user_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+async def _verify_google_token(token: str) -> dict:
+    """Verify a Google ID token, coalescing concurrent calls for the same token."""
+    key = hashlib.sha256(token.encode()).digest()
+    future = _google_inflight.get(key)
+    if future is None:
+        # Cert fetch (on cache miss) and RSA verification are blocking — keep them off the loop
+        future = asyncio.ensure_future(run_in_threadpool(
+            google_id_token.verify_oauth2_token,
+            token,
+            _GOOGLE_REQUEST,
+            settings.GOOGLE_CLIENT_ID,
+        ))
+        _google_inflight[key] = future
+        future.add_done_callback(lambda _: _google_inflight.pop(key, None))
+    # Shielded so one client disconnecting does not cancel the others' result
+    return await asyncio.shield(future)
+
+
+# Per-email limits on the endpoints that send mail. A repeat /resend-otp
+# within the dedupe window gets the same 200 without touching DB or SMTP.
+_register_limiter = RateLimiter(max_calls=5, period=3600)
+_resend_limiter = RateLimiter(max_calls=1, period=60)
+_recent_otp = RecentlySeen(ttl=30)
+
+
+def _check_rate_limit(limiter: RateLimiter, email: str) -> None:
+    retry_after = limiter.hit(email.lower())
+    if retry_after is not None:
+        raise TooManyRequestsException(
+            detail="Too many verification emails requested. Please wait before trying again.",
+            retry_after=math.ceil(retry_after),
+        )
+
+
+def _token_response(user: User, status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    """Issue an access token for *user* and serialise the Token body directly.
+
+    The user row comes from our own database, so it is validated into
+    UserResponse once and the envelope is assembled with model_construct —
+    FastAPI's response_model pass (dump → re-validate → dump) is skipped.
+    """
+    access_token = create_access_token(
+        data={"sub": str(user.id), "username": user.username, "role": user.role.value},
+        expires_delta=ACCESS_TOKEN_EXPIRES,
+    )
+    token = Token.model_construct(
+        access_token=access_token,
+        token_type="bearer",
+        user=UserResponse.model_validate(user),
+    )
+    return ORJSONResponse(content=token.model_dump(mode="json"), status_code=status_code)
+
+
+def _deliver_otp_email(to: str, otp: str, full_name: str, log_tag: str) -> None:
+    """BackgroundTasks target — sends the OTP after the response is out and logs failures."""
+    if not send_otp_email(to=to, otp=otp, full_name=full_name):
+        logger.warning("[%s] OTP email delivery failed for %s", log_tag, to)
+
 
 @router.post("/register", response_model=OTPRequest, status_code=status.HTTP_200_OK)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(
+    user_data: UserCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """
     ## Register a new user account (Step 1 of 2)
 
@@ -69,24 +155,30 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     1. POST with the registration form data (JSON).
     2. HTTP 200 → navigate to an OTP entry screen, carry `email` in state.
     3. HTTP 409 → "Username / Email already taken".
-    4. Next: **POST /auth/verify-otp** with the received OTP code.
+    4. HTTP 429 → too many attempts for this email; honour `Retry-After`.
+    5. Next: **POST /auth/verify-otp** with the received OTP code.
     """
-    if get_user_by_username(db, user_data.username):
-        raise ConflictException(detail="Username already registered")
+    _check_rate_limit(_register_limiter, user_data.email)
 
-    if get_user_by_email(db, user_data.email):
+    # Both uniqueness checks in a single SELECT
+    conflict = find_registration_conflict(db, user_data.username, user_data.email)
+    if conflict == "username":
+        raise ConflictException(detail="Username already registered")
+    if conflict == "email":
         raise ConflictException(detail="Email already registered")
 
     user_data.role = UserRole.USER
     otp = create_email_otp(db, user_data.email, user_data.model_dump())
 
-    sent = send_otp_email(
+    # SMTP handshake takes seconds — send after the response is returned
+    background_tasks.add_task(
+        _deliver_otp_email,
         to=user_data.email,
         otp=otp,
         full_name=user_data.full_name or "",
+        log_tag="Register",
     )
-    if not sent:
-        logger.warning(f"[Register] OTP email delivery failed for {user_data.email}")
+    _recent_otp.mark(user_data.email.lower())
 
     return OTPRequest(
         message="Verification code sent to your email. Please check your inbox and enter the 6-digit code to complete registration.",
@@ -95,7 +187,11 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/verify-otp", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def verify_otp(body: OTPVerifyRequest, db: Session = Depends(get_db)):
+async def verify_otp(
+    body: OTPVerifyRequest,
+    db: Session = Depends(get_db),
+    user_cache: dict = Depends(get_user_cache),
+):
     """
     ## Verify OTP and complete registration (Step 2 of 2)
 
@@ -123,7 +219,8 @@ async def verify_otp(body: OTPVerifyRequest, db: Session = Depends(get_db)):
     4. HTTP 409 → account already exists, redirect to login.
     """
     try:
-        user_payload = verify_email_otp(db, body.email, body.otp)
+        # Lookup + mark-used commit are blocking DB work — keep them off the loop
+        user_payload = await run_in_threadpool(verify_email_otp, db, body.email, body.otp)
     except ValueError as exc:
         raise BadRequestException(detail=str(exc))
 
@@ -131,30 +228,26 @@ async def verify_otp(body: OTPVerifyRequest, db: Session = Depends(get_db)):
         raise BadRequestException(detail="OTP verification failed.")
 
     # Double-check in case another request sneaked in
-    if get_user_by_email(db, body.email):
+    if get_user_by_email(db, body.email, cache=user_cache):
         raise ConflictException(detail="An account with this email already exists. Please log in.")
 
-    from app.schemas.auth_schemas import UserCreate as UC
-    new_user = create_user(db, UC(**user_payload))
-
-    # Mark as verified immediately (OTP proves email ownership)
-    new_user.is_verified = True
-    db.commit()
-    db.refresh(new_user)
-
-    access_token = create_access_token(
-        data={
-            "sub": str(new_user.id),
-            "username": new_user.username,
-            "role": new_user.role.value,
-        },
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    # create_user hashes the password with bcrypt — keep it off the event loop.
+    # Verified on insert: the OTP proves email ownership.
+    new_user = await run_in_threadpool(
+        create_user, db, UserCreate(**user_payload), is_verified=True
     )
-    return {"access_token": access_token, "token_type": "bearer", "user": new_user}
+    remember_user(user_cache, new_user)
+
+    return _token_response(new_user, status_code=status.HTTP_201_CREATED)
 
 
 @router.post("/resend-otp", response_model=OTPRequest, status_code=status.HTTP_200_OK)
-async def resend_otp(body: ResendOTPRequest, db: Session = Depends(get_db)):
+async def resend_otp(
+    body: ResendOTPRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user_cache: dict = Depends(get_user_cache),
+):
     """
     ## Resend OTP verification email
 
@@ -177,33 +270,39 @@ async def resend_otp(body: ResendOTPRequest, db: Session = Depends(get_db)):
     - Disable for ~60 s after each click to prevent spam.
     - HTTP 404 → no pending registration found — send user back to `/register`.
     - HTTP 409 → account already exists — redirect to login.
+    - HTTP 429 → more than one resend per minute; honour `Retry-After`.
     """
-    from app.models.otp import EmailOTP
-    from app.models.otp import EmailOTP
+    resend_message = "A new verification code has been sent to your email."
+    if _recent_otp.seen(body.email.lower()):
+        # A code went out moments ago — answer as before without resending
+        return OTPRequest(message=resend_message, email=body.email)
+    _check_rate_limit(_resend_limiter, body.email)
 
-    if get_user_by_email(db, body.email):
+    if get_user_by_email(db, body.email, cache=user_cache):
         raise ConflictException(detail="An account with this email already exists. Please log in.")
 
     # Retrieve the pending user_data from the most recent OTP row
-    existing = (
-        db.query(EmailOTP)
-        .filter(EmailOTP.email == body.email)
+    existing = db.execute(
+        select(EmailOTP)
+        .where(EmailOTP.email == body.email)
         .order_by(EmailOTP.created_at.desc())
-        .first()
-    )
+        .limit(1)
+    ).scalar_one_or_none()
     if not existing:
         raise NotFoundException(detail="No pending registration found for this email. Please register first.")
 
     otp = create_email_otp(db, body.email, existing.user_data)
     full_name = (existing.user_data or {}).get("full_name", "")
-    sent = send_otp_email(to=body.email, otp=otp, full_name=full_name)
-    if not sent:
-        logger.warning(f"[ResendOTP] Email delivery failed for {body.email}")
-
-    return OTPRequest(
-        message="A new verification code has been sent to your email.",
-        email=body.email,
+    background_tasks.add_task(
+        _deliver_otp_email,
+        to=body.email,
+        otp=otp,
+        full_name=full_name,
+        log_tag="ResendOTP",
     )
+    _recent_otp.mark(body.email.lower())
+
+    return OTPRequest(message=resend_message, email=body.email)
 
 
 @router.post("/login", response_model=Token)
@@ -244,18 +343,13 @@ async def login(
       ```
     - HTTP 401 → "Incorrect email or password".
     """
-    user = authenticate_user(db, username, password)
+    # bcrypt verification is CPU-bound; run it in the threadpool so other requests keep flowing
+    user = await run_in_threadpool(authenticate_user, db, username, password)
     
     if not user:
         raise UnauthorizedException(detail="Incorrect email or password")
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "username": user.username, "role": user.role.value},
-        expires_delta=access_token_expires
-    )
-    
-    return {"access_token": access_token, "token_type": "bearer", "user": user}
+    return _token_response(user)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -309,10 +403,10 @@ async def change_password(
     - After a successful change, consider clearing stored tokens and forcing
       re-login to issue a fresh JWT scoped to the new credentials.
     """
-    if not verify_password(password_data.old_password, current_user.hashed_password):
+    if not await run_in_threadpool(verify_password, password_data.old_password, current_user.hashed_password):
         raise BadRequestException(detail="Incorrect old password")
     
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    current_user.hashed_password = await run_in_threadpool(get_password_hash, password_data.new_password)
     db.commit()
     
     return {"message": "Password changed successfully"}
@@ -361,11 +455,7 @@ async def google_sign_in(
         raise BadRequestException(detail="Google Sign-In is not configured on this server.")
 
     try:
-        idinfo = google_id_token.verify_oauth2_token(
-            payload.id_token,
-            google_requests.Request(),
-            settings.GOOGLE_CLIENT_ID,
-        )
+        idinfo = await _verify_google_token(payload.id_token)
     except ValueError as exc:
         raise UnauthorizedException(detail=f"Invalid Google ID token: {exc}")
 
@@ -377,16 +467,16 @@ async def google_sign_in(
     if not email or not email_verified:
         raise UnauthorizedException(detail="Google account email is not verified.")
 
-    user = get_or_create_google_user(db, google_id=google_id, email=email, full_name=full_name)
+    lock = _google_user_locks.get(google_id)
+    if lock is None:
+        lock = _google_user_locks[google_id] = asyncio.Lock()
+    async with lock:
+        user = await run_in_threadpool(
+            get_or_create_google_user, db, google_id=google_id, email=email, full_name=full_name
+        )
 
     if not user.is_active:
         raise UnauthorizedException(detail="This account has been deactivated.")
 
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "username": user.username, "role": user.role.value},
-        expires_delta=access_token_expires,
-    )
-
-    return {"access_token": access_token, "token_type": "bearer", "user": user}
+    return _token_response(user)
 
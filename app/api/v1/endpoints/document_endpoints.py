@@ -1,28 +1,47 @@
 """Document management endpoints - Simplified and production-ready"""
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 from app.middleware.auth import require_user
 from app.models.user import User, UserRole
 from app.services.ocr_crud import (
-    get_ocr_document,
+    get_ocr_document_cached,
     get_ocr_documents,
     delete_ocr_document
 )
 from app.schemas.ocr_schemas import OCRDocumentResponse
 from app.core.dependencies import get_db
 from app.errors.exceptions import NotFoundException
+from app.utils.responses import RowJSONResponse
 
 router = APIRouter()
 
 
+class DocumentScope(NamedTuple):
+    """Which documents the caller may see: user_id=None means every user's."""
+    user_id: Optional[int]
+    is_superuser: bool
+
+
+async def get_document_scope(current_user: User = Depends(require_user)) -> DocumentScope:
+    """
+    Superusers see (and hard-delete) every document, including soft-deleted
+    ones; everyone else is scoped to their own live documents.
+    Resolved once per request and shared through FastAPI's dependency cache.
+    """
+    if current_user.role == UserRole.SUPER_USER:
+        return DocumentScope(user_id=None, is_superuser=True)
+    return DocumentScope(user_id=current_user.id, is_superuser=False)
+
+
 @router.get("/", response_model=List[OCRDocumentResponse])
 async def list_documents(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     ocr_mode: Optional[str] = Query(None),
+    cursor: Optional[int] = Query(None, ge=1, description="Keyset cursor: id of the last document on the previous page"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_user)
+    scope: DocumentScope = Depends(get_document_scope)
 ):
     """
     ## List OCR documents
@@ -41,27 +60,30 @@ async def list_documents(
     | skip     | int    | 0       | Pagination offset (number of records to skip)   |
     | limit    | int    | 100     | Max records to return (max 500)                 |
     | ocr_mode | string | null    | Filter by mode: `bangla`, `english`, or `mixed` |
+    | cursor   | int    | null    | Keyset cursor — `id` of the last document already shown |
 
     ### Frontend integration
     - Use `skip` + `limit` to implement paginated document history.
+    - For long histories prefer `cursor`: pass the last `id` of the current page
+      (leave `skip` at 0) — newest-first by `id`, constant cost per page.
     - Pass `ocr_mode` to filter results by language mode.
     - Example: `GET /documents/?skip=0&limit=20&ocr_mode=bangla`
     """
 
-    # Only Superusers can see all documents (including deleted), others only see their own (non-deleted)
-    is_superuser = current_user.role == UserRole.SUPER_USER
-    user_id = None if is_superuser else current_user.id
-    include_deleted = is_superuser  # Superusers can see soft-deleted documents
-    
-    documents = get_ocr_documents(db, skip=skip, limit=limit, ocr_mode=ocr_mode, user_id=user_id, include_deleted=include_deleted)
-    return documents
+    documents = get_ocr_documents(
+        db, skip=skip, limit=limit, ocr_mode=ocr_mode, user_id=scope.user_id,
+        include_deleted=scope.is_superuser, before_id=cursor,
+    )
+    # Rows are plain column dicts matching OCRDocumentResponse field-for-field,
+    # so serialise them straight away instead of validating every row.
+    return RowJSONResponse(documents)
 
 
 @router.get("/{document_id}", response_model=OCRDocumentResponse)
 async def get_document(
     document_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_user)
+    scope: DocumentScope = Depends(get_document_scope)
 ):
     """
     ## Get a single OCR document by ID
@@ -87,12 +109,9 @@ async def get_document(
     - HTTP 404 → document does not exist or does not belong to the user.
     """
 
-    # Only Superusers can access any document (including deleted), others only their own (non-deleted)
-    is_superuser = current_user.role == UserRole.SUPER_USER
-    user_id = None if is_superuser else current_user.id
-    include_deleted = is_superuser  # Superusers can see soft-deleted documents
-    
-    document = get_ocr_document(db, document_id, user_id=user_id, include_deleted=include_deleted)
+    document = get_ocr_document_cached(
+        db, document_id, user_id=scope.user_id, include_deleted=scope.is_superuser
+    )
     if not document:
         raise NotFoundException(detail="Document not found")
     return document
@@ -102,7 +121,7 @@ async def get_document(
 async def delete_document(
     document_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_user)
+    scope: DocumentScope = Depends(get_document_scope)
 ):
     """
     ## Delete an OCR document
@@ -131,14 +150,9 @@ async def delete_document(
     - Remove the deleted document from the local list state on success.
     """
 
-    # Only Superusers can perform hard delete (permanent deletion from storage)
-    is_superuser = current_user.role == UserRole.SUPER_USER
-    delete_from_storage = is_superuser
-    
-    # Only Superusers can delete any document, others can only delete their own
-    user_id = None if is_superuser else current_user.id
-    
-    success = delete_ocr_document(db, document_id, user_id=user_id, delete_from_storage=delete_from_storage)
+    # Only Superusers hard-delete (record and stored file), and may delete any document
+    delete_from_storage = scope.is_superuser
+    success = delete_ocr_document(db, document_id, user_id=scope.user_id, delete_from_storage=delete_from_storage)
     if not success:
         raise NotFoundException(detail="Document not found")
     
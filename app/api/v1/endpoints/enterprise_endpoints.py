@@ -1,15 +1,19 @@
 """Enterprise OCR endpoints — admin and super-user access."""
 from __future__ import annotations
 
+import hashlib
 import logging
 import time
-from typing import Optional
+from typing import NamedTuple, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_db
+from app.db.session import release_connection
 from app.middleware.auth import require_admin, require_super_user
 from app.models.user import User, UserRole
 from app.schemas.enterprise_schemas import (
@@ -23,7 +27,9 @@ from app.schemas.enterprise_schemas import (
 )
 from app.services.enterprise_service import (
     create_enterprise,
+    find_enterprise_ocr_result,
     get_enterprise,
+    get_enterprise_with_creator,
     get_enterprise_ocr_history,
     get_billing_summary,
     list_enterprises,
@@ -35,18 +41,32 @@ from app.services.enterprise_service import (
 )
 from app.schemas.enterprise_schemas import EnterpriseOCRDocumentCreate
 from app.services.ocr_service import process_file, process_file_auto, detect_file_type, select_ocr_engine
-from app.utils.file_storage import save_uploaded_file
-from app.utils.enterprise_invoice import generate_enterprise_invoice_pdf
-from app.utils.pdf_utils import count_pdf_pages
-from app.errors.exceptions import NotFoundException, ForbiddenException
-from app.models.user import User
+from app.utils.file_storage import read_upload_limited, save_uploaded_file
+from app.utils.enterprise_invoice import generate_enterprise_invoice_pdf_cached, invoice_etag
+from app.utils.etag import not_modified
+from app.utils.pdf_utils import count_pdf_pages, linearized_page_count
+from app.utils.ocr_response import build_pages_info
+from app.utils.pagination import decode_cursor, next_cursor, split_page
+from app.errors.exceptions import BadRequestException, NotFoundException, ForbiddenException
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def _is_super(user: User) -> bool:
-    return user.role == UserRole.SUPER_USER
+class EnterpriseScope(NamedTuple):
+    """Which enterprises the caller may act on: owner_id=None means every admin's."""
+    owner_id: Optional[int]
+    is_super: bool
+
+
+async def get_enterprise_scope(current_user: User = Depends(require_admin)) -> EnterpriseScope:
+    """
+    SUPER_USER acts on every enterprise (including soft-deleted ones where the
+    endpoint allows it); ADMIN only on their own. Resolved once per request.
+    """
+    if current_user.role == UserRole.SUPER_USER:
+        return EnterpriseScope(owner_id=None, is_super=True)
+    return EnterpriseScope(owner_id=current_user.id, is_super=False)
 
 
 @router.post("/", response_model=EnterpriseResponse, status_code=201)
@@ -90,7 +110,8 @@ async def create_enterprise_endpoint(
 async def list_enterprises_endpoint(
     skip:         int          = Query(0,   ge=0),
     limit:        int          = Query(100, ge=1, le=500),
-    current_user: User         = Depends(require_admin),
+    cursor:       Optional[str] = Query(None, description="Opaque cursor from the previous page's `next_cursor`"),
+    scope:        EnterpriseScope = Depends(get_enterprise_scope),
     db:           Session      = Depends(get_db),
 ):
     """
@@ -103,21 +124,25 @@ async def list_enterprises_endpoint(
       `created_by_name` so you know who created each one.
 
     ### Query parameters
-    | Param | Default | Description       |
-    |-------|---------|-------------------|
-    | skip  | 0       | Pagination offset |
-    | limit | 100     | Max records (≤500)|
+    | Param  | Default | Description       |
+    |--------|---------|-------------------|
+    | skip   | 0       | Pagination offset |
+    | limit  | 100     | Max records (≤500)|
+    | cursor | null    | `next_cursor` from the previous page (leave `skip` at 0) |
 
     ### Frontend integration
     - Render in an "Enterprise Management" table.
+    - For "load more", pass back `next_cursor` — constant cost per page.
     - SUPER_USER: add a "Created By" column from `created_by_name`.
     """
-    is_super = _is_super(current_user)
-    created_by_filter = None if is_super else current_user.id
-    total, enterprises = list_enterprises(
-        db, created_by=created_by_filter, skip=skip, limit=limit
+    total, enterprises, has_more = list_enterprises(
+        db, created_by=scope.owner_id, skip=skip, limit=limit, after=decode_cursor(cursor)
     )
-    return EnterpriseListResponse(total=total, enterprises=enterprises)
+    # Already validated by the service layer — dump once and skip
+    # FastAPI's second validation pass over the response_model.
+    return ORJSONResponse(EnterpriseListResponse(
+        total=total, enterprises=enterprises, next_cursor=next_cursor(enterprises, has_more)
+    ).model_dump(mode="json"))
 
 
 @router.get("/admin/billing-summary", response_model=EnterpriseBillingSummary)
@@ -160,14 +185,16 @@ async def admin_list_all_enterprises(
     ### Response
     Same as `GET /enterprise/` but unscoped to any creator.
     """
-    total, enterprises = list_enterprises(db, created_by=None, skip=skip, limit=limit)
-    return EnterpriseListResponse(total=total, enterprises=enterprises)
+    total, enterprises, _ = list_enterprises(db, created_by=None, skip=skip, limit=limit)
+    return ORJSONResponse(
+        EnterpriseListResponse(total=total, enterprises=enterprises).model_dump(mode="json")
+    )
 
 
 @router.get("/{enterprise_id}", response_model=EnterpriseResponse)
 async def get_enterprise_endpoint(
     enterprise_id: int,
-    current_user:  User    = Depends(require_admin),
+    scope:         EnterpriseScope = Depends(get_enterprise_scope),
     db:            Session = Depends(get_db),
 ):
     """
@@ -184,10 +211,8 @@ async def get_enterprise_endpoint(
     ### Error codes
     - HTTP 404 → not found or not owned by the caller.
     """
-    is_super = _is_super(current_user)
-    owner_filter = None if is_super else current_user.id
-    ent = get_enterprise(db, enterprise_id, created_by=owner_filter,
-                         include_deleted=is_super)
+    ent = get_enterprise(db, enterprise_id, created_by=scope.owner_id,
+                         include_deleted=scope.is_super)
     if not ent:
         raise NotFoundException(detail="Enterprise not found")
     return ent
@@ -197,7 +222,7 @@ async def get_enterprise_endpoint(
 async def update_enterprise_endpoint(
     enterprise_id: int,
     payload:       EnterpriseUpdate,
-    current_user:  User    = Depends(require_admin),
+    scope:         EnterpriseScope = Depends(get_enterprise_scope),
     db:            Session = Depends(get_db),
 ):
     """
@@ -216,11 +241,15 @@ async def update_enterprise_endpoint(
     `start_date`, `end_date`, `advance_bill`, `no_of_documents`, `payment_status`
 
     ### Error codes
+    - HTTP 400 → `total_pages` lowered below the pages already used.
     - HTTP 404 → not found or access denied.
     """
-    is_super = _is_super(current_user)
-    owner_filter = None if is_super else current_user.id
-    updated = update_enterprise(db, enterprise_id, payload, created_by=owner_filter)
+    try:
+        updated = update_enterprise(db, enterprise_id, payload, created_by=scope.owner_id)
+    except IntegrityError:
+        # ck_enterprises_pages_used_within_quota
+        db.rollback()
+        raise BadRequestException(detail="total_pages cannot be lower than the pages already used")
     if not updated:
         raise NotFoundException(detail="Enterprise not found or access denied")
     return updated
@@ -230,7 +259,7 @@ async def update_enterprise_endpoint(
 async def update_payment_status_endpoint(
     enterprise_id: int,
     payload:       EnterprisePaymentStatusUpdate,
-    current_user:  User    = Depends(require_admin),
+    scope:         EnterpriseScope = Depends(get_enterprise_scope),
     db:            Session = Depends(get_db),
 ):
     """
@@ -254,9 +283,7 @@ async def update_payment_status_endpoint(
     - Render as a dropdown / action button in the enterprise detail page.
     - Show the updated `due_amount` immediately after response.
     """
-    is_super = _is_super(current_user)
-    owner_filter = None if is_super else current_user.id
-    updated = update_payment_status(db, enterprise_id, payload, created_by=owner_filter)
+    updated = update_payment_status(db, enterprise_id, payload, created_by=scope.owner_id)
     if not updated:
         raise NotFoundException(detail="Enterprise not found or access denied")
     return updated
@@ -265,7 +292,7 @@ async def update_payment_status_endpoint(
 @router.delete("/{enterprise_id}", status_code=200)
 async def delete_enterprise_endpoint(
     enterprise_id: int,
-    current_user:  User    = Depends(require_admin),
+    scope:         EnterpriseScope = Depends(get_enterprise_scope),
     db:            Session = Depends(get_db),
 ):
     """
@@ -282,9 +309,7 @@ async def delete_enterprise_endpoint(
     ### Error codes
     - HTTP 404 → not found or access denied.
     """
-    is_super = _is_super(current_user)
-    owner_filter = None if is_super else current_user.id
-    ok = soft_delete_enterprise(db, enterprise_id, created_by=owner_filter)
+    ok = soft_delete_enterprise(db, enterprise_id, created_by=scope.owner_id)
     if not ok:
         raise NotFoundException(detail="Enterprise not found or access denied")
     return {"message": "Enterprise deleted successfully"}
@@ -297,8 +322,9 @@ async def delete_enterprise_endpoint(
 @router.get("/{enterprise_id}/invoice")
 async def download_invoice(
     enterprise_id: int,
+    request:       Request,
     tz: str            = Query("UTC", description="IANA timezone for invoice display, e.g. Asia/Dhaka, America/New_York"),
-    current_user:  User    = Depends(require_admin),
+    scope:         EnterpriseScope = Depends(get_enterprise_scope),
     db:            Session = Depends(get_db),
 ):
     """
@@ -319,6 +345,8 @@ async def download_invoice(
 
     ### Response
     `application/pdf` binary — set `<a download>` on the frontend.
+    Carries an `ETag`; a repeat request with a matching `If-None-Match`
+    gets **HTTP 304** with no body (the browser reuses its cached copy).
 
     ### Frontend integration
     ```js
@@ -329,18 +357,23 @@ async def download_invoice(
     a.href = url; a.download = `invoice-${id}.pdf`; a.click();
     ```
     """
-    is_super = _is_super(current_user)
-    owner_filter = None if is_super else current_user.id
-    ent_orm = _get_enterprise_orm(db, enterprise_id, created_by=owner_filter,
-                                  include_deleted=is_super)
-    if not ent_orm:
+    found = get_enterprise_with_creator(db, enterprise_id, created_by=scope.owner_id,
+                                        include_deleted=scope.is_super)
+    if not found:
         raise NotFoundException(detail="Enterprise not found or access denied")
-
-    from app.models.user import User as UserModel
-    creator = db.query(UserModel).filter(UserModel.id == ent_orm.created_by).first()
-    creator_name = (creator.full_name or creator.username) if creator else ""
-
-    pdf_bytes = generate_enterprise_invoice_pdf(
+    ent_orm, creator_name = found
+    creator_name = creator_name or ""
+
+    # Unchanged invoice the browser already holds → 304, no render, no body
+    etag = invoice_etag(ent_orm, creator_name, tz)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=3600, must-revalidate"}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    # FPDF layout + encoding is pure-Python CPU work — render off the event loop;
+    # unchanged contracts are served from the rendered-invoice cache
+    pdf_bytes = await run_in_threadpool(
+        generate_enterprise_invoice_pdf_cached,
         enterprise=ent_orm,
         creator_name=creator_name,
         display_timezone=tz,
@@ -349,7 +382,7 @@ async def download_invoice(
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', **cache_headers},
     )
 
 
@@ -357,11 +390,28 @@ async def download_invoice(
 # Enterprise OCR
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _quota_exceeded(ent_orm, pages_in_file: int, pages_remaining: int) -> HTTPException:
+    """402 for an upload that does not fit in the enterprise's remaining pages."""
+    return HTTPException(
+        status_code=402,
+        detail={
+            "message": (
+                f"Page quota exceeded. This file has {pages_in_file} page(s) but "
+                f"only {pages_remaining} page(s) remain for enterprise '{ent_orm.name}'."
+            ),
+            "pages_in_file":  pages_in_file,
+            "pages_remaining": pages_remaining,
+            "total_pages":    ent_orm.total_pages,
+        },
+    )
+
+
 @router.post("/{enterprise_id}/ocr", status_code=200)
 async def enterprise_ocr(
     enterprise_id: int,
     file:  UploadFile = File(...),
     current_user: User    = Depends(require_admin),
+    scope:        EnterpriseScope = Depends(get_enterprise_scope),
     db:           Session = Depends(get_db),
 ):
     """
@@ -383,6 +433,8 @@ async def enterprise_ocr(
     ### Quota enforcement
     - If `pages_used + pages_in_file > total_pages` → **HTTP 402** (quota exceeded).
     - `pages_remaining` in `GET /{enterprise_id}` shows the live balance.
+    - The `quota` block in the response is the balance right after this charge
+      (returned by the same UPDATE that consumed the pages — no extra lookup).
 
     ### Response
     ```json
@@ -406,20 +458,34 @@ async def enterprise_ocr(
     - HTTP 402 → page quota exhausted; show "Contact admin to top up".
     - HTTP 404 → enterprise not found / access denied.
     """
-    is_super = _is_super(current_user)
-    owner_filter = None if is_super else current_user.id
-    ent_orm = _get_enterprise_orm(db, enterprise_id, created_by=owner_filter)
+    ent_orm = _get_enterprise_orm(db, enterprise_id, created_by=scope.owner_id)
     if not ent_orm:
         raise NotFoundException(detail="Enterprise not found or access denied")
 
-    content = await file.read()
-
+    # Fail fast on quota before the upload is read into memory: an exhausted
+    # contract rejects any file, and a linearized PDF declares its page count
+    # in the first KB.
+    pages_remaining = max(0, ent_orm.total_pages - (ent_orm.pages_used or 0))
+    if pages_remaining == 0:
+        raise _quota_exceeded(ent_orm, 1, pages_remaining)
+    # Don't pin a pooled connection while the upload is read and OCR runs
+    await run_in_threadpool(release_connection, db)
+    head = await file.read(1024)
+    await file.seek(0)
+    if detect_file_type(head[:16]) == "pdf":
+        declared_pages = linearized_page_count(head)
+        if declared_pages is not None and declared_pages > pages_remaining:
+            raise _quota_exceeded(ent_orm, declared_pages, pages_remaining)
+
+    hasher = hashlib.sha256()
+    content = await read_upload_limited(file, 50 * 1024 * 1024, hasher=hasher)
+
+    if content is None:
+        raise HTTPException(status_code=413, detail="File too large (max 50 MB)")
     if len(content) == 0:
         raise HTTPException(status_code=400, detail="Empty file uploaded")
-    if len(content) > 50 * 1024 * 1024:
-        raise HTTPException(status_code=413, detail="File too large (max 50 MB)")
 
-    file_type = detect_file_type(content)
+    file_type = detect_file_type(content[:16])
     if file_type == "unknown":
         raise HTTPException(
             status_code=415,
@@ -428,39 +494,36 @@ async def enterprise_ocr(
 
     if file_type == "pdf":
         try:
-            pages_in_file = count_pdf_pages(content)
+            # qpdf page-tree walk over up to 50 MB — keep it off the loop
+            pages_in_file = await run_in_threadpool(count_pdf_pages, content)
         except Exception:
             pages_in_file = 1
     else:
         pages_in_file = 1
 
-    pages_remaining = max(0, ent_orm.total_pages - (ent_orm.pages_used or 0))
     if pages_in_file > pages_remaining:
-        raise HTTPException(
-            status_code=402,
-            detail={
-                "message": (
-                    f"Page quota exceeded. This file has {pages_in_file} page(s) but "
-                    f"only {pages_remaining} page(s) remain for enterprise '{ent_orm.name}'."
-                ),
-                "pages_in_file":  pages_in_file,
-                "pages_remaining": pages_remaining,
-                "total_pages":    ent_orm.total_pages,
-            },
-        )
+        raise _quota_exceeded(ent_orm, pages_in_file, pages_remaining)
 
     request_start = time.time()
-    result = await process_file_auto(
-        content,
-        user=current_user,
-        user_id=current_user.id,
-        user_email=current_user.email,
-    )
+    # Identical bytes already processed for this enterprise → reuse the stored result.
+    # Quota is still charged and a new history row is written below.
+    content_hash = hasher.hexdigest()
+    result = await run_in_threadpool(find_enterprise_ocr_result, db, enterprise_id, content_hash)
+    if result is None:
+        await run_in_threadpool(release_connection, db)
+        result = await process_file_auto(
+            content,
+            user=current_user,
+            user_id=current_user.id,
+            user_email=current_user.email,
+        )
+    else:
+        logger.info(f"[EnterpriseOCR] Reusing stored result for enterprise_id={enterprise_id} sha256={content_hash[:12]}")
     duration = time.time() - request_start
 
     # Persist file and save DB record
     try:
-        file_path = save_uploaded_file(content, file.filename)
+        file_path = await run_in_threadpool(save_uploaded_file, content, file.filename)
     except Exception:
         file_path = None
 
@@ -471,6 +534,7 @@ async def enterprise_ocr(
         file_path       = file_path,
         file_type       = file_type,
         file_size       = len(content),
+        content_hash    = content_hash,
         ocr_mode        = result["mode"],
         ocr_engine      = result["engine"],
         languages       = result["languages"],
@@ -481,34 +545,25 @@ async def enterprise_ocr(
         processing_time = duration,
         character_count = len(result["text"]),
     )
-    saved_doc = save_enterprise_ocr_document(db, doc_payload)
-
-    # Build page-by-page response
-    pages_data = result.get("pages_data") or []
-    if pages_data and len(pages_data) > 1:
-        pages_info = [
-            {
-                "page_number":    p["page_number"],
-                "confidence":     round(p["confidence"], 2),
-                "character_count": p["character_count"],
-                "text":           p["text"],
-            }
-            for p in pages_data
-        ]
-    else:
-        pages_info = [{
-            "page_number":    1,
-            "confidence":     round(result["confidence"], 2),
-            "character_count": len(result["text"]),
-            "text":           result["text"],
-        }]
-
-    # Refresh ORM to get updated pages_used
-    db.refresh(ent_orm)
-    new_pages_used = ent_orm.pages_used or 0
-
-    return {
-        "pages_info": pages_info,
+    saved = await run_in_threadpool(save_enterprise_ocr_document, db, doc_payload)
+    if saved is None:
+        raise HTTPException(
+            status_code=402,
+            detail={
+                "message": (
+                    f"Page quota exceeded. This file has {result['pages']} page(s) but "
+                    f"the remaining quota for enterprise '{ent_orm.name}' was used up meanwhile."
+                ),
+                "pages_in_file": result["pages"],
+                "total_pages":   ent_orm.total_pages,
+            },
+        )
+    saved_doc, new_pages_used, total_pages = saved
+
+    # Plain JSON types throughout — serialise directly instead of walking the
+    # (potentially thousand-page) payload through jsonable_encoder first
+    return ORJSONResponse({
+        "pages_info": build_pages_info(result),
         "summary": {
             "total_pages":        result["pages"],
             "average_confidence": round(result["confidence"], 2),
@@ -520,11 +575,11 @@ async def enterprise_ocr(
         },
         "quota": {
             "pages_used":      new_pages_used,
-            "total_pages":     ent_orm.total_pages,
-            "pages_remaining": max(0, ent_orm.total_pages - new_pages_used),
+            "total_pages":     total_pages,
+            "pages_remaining": max(0, total_pages - new_pages_used),
         },
         "document_id": saved_doc.id,
-    }
+    })
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -536,7 +591,8 @@ async def enterprise_ocr_history(
     enterprise_id: int,
     skip:          int     = Query(0,   ge=0),
     limit:         int     = Query(100, ge=1, le=500),
-    current_user:  User    = Depends(require_admin),
+    cursor:        Optional[str] = Query(None, description="Opaque cursor from the previous page's `next_cursor`"),
+    scope:         EnterpriseScope = Depends(get_enterprise_scope),
     db:            Session = Depends(get_db),
 ):
     """
@@ -555,27 +611,31 @@ async def enterprise_ocr_history(
     | enterprise_id | Enterprise contract ID  |
 
     ### Query parameters
-    | Param | Default | Description       |
-    |-------|---------|-------------------|
-    | skip  | 0       | Pagination offset |
-    | limit | 100     | Max results (≤500)|
+    | Param  | Default | Description       |
+    |--------|---------|-------------------|
+    | skip   | 0       | Pagination offset |
+    | limit  | 100     | Max results (≤500)|
+    | cursor | null    | `next_cursor` from the previous page (leave `skip` at 0) |
 
     ### Frontend integration
     - Show in a "Document History" tab inside the enterprise detail page.
     - SUPER_USER: include "Processed By" column from `processor_name`.
     """
-    is_super = _is_super(current_user)
-    owner_filter = None if is_super else current_user.id
-    total, docs = get_enterprise_ocr_history(
-        db, enterprise_id, skip=skip, limit=limit, created_by=owner_filter
+    total, docs, has_more = get_enterprise_ocr_history(
+        db, enterprise_id, skip=skip, limit=limit, created_by=scope.owner_id,
+        after=decode_cursor(cursor),
     )
-    return EnterpriseOCRHistoryResponse(total=total, documents=docs)
+    return ORJSONResponse(EnterpriseOCRHistoryResponse(
+        total=total, documents=docs, next_cursor=next_cursor(docs, has_more)
+    ).model_dump(mode="json"))
 
 
 @router.get("/admin/ocr-history/all", response_model=EnterpriseOCRHistoryResponse)
 async def all_enterprise_ocr_history(
     skip:         int     = Query(0,   ge=0),
     limit:        int     = Query(100, ge=1, le=500),
+    cursor:       Optional[str] = Query(None, description="Opaque cursor from the previous page's `next_cursor`"),
+    exact_count:  bool    = Query(False, description="Run an exact COUNT(*) instead of using the table estimate"),
     current_user: User    = Depends(require_super_user),
     db:           Session = Depends(get_db),
 ):
@@ -590,22 +650,49 @@ async def all_enterprise_ocr_history(
     client's contract.
 
     ### Query parameters
-    | Param | Default | Description       |
-    |-------|---------|-------------------|
-    | skip  | 0       | Pagination offset |
-    | limit | 100     | Max results (≤500)|
+    | Param  | Default | Description       |
+    |--------|---------|-------------------|
+    | skip   | 0       | Pagination offset |
+    | limit  | 100     | Max results (≤500)|
+    | cursor | null    | `next_cursor` from the previous page (leave `skip` at 0) |
+    | exact_count | false | Exact `total` (full-table COUNT) instead of the planner estimate |
 
     ### Frontend integration
     - Render in a global "Enterprise OCR Activity" log in the super-user dashboard.
+    - Drive "load more" from `has_more`; treat `total` as approximate unless
+      `total_is_estimate` is false.
     - Group or filter by `enterprise_id` or `processed_by` on the frontend.
     """
+    from sqlalchemy import text, tuple_
     from app.models.enterprise import EnterpriseOCRDocument as EOD
-    from app.services.enterprise_service import _enrich_ocr_doc
-
-    q     = db.query(EOD).order_by(EOD.created_at.desc())
-    total = q.count()
-    docs  = q.offset(skip).limit(limit).all()
-    return EnterpriseOCRHistoryResponse(
-        total=total,
-        documents=[_enrich_ocr_doc(db, d) for d in docs],
+    from app.services.enterprise_service import _enrich_ocr_doc, ocr_history_query
+
+    after = decode_cursor(cursor)
+    q     = ocr_history_query(db)
+    if after is not None:
+        q = q.filter(tuple_(EOD.created_at, EOD.id) < after)
+    # One extra row tells us whether another page exists — no full-table count needed
+    rows, has_more = split_page(
+        q.order_by(EOD.created_at.desc(), EOD.id.desc()).offset(skip).limit(limit + 1).all(), limit
     )
+    documents = [_enrich_ocr_doc(doc, name) for doc, name in rows]
+
+    # The history is unfiltered, so pg_class.reltuples is a close, free total.
+    # It is -1 until the table is first analysed — fall back to counting then.
+    total = None
+    if not exact_count:
+        total = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :r"),
+            {"r": EOD.__tablename__},
+        ).scalar()
+    total_is_estimate = total is not None and total >= 0
+    if not total_is_estimate:
+        total = db.query(EOD).count()
+
+    return ORJSONResponse(EnterpriseOCRHistoryResponse(
+        total=total,
+        documents=documents,
+        next_cursor=next_cursor(documents, has_more),
+        has_more=has_more,
+        total_is_estimate=total_is_estimate,
+    ).model_dump(mode="json"))
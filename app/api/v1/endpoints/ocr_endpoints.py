@@ -1,14 +1,16 @@
 """OCR API endpoints"""
+import hashlib
 import os
 from pathlib import Path
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request, Response
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, Form, HTTPException, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse
 import logging
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
-from app.services.ocr_service import process_file, process_file_auto, detect_file_type, select_ocr_engine
+from app.services.ocr_service import process_file, process_file_auto_cached, detect_file_type, select_ocr_engine
 from app.services.ocr_crud import create_ocr_document
 from app.services.free_trial_service import (
     generate_device_fingerprint,
@@ -16,24 +18,44 @@ from app.services.free_trial_service import (
     check_and_increment_usage,
 )
 from app.utils.logger import log_ocr_operation
-from app.utils.file_storage import save_uploaded_file
+from app.utils.file_storage import read_upload_limited, save_uploaded_file
 from app.utils.pdf_utils import count_pdf_pages
+from app.utils.ocr_response import format_page_by_page_response
 from app.services.subscription_service import check_and_consume_quota, get_subscription_status
 from app.middleware.auth import require_user, require_user_or_trial, get_user_or_trial
 from app.models.user import User, UserRole
 from app.models.free_trial_user import FreeTrialUser
-from app.schemas.ocr_schemas import (
-    OCRDocumentCreate,
-    OCRDocumentResponse,
-)
+from app.schemas.ocr_schemas import OCRDocumentCreate
 from app.schemas.free_trial_schemas import CookieConsentRequest
 from app.core.dependencies import get_db
+from app.db.session import SessionLocal
 from app.core.config import settings
 from app.errors.exceptions import ForbiddenException
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Upload limits per caller type
+MAX_REGISTERED_UPLOAD_BYTES = 100 * 1024 * 1024
+MAX_TRIAL_UPLOAD_BYTES = 10 * 1024 * 1024
+
+# Results below this confidence, or requests slower than this, are logged as a concern
+LOW_CONFIDENCE_THRESHOLD = 80
+SLOW_REQUEST_SECONDS = 10.0
+
+# Attributes of the free-trial tracking cookie; only the value varies per request
+_TRIAL_COOKIE_KW = dict(
+    key="free_trial_id",
+    max_age=365 * 24 * 60 * 60,  # 1 year
+    httponly=True,
+    samesite="lax",
+    secure=False,  # Set to True in production with HTTPS
+)
+
+_UNSUPPORTED_FORMAT_DETAIL = (
+    "Unsupported file format. Please upload PDF, JPEG, PNG, GIF, BMP, WebP, or TIFF files."
+)
+
 
 @router.get("/images/{filename}")
 async def serve_ocr_image(filename: str):
@@ -70,84 +92,6 @@ async def serve_ocr_image(filename: str):
     )
 
 
-
-
-def format_plain_text_response(result: Dict[str, Any]) -> Dict[str, str]:
-    """Format response for plain text output mode"""
-    return {"text": result['text']}
-
-
-def format_page_by_page_response(result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-    """Format response for page-by-page text output mode with detailed page info"""
-    
-    if result.get('pages_data') and len(result.get('pages_data', [])) > 1:
-        # Multi-page format with detailed information
-        pages_info = []
-        
-        for page_data in result['pages_data']:
-            page_info = {
-                "page_number": page_data['page_number'],
-                "confidence": round(page_data['confidence'], 2),
-                "character_count": page_data['character_count'],
-                "text": page_data['text']
-            }
-            pages_info.append(page_info)
-        
-        return {
-            "pages_info": pages_info,
-            "summary": {
-                "total_pages": result['pages'],
-                "average_confidence": round(result['confidence'], 2),
-                "total_characters": sum(p['character_count'] for p in result['pages_data']),
-                "processing_details": f"{result['pages']} pages processed with {result['confidence']:.2f}% average confidence"
-            }
-        }
-    else:
-        # Single page format
-        return {
-            "pages_info": [{
-                "page_number": 1,
-                "confidence": round(result['confidence'], 2),
-                "character_count": len(result['text']),
-                "text": result['text']
-            }],
-            "summary": {
-                "total_pages": 1,
-                "average_confidence": round(result['confidence'], 2),
-                "total_characters": len(result['text']),
-                "processing_details": f"1 page processed with {result['confidence']:.2f}% confidence"
-            }
-        }
-
-
-def format_json_response(result: Dict[str, Any]) -> Dict[str, Any]:
-    """Format response for JSON output mode with clean structured data"""
-    
-    # Create clean JSON response
-    json_response = {
-        "text": result['text'],
-        "confidence": round(result['confidence'], 2),
-        "pages": result['pages'],
-        "languages": result['languages'],
-        "mode": result['mode'],
-        "engine": result['engine']
-    }
-    
-    # Add page-by-page data if available
-    if result.get('pages_data') and len(result.get('pages_data', [])) > 1:
-        json_response["pages_data"] = []
-        for page_data in result['pages_data']:
-            page_json = {
-                "page_number": page_data['page_number'],
-                "text": page_data['text'],
-                "confidence": round(page_data['confidence'], 2),
-                "character_count": page_data['character_count']
-            }
-            json_response["pages_data"].append(page_json)
-    
-    return json_response
-
-
 def save_to_database(
     db: Session,
     user_id: int,
@@ -157,9 +101,10 @@ def save_to_database(
     file_size: int, 
     result: Dict[str, Any],
     processing_time: float
-) -> OCRDocumentResponse:
+) -> Optional[int]:
     """
-    Save OCR result to database and file to disk
+    Save OCR result to database and file to disk.
+    Returns the new document's id, or None if the save failed.
     """
     try:
         file_path = save_uploaded_file(file_content, filename)
@@ -182,17 +127,143 @@ def save_to_database(
         )
         
         db_document = create_ocr_document(db, ocr_data)
-        logger.info(f"Saved OCR document to database: ID={db_document.id}, user_id={user_id}, filename={filename}, path={file_path}")
+        logger.info(
+            "Saved OCR document to database: ID=%s, user_id=%s, filename=%s, path=%s",
+            db_document.id, user_id, filename, file_path,
+        )
         
-        return OCRDocumentResponse.from_orm(db_document)
+        return db_document.id
     except Exception as e:
-        logger.error(f"Failed to save OCR document to database: {str(e)}")
+        logger.error("Failed to save OCR document to database: %s", e)
         # Don't fail the request if database save fails
         return None
 
 
+# ── Shared request pipeline ──────────────────────────────────────────────────
+
+async def _read_validated_upload(
+    file: UploadFile, max_bytes: int, too_large_detail: str
+) -> Tuple[bytes, str, int, str]:
+    """
+    Read the upload and reject oversize, empty, and unsupported files.
+    Returns (content, file_type, pages_in_file, sha256 hex digest).
+    """
+    hasher = hashlib.sha256()
+    content = await read_upload_limited(file, max_bytes, hasher=hasher)
+
+    if content is None:
+        logger.error("FILE TOO LARGE: %s (over %dMB)", file.filename, max_bytes // (1024 * 1024))
+        raise HTTPException(status_code=413, detail=too_large_detail)
+
+    if len(content) == 0:
+        logger.error("EMPTY FILE uploaded: %s", file.filename)
+        raise HTTPException(status_code=400, detail="Empty file uploaded")
+
+    # Detect and validate file type
+    file_type = detect_file_type(content[:16])
+    if file_type == 'unknown':
+        logger.error("UNSUPPORTED FILE TYPE: %s - Content-Type: %s", file.filename, file.content_type)
+        raise HTTPException(status_code=415, detail=_UNSUPPORTED_FORMAT_DETAIL)
+
+    # Page count is needed BEFORE consuming any quota/trial so rejections don't waste credits
+    if file_type == 'pdf':
+        try:
+            pages_in_file = await run_in_threadpool(count_pdf_pages, content)
+        except Exception:
+            pages_in_file = 1  # safe fallback
+    else:
+        pages_in_file = 1
+
+    return content, file_type, pages_in_file, hasher.hexdigest()
+
+
+def _consume_user_quota(db: Session, user: User, pages_in_file: int, free_tier_limited: bool) -> None:
+    """
+    Enforce the free-tier 1-page limit (when *free_tier_limited*) and charge the
+    user's subscription quota, raising 400 / 402 on rejection.
+    """
+    if free_tier_limited and user.free_ocr_remaining > 0 and pages_in_file > 1:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Free tier allows only 1 page per request. "
+                f"Your PDF has {pages_in_file} pages. "
+                f"Subscribe to process multi-page documents."
+            )
+        )
+
+    try:
+        check_and_consume_quota(db, user, pages_in_file)
+    except ValueError as quota_err:
+        quota_status = get_subscription_status(user)
+        raise HTTPException(
+            status_code=402,
+            detail={
+                "message": str(quota_err),
+                "subscription_status": quota_status.model_dump(),
+            },
+        )
+
+
+async def _run_ocr(
+    content: bytes,
+    content_hash: str,
+    filename: str,
+    file_type: str,
+    user: Optional[User],
+    user_id: Optional[int],
+    user_email: Optional[str],
+    request_start_time: float,
+    log_context: str,
+) -> Tuple[Dict[str, Any], float]:
+    """Pick the engine, run OCR, and log slow/low-confidence results. Returns (result, duration)."""
+    engine_choice = select_ocr_engine(user)
+    logger.info("OCR engine: %s | user_id=%s email=%s %s", engine_choice.upper(), user_id, user_email, log_context)
+    result, cache_hit = await process_file_auto_cached(
+        content,
+        content_hash,
+        user=user,
+        user_id=user_id,
+        user_email=user_email,
+    )
+
+    request_duration = time.time() - request_start_time
+    # A cached result was already reported when it was first produced
+    if not cache_hit and (
+        result['confidence'] < LOW_CONFIDENCE_THRESHOLD or request_duration > SLOW_REQUEST_SECONDS
+    ):
+        logger.warning(
+            "OCR CONCERN [%s] (%s) — user_id=%s email=%s — File: %s (%s) — "
+            "Duration: %.2fs — Confidence: %.2f%%",
+            engine_choice.upper(), log_context, user_id, user_email,
+            filename, file_type, request_duration, result['confidence'],
+        )
+    return result, request_duration
+
+
+def _save_result_task(
+    user_id: int,
+    filename: str,
+    content: bytes,
+    file_type: str,
+    result: Dict[str, Any],
+    request_duration: float,
+) -> None:
+    """
+    Background task: persist the upload and its OCR result after the response
+    has been sent. Runs in the threadpool with its own session — the request's
+    session is already closed by then.
+    """
+    with SessionLocal() as db:
+        save_to_database(
+            db, user_id, filename, content,
+            file_type, len(content), result, request_duration,
+        )
+
+
 @router.post("/pages") 
 async def ocr_page_by_page(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     save_to_db: bool = Form(True),
     db: Session = Depends(get_db),
@@ -207,7 +278,8 @@ async def ocr_page_by_page(
 
     Processes an uploaded document with Google Document AI and returns a
     structured, page-by-page breakdown of the extracted text. The result is
-    optionally saved to the database for later retrieval via `/documents/`.
+    optionally saved to the database for later retrieval via `/documents/`
+    (written just after the response is sent, so it appears there a moment later).
 
     ### Required form fields (multipart/form-data)
     | Field      | Type    | Default  | Description                                        |
@@ -248,101 +320,51 @@ async def ocr_page_by_page(
     request_start_time = time.time()
     
     try:
-        content = await file.read()
-        
-        if len(content) == 0:
-            logger.error(f"EMPTY FILE uploaded: {file.filename}")
-            raise HTTPException(status_code=400, detail="Empty file uploaded")
-        
-        if len(content) > 100 * 1024 * 1024:
-            logger.error(f"FILE TOO LARGE: {file.filename} ({len(content)//1024//1024}MB)")
-            raise HTTPException(status_code=413, detail="File too large (max 100MB)")
-
-        # Detect and validate file type
-        file_type = detect_file_type(content)
-        if file_type == 'unknown':
-            logger.error(f"UNSUPPORTED FILE TYPE: {file.filename} - Content-Type: {file.content_type}")
-            raise HTTPException(
-                status_code=415, 
-                detail="Unsupported file format. Please upload PDF, JPEG, PNG, GIF, BMP, WebP, or TIFF files."
-            )
-
-        if file_type == 'pdf':
-            try:
-                pages_in_file = count_pdf_pages(content)
-            except Exception:
-                pages_in_file = 1  # safe fallback
-        else:
-            pages_in_file = 1
+        content, file_type, pages_in_file, content_hash = await _read_validated_upload(
+            file, MAX_REGISTERED_UPLOAD_BYTES, "File too large (max 100MB)"
+        )
 
         # Authenticated users on free tier: 1 page max per request
         # ADMIN and SUPER_USER are exempt from this restriction
         is_privileged = current_user.role in (UserRole.ADMIN, UserRole.SUPER_USER)
-        if not is_privileged and current_user.free_ocr_remaining > 0 and pages_in_file > 1:
-            raise HTTPException(
-                status_code=400,
-                detail=(
-                    f"Free tier allows only 1 page per request. "
-                    f"Your PDF has {pages_in_file} pages. "
-                    f"Subscribe to process multi-page documents."
-                )
-            )
-
-        try:
-            check_and_consume_quota(db, current_user, pages_in_file)
-        except ValueError as quota_err:
-            quota_status = get_subscription_status(current_user)
-            raise HTTPException(
-                status_code=402,
-                detail={
-                    "message": str(quota_err),
-                    "subscription_status": quota_status.model_dump(),
-                },
-            )
+        _consume_user_quota(db, current_user, pages_in_file, free_tier_limited=not is_privileged)
 
-        engine_choice = select_ocr_engine(current_user)
-        logger.info(
-            f"OCR engine: {engine_choice.upper()} | user_id={current_user.id} "
-            f"email={current_user.email} role={current_user.role}"
-        )
-        result = await process_file_auto(
-            content,
+        result, request_duration = await _run_ocr(
+            content, content_hash, file.filename, file_type,
             user=current_user,
             user_id=current_user.id,
             user_email=current_user.email,
+            request_start_time=request_start_time,
+            log_context=f"role={current_user.role}",
         )
 
-        request_duration = time.time() - request_start_time
-
-        if result['confidence'] < 80 or request_duration > 10.0:
-            logger.warning(
-                f"OCR CONCERN [{engine_choice.upper()}] — user_id={current_user.id} "
-                f"email={current_user.email} — File: {file.filename} ({file_type}) — "
-                f"Duration: {request_duration:.2f}s — Confidence: {result['confidence']:.2f}%"
-            )
-
         if save_to_db:
-            save_to_database(db, current_user.id, file.filename, content, file_type, len(content), result, request_duration)
+            # Disk write + INSERT happen after the response is flushed
+            background_tasks.add_task(
+                _save_result_task, current_user.id, file.filename, content,
+                file_type, result, request_duration,
+            )
 
         response_data = format_page_by_page_response(result)
-        response_data["quota"] = get_subscription_status(current_user).model_dump()
-        return response_data
+        response_data["quota"] = get_subscription_status(current_user).model_dump(mode="json")
+        # Plain JSON types only — skip jsonable_encoder's walk over every page
+        return ORJSONResponse(response_data)
         
     except HTTPException as e:
         request_duration = time.time() - request_start_time
-        logger.error(f"OCR HTTP ERROR - File: {file.filename} - Duration: {request_duration:.2f}s - Error: {e.detail}")
+        logger.error("OCR HTTP ERROR - File: %s - Duration: %.2fs - Error: %s", file.filename, request_duration, e.detail)
         raise
         
     except Exception as e:
         request_duration = time.time() - request_start_time
-        logger.error(f"OCR INTERNAL ERROR - File: {file.filename} - Duration: {request_duration:.2f}s - Error: {str(e)}")
+        logger.error("OCR INTERNAL ERROR - File: %s - Duration: %.2fs - Error: %s", file.filename, request_duration, e)
         raise HTTPException(status_code=500, detail="Internal server error during OCR processing")
 
 
 @router.post("/free-trial") 
 async def ocr_free_trial(
     request: Request,
-    response: Response,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
@@ -416,39 +438,12 @@ async def ocr_free_trial(
         is_registered = isinstance(user_or_trial, User)
         user_id = user_or_trial.id if is_registered else None
 
-        content = await file.read()
-
-        if len(content) == 0:
-            logger.error(f"EMPTY FILE uploaded: {file.filename}")
-            raise HTTPException(status_code=400, detail="Empty file uploaded")
-
-        max_file_size = 100 * 1024 * 1024 if is_registered else 10 * 1024 * 1024
-        if len(content) > max_file_size:
-            size_limit = "100MB" if is_registered else "10MB"
-            logger.error(f"FILE TOO LARGE: {file.filename} ({len(content)//1024//1024}MB)")
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large (max {size_limit} for {'registered users' if is_registered else 'free trial'})"
-            )
-
-        # Detect and validate file type
-        file_type = detect_file_type(content)
-        if file_type == 'unknown':
-            logger.error(f"UNSUPPORTED FILE TYPE: {file.filename} - Content-Type: {file.content_type}")
-            raise HTTPException(
-                status_code=415,
-                detail="Unsupported file format. Please upload PDF, JPEG, PNG, GIF, BMP, WebP, or TIFF files."
-            )
-
-        # ── Page-count check (1 page max per request on free tier / free trial) ──
-        # Done BEFORE consuming any quota/trial so rejections don't waste credits.
-        if file_type == 'pdf':
-            try:
-                pages_in_file = count_pdf_pages(content)
-            except Exception:
-                pages_in_file = 1
-        else:
-            pages_in_file = 1
+        max_file_size = MAX_REGISTERED_UPLOAD_BYTES if is_registered else MAX_TRIAL_UPLOAD_BYTES
+        size_limit = "100MB" if is_registered else "10MB"
+        content, file_type, pages_in_file, content_hash = await _read_validated_upload(
+            file, max_file_size,
+            f"File too large (max {size_limit} for {'registered users' if is_registered else 'free trial'})",
+        )
 
         if not is_registered:
             # Free trial user: block multi-page PDFs
@@ -468,55 +463,21 @@ async def ocr_free_trial(
         else:
             trial_info = None
             # Registered users on free tier: 1 page max per request
-            if user_or_trial.free_ocr_remaining > 0 and pages_in_file > 1:
-                raise HTTPException(
-                    status_code=400,
-                    detail=(
-                        f"Free tier allows only 1 page per request. "
-                        f"Your PDF has {pages_in_file} pages. "
-                        f"Subscribe to process multi-page documents."
-                    )
-                )
-            try:
-                check_and_consume_quota(db, user_or_trial, pages_in_file)
-            except ValueError as quota_err:
-                quota_status = get_subscription_status(user_or_trial)
-                raise HTTPException(
-                    status_code=402,
-                    detail={
-                        "message": str(quota_err),
-                        "subscription_status": quota_status.model_dump(),
-                    },
-                )
+            _consume_user_quota(db, user_or_trial, pages_in_file, free_tier_limited=True)
 
-        user_email_for_log = getattr(user_or_trial, 'email', None)
-        engine_choice = select_ocr_engine(user_or_trial if is_registered else None)
-        logger.info(
-            f"OCR engine: {engine_choice.upper()} | user_id={user_id} "
-            f"email={user_email_for_log} registered={is_registered}"
-        )
-        result = await process_file_auto(
-            content,
+        result, request_duration = await _run_ocr(
+            content, content_hash, file.filename, file_type,
             user=user_or_trial if is_registered else None,
             user_id=user_id,
-            user_email=user_email_for_log,
+            user_email=getattr(user_or_trial, 'email', None),
+            request_start_time=request_start_time,
+            log_context="registered" if is_registered else "trial",
         )
-
-        request_duration = time.time() - request_start_time
-
-        user_type = "registered" if is_registered else "trial"
-        if result['confidence'] < 80 or request_duration > 10.0:
-            logger.warning(
-                f"OCR CONCERN [{engine_choice.upper()}] ({user_type}) — "
-                f"user_id={user_id} email={user_email_for_log} — "
-                f"File: {file.filename} ({file_type}) — "
-                f"Duration: {request_duration:.2f}s — Confidence: {result['confidence']:.2f}%"
-            )
         
         if is_registered:
-            save_to_database(
-                db, user_id, file.filename, content, 
-                file_type, len(content), result, request_duration
+            background_tasks.add_task(
+                _save_result_task, user_id, file.filename, content,
+                file_type, result, request_duration,
             )
         
         response_data = format_page_by_page_response(result)
@@ -530,28 +491,24 @@ async def ocr_free_trial(
             }
 
         if is_registered:
-            response_data["quota"] = get_subscription_status(user_or_trial).model_dump()
+            response_data["quota"] = get_subscription_status(user_or_trial).model_dump(mode="json")
         
-        if cookie_to_set and not needs_cookie_consent:
-            response.set_cookie(
-                key="free_trial_id",
-                value=cookie_to_set,
-                max_age=365 * 24 * 60 * 60,  # 1 year
-                httponly=True,
-                samesite="lax",
-                secure=False  # Set to True in production with HTTPS
-            )
+        # Plain JSON types only — skip jsonable_encoder's walk over every page
+        response = ORJSONResponse(response_data)
+        # get_user_or_trial only hands back a cookie once consent is settled
+        if cookie_to_set:
+            response.set_cookie(value=cookie_to_set, **_TRIAL_COOKIE_KW)
         
-        return response_data
+        return response
         
     except HTTPException as e:
         request_duration = time.time() - request_start_time
-        logger.error(f"OCR HTTP ERROR - File: {file.filename} - Duration: {request_duration:.2f}s - Error: {e.detail}")
+        logger.error("OCR HTTP ERROR - File: %s - Duration: %.2fs - Error: %s", file.filename, request_duration, e.detail)
         raise
         
     except Exception as e:
         request_duration = time.time() - request_start_time
-        logger.error(f"OCR INTERNAL ERROR - File: {file.filename} - Duration: {request_duration:.2f}s - Error: {str(e)}")
+        logger.error("OCR INTERNAL ERROR - File: %s - Duration: %.2fs - Error: %s", file.filename, request_duration, e)
         raise HTTPException(status_code=500, detail="Internal server error during OCR processing")
 
 
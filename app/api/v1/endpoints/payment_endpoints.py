@@ -4,14 +4,15 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_db
-from app.middleware.auth import require_user, require_super_user
-from app.models.user import User, UserRole
+from app.middleware.auth import require_regular_user, require_user, require_super_user
+from app.models.user import User
 from app.schemas.payment_schemas import (
-    PaymentCallbackPayload,
     PaymentCallbackResponse,
     PaymentHistoryResponse,
     PaymentInitiateRequest,
@@ -21,27 +22,21 @@ from app.services.payment_service import (
     get_all_payment_history,
     get_user_payment_history,
     initiate_payment,
+    payment_history_stamp,
     process_payment_callback,
 )
+from app.utils.etag import LISTING_CACHE_CONTROL, listing_etag, not_modified
+from app.utils.responses import RowJSONResponse
+from app.utils.pagination import decode_cursor
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def _assert_regular_user(user: User) -> None:
-    """Raise 403 for admin / super-user — they have unlimited access and don't subscribe."""
-    if user.role != UserRole.USER:
-        raise HTTPException(
-            status_code=403,
-            detail="Payment and subscriptions are only for regular users. "
-                   "Admins and super-users have unlimited OCR access.",
-        )
-
-
 @router.post("/initiate", response_model=PaymentInitiateResponse, status_code=201)
 async def initiate_subscription_payment(
     body: PaymentInitiateRequest,
-    current_user: User = Depends(require_user),
+    current_user: User = Depends(require_regular_user),
     db: Session = Depends(get_db),
 ):
     """
@@ -87,8 +82,6 @@ async def initiate_subscription_payment(
     - HTTP 403 → admin / super-user — they cannot subscribe.
     - HTTP 502 → PayStation service unavailable.
     """
-    _assert_regular_user(current_user)
-
     try:
         response = await initiate_payment(
             db=db,
@@ -109,6 +102,10 @@ async def initiate_subscription_payment(
 @router.get("/callback", response_model=PaymentCallbackResponse)
 async def payment_callback(
     request: Request,
+    background_tasks: BackgroundTasks,
+    status: Optional[str] = None,
+    invoice_number: Optional[str] = None,
+    trx_id: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
     """
@@ -135,22 +132,24 @@ async def payment_callback(
       returning to your site (via PayStation's success/failure redirect URL).
     - On return, call **GET /subscription/status** to check the updated quota.
     """
+    # Kept verbatim (including any extra params PayStation adds) for the audit column
     raw = dict(request.query_params)
-    logger.info(f"[Callback] Received params: {raw}")
+    logger.info("[Callback] Received params: %s", raw)
 
-    payload = PaymentCallbackPayload(**raw)
-
-    if not payload.invoice_number:
+    if not invoice_number:
         logger.warning("[Callback] Received callback without invoice_number")
         return PaymentCallbackResponse(success=False, message="Missing invoice_number")
 
     # PayStation status values: Successful / Failed / Canceled
-    result = process_payment_callback(
+    result = await run_in_threadpool(
+        process_payment_callback,
         db=db,
-        invoice_number=payload.invoice_number,
-        reported_status=payload.status or "",
+        invoice_number=invoice_number,
+        reported_status=status or "",
         reported_amount=None,  # not provided in query params
         raw_payload=raw,
+        # Invoice PDF + SMTP run after the response so PayStation gets its ack quickly
+        schedule=background_tasks.add_task,
     )
     return PaymentCallbackResponse(**result)
 
@@ -159,6 +158,7 @@ async def payment_callback(
 async def my_payment_history(
     skip: int = Query(0, ge=0, description="Pagination offset"),
     limit: int = Query(50, ge=1, le=200, description="Max records to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's `next_cursor`"),
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
 ):
@@ -176,6 +176,7 @@ async def my_payment_history(
     |-------|------|---------|-------------------------------|
     | skip  | int  | 0       | Pagination offset             |
     | limit | int  | 50      | Max records to return (max 200)|
+    | cursor | string | null  | `next_cursor` from the previous page (leave `skip` at 0) |
 
     ### Response — PaymentHistoryResponse
     Contains a `payments` list with `invoice_number`, `amount`, `status`,
@@ -183,16 +184,24 @@ async def my_payment_history(
 
     ### Frontend integration
     - Render in a "Billing History" or "Payment Records" section in settings.
-    - Use `skip` + `limit` for pagination.
+    - Use `skip` + `limit` for pagination, or pass back `next_cursor` as
+      `cursor` for "load more" — constant cost per page.
     - Example: `GET /payment/history?skip=0&limit=20`
     """
-    return get_user_payment_history(db, user_id=current_user.id, skip=skip, limit=limit)
+    history = await run_in_threadpool(
+        get_user_payment_history, db, user_id=current_user.id, skip=skip, limit=limit,
+        after=decode_cursor(cursor),
+    )
+    # Plain column dicts shaped like PaymentHistoryResponse — serialise directly
+    return RowJSONResponse(history)
 
 
 @router.get("/admin/all", response_model=PaymentHistoryResponse)
 async def all_payment_history(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's `next_cursor`"),
     status: Optional[str] = Query(
         None,
         description="Filter by status: pending | success | failed | cancelled",
@@ -215,11 +224,26 @@ async def all_payment_history(
     |--------|--------|---------|--------------------------------------------------|
     | skip   | int    | 0       | Pagination offset                                |
     | limit  | int    | 100     | Max records to return (max 500)                  |
+    | cursor | string | null    | `next_cursor` from the previous page (leave `skip` at 0) |
     | status | string | null    | Filter: `pending`, `success`, `failed`, `cancelled` |
 
+    Carries an `ETag`; a poll with a matching `If-None-Match` gets
+    **HTTP 304** with no body while no matching payment has changed.
+
     ### Frontend integration
     - Use in an admin dashboard payments table.
     - Example: `GET /payment/admin/all?status=success&limit=50`
     - HTTP 403 → caller is not a SUPER_USER.
     """
-    return get_all_payment_history(db, skip=skip, limit=limit, status_filter=status)
+    after = decode_cursor(cursor)
+    # One aggregate decides whether the admin's copy is still current
+    stamp = await run_in_threadpool(payment_history_stamp, db, status)
+    etag = listing_etag(stamp, skip, limit, status, after)
+    cache_headers = {"ETag": etag, "Cache-Control": LISTING_CACHE_CONTROL}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    history = await run_in_threadpool(
+        get_all_payment_history, db, skip=skip, limit=limit, status_filter=status, after=after,
+    )
+    return RowJSONResponse(history, headers=cache_headers)
@@ -1,8 +1,9 @@
 """Subscription API endpoints — for regular users (UserRole.USER) only."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 
-from app.middleware.auth import require_user
-from app.models.user import User, UserRole
+from app.middleware.auth import require_regular_user
+from app.models.user import User
 from app.schemas.subscription_schemas import (
     SubscriptionCostRequest,
     SubscriptionCostResponse,
@@ -16,19 +17,9 @@ from app.services.subscription_service import (
 router = APIRouter()
 
 
-def _assert_regular_user(user: User) -> None:
-    """Raise 403 if the caller is an admin or super_user."""
-    if user.role != UserRole.USER:
-        raise HTTPException(
-            status_code=403,
-            detail="Subscription management is only available for regular users. "
-                   "Admins and super-users have unlimited OCR access.",
-        )
-
-
 @router.get("/status", response_model=SubscriptionStatus)
 async def subscription_status(
-    current_user: User = Depends(require_user),
+    current_user: User = Depends(require_regular_user),
 ):
     """
     ## Get current subscription status
@@ -55,14 +46,15 @@ async def subscription_status(
     - Show a "Buy More Pages" CTA when `ocr_quota_remaining` reaches 0.
     - Example: `GET /subscription/status`
     """
-    _assert_regular_user(current_user)
-    return get_subscription_status(current_user)
+    # Built from the user row the auth dependency already loaded — no query of
+    # its own. Dump once and skip FastAPI's second response_model validation.
+    return ORJSONResponse(get_subscription_status(current_user).model_dump(mode="json"))
 
 
 @router.post("/calculate-cost", response_model=SubscriptionCostResponse)
 async def calculate_cost(
     body: SubscriptionCostRequest,
-    current_user: User = Depends(require_user),
+    current_user: User = Depends(require_regular_user),
 ):
     """
     ## Calculate subscription cost before purchasing
@@ -95,5 +87,4 @@ async def calculate_cost(
     - Pass the same `pages` value to **POST /payment/initiate** to start the
       actual payment.
     """
-    _assert_regular_user(current_user)
-    return calculate_subscription_cost(body.pages)
+    return ORJSONResponse(calculate_subscription_cost(body.pages).model_dump(mode="json"))
@@ -1,19 +1,25 @@
 """Super User API endpoints"""
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.core.dependencies import get_db
 from app.services.auth_service import (
     create_user,
-    get_user_by_username,
-    get_user_by_email
+    delete_user_by_id,
+    find_registration_conflict,
+    get_users,
+    users_change_stamp,
 )
 from app.schemas.auth_schemas import (
     UserCreate,
     UserResponse
 )
 from app.middleware.auth import require_super_user
+from app.utils.etag import LISTING_CACHE_CONTROL, listing_etag, not_modified
+from app.utils.responses import RowJSONResponse
 from app.models.user import User, UserRole
 from app.errors.exceptions import (
     ConflictException,
@@ -59,16 +65,25 @@ async def create_admin_user(
     - HTTP 400 → invalid role (only `ADMIN` / `USER` allowed).
     - HTTP 403 → caller is not a SUPER_USER.
     """
-    if get_user_by_username(db, user_data.username):
+    # Blocking DB round-trips and the bcrypt hash run in the threadpool,
+    # not on the event loop this async handler runs on.
+    # Both uniqueness checks in a single SELECT
+    conflict = await run_in_threadpool(find_registration_conflict, db, user_data.username, user_data.email)
+    if conflict == "username":
         raise ConflictException(detail="Username already registered")
-    
-    if get_user_by_email(db, user_data.email):
+    if conflict == "email":
         raise ConflictException(detail="Email already registered")
     
     if user_data.role not in [UserRole.ADMIN, UserRole.USER]:
         raise BadRequestException(detail="Can only create ADMIN or USER roles")
     
-    user = create_user(db, user_data)
+    try:
+        user = await run_in_threadpool(create_user, db, user_data)
+    except IntegrityError:
+        # Lost a race with a concurrent signup — the unique indexes on
+        # username / lower(email) have the final say
+        db.rollback()
+        raise ConflictException(detail="Username or email already registered")
     return user
 
 
@@ -106,20 +121,18 @@ async def delete_user(
     if user_id == current_user.id:
         raise BadRequestException(detail="Cannot delete your own account")
     
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    if not await run_in_threadpool(delete_user_by_id, db, user_id):
         raise NotFoundException(detail="User not found")
     
-    db.delete(user)
-    db.commit()
-    
     return {"message": "User deleted successfully"}
 
 
 @router.get("/users", response_model=List[UserResponse])
 async def list_users(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Query(None, ge=0, description="Keyset cursor: id of the last user on the previous page"),
     current_user: User = Depends(require_super_user),
     db: Session = Depends(get_db)
 ):
@@ -131,23 +144,37 @@ async def list_users(
     **Auth:** `Authorization: Bearer <token>` header required.
 
     Returns a paginated list of every user account in the system regardless
-    of role or status.
+    of role or status, in `id` order.
 
     ### Query parameters
     | Param | Type | Default | Description              |
     |-------|------|---------|--------------------------|
     | skip  | int  | 0       | Pagination offset        |
     | limit | int  | 100     | Max records to return    |
+    | after_id | int | null   | Keyset cursor — `id` of the last user already shown |
 
     ### Response — List[UserResponse]
     Each entry includes `id`, `username`, `email`, `role`, `is_active`,
     `is_verified`, subscription fields, and quota balances.
 
+    Carries an `ETag`; a poll with a matching `If-None-Match` gets
+    **HTTP 304** with no body while no user has been added, removed or changed.
+
     ### Frontend integration
     - Render in an admin "Users" management table.
-    - Use `skip` + `limit` for pagination.
+    - Use `skip` + `limit` for pagination, or pass the last `id` of the
+      current page as `after_id` — constant cost per page.
     - Example: `GET /super-user/users?skip=0&limit=25`
     - HTTP 403 → caller is not a SUPER_USER.
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    # One aggregate decides whether the admin's copy is still current
+    stamp = await run_in_threadpool(users_change_stamp, db)
+    etag = listing_etag(stamp, skip, limit, after_id)
+    cache_headers = {"ETag": etag, "Cache-Control": LISTING_CACHE_CONTROL}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    users = await run_in_threadpool(get_users, db, skip, limit, after_id)
+    # Rows are plain column dicts matching UserResponse field-for-field,
+    # so serialise them straight away instead of validating every row.
+    return RowJSONResponse(users, headers=cache_headers)
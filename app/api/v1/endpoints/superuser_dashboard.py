@@ -207,7 +207,7 @@ async def get_all_enterprises(
     **Role:** SUPER_USER only. Returns all enterprise contracts (from every admin)
     plus a platform-level billing summary (`total_cost`, `total_due_amount`, etc.).
     """
-    total, enterprises = list_enterprises(
+    total, enterprises, _ = list_enterprises(
         db, created_by=None, skip=skip, limit=limit
     )
     billing = get_billing_summary(db)
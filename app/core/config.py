@@ -17,6 +17,16 @@ class Settings:
     def DATABASE_URL(self) -> str:
         """Construct PostgreSQL database URL"""
         return f"postgresql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
+
+    # Connection pool — size it against Postgres max_connections (or a PgBouncer
+    # pool) divided by the number of app workers.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    # Seconds to wait for a free connection before failing the request, rather
+    # than queueing behind a saturated pool for SQLAlchemy's default 30 s
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 5))
+    # Replace connections older than this so server/proxy idle timeouts never hand out a dead one
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 3600))
     
     # Google Document AI Configuration (Optional)
     GOOGLE_PROJECT_ID = os.getenv("GOOGLE_PROJECT_ID")
@@ -34,6 +44,10 @@ class Settings:
     OCR_MAX_CONVERSION_THREADS = int(os.getenv("OCR_MAX_CONVERSION_THREADS", 4))
     OCR_ENGINE_MAX_WORKERS = int(os.getenv("OCR_ENGINE_MAX_WORKERS", max(2, min(8, (os.cpu_count() or 4)))))
     
+    # Worker threads for sync work pushed off the event loop (bcrypt, sync deps).
+    # 40 matches anyio's built-in default.
+    THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", 40))
+    
     # Logging Configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE = os.getenv("LOG_FILE", "app/logs/logs.txt")
@@ -45,7 +59,9 @@ class Settings:
     
     # API Configuration
     # No global request timeout — large PDFs (up to 1000 pages) need unlimited time.
-    MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", 500))
+    # Whole-request ceiling checked against Content-Length before the body is
+    # read: the largest per-endpoint upload limit (100MB) plus multipart framing.
+    MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", 101))
     
     # PayStation Payment Gateway
     PAYSTATION_MERCHANT_ID = os.getenv("PAYSTATION_MERCHANT_ID", "").strip()
@@ -57,6 +73,8 @@ class Settings:
     # Development/Production Settings
     ENVIRONMENT = os.getenv("ENVIRONMENT", "production")
     DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+    # Set to false to skip serving /docs, /redoc and the OpenAPI schema entirely
+    ENABLE_API_DOCS = os.getenv("ENABLE_API_DOCS", "true").lower() == "true"
     
     # Project Metadata
     PROJECT_NAME = "OCR Pipeline API"
@@ -80,6 +98,11 @@ class Settings:
     SMTP_USER = os.getenv("SMTP_USER", "")
     SMTP_PASS = os.getenv("SMTP_PASS", "")
     EMAIL_FROM = os.getenv("EMAIL_FROM", "noreply@doceanai.cloud")
+    # Authenticated SMTP sessions kept open for reuse between sends
+    SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 2))
+
+    # Enterprise writes within this window share one admin stats view refresh
+    ADMIN_STATS_REFRESH_DELAY_SECONDS = float(os.getenv("ADMIN_STATS_REFRESH_DELAY_SECONDS", 30))
 
     # OTP expiry (minutes)
     OTP_EXPIRE_MINUTES = int(os.getenv("OTP_EXPIRE_MINUTES", 10))
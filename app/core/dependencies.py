@@ -1,5 +1,6 @@
 """FastAPI dependencies"""
 from typing import Generator
+from fastapi import Request
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 
@@ -7,10 +8,20 @@ from app.db.session import SessionLocal
 def get_db() -> Generator:
     """
     Database session dependency
-    Yields a database session and ensures it's closed after use
+    Yields a database session and ensures it's closed after use.
+    FastAPI caches dependencies per request, so every Depends(get_db) in one
+    request (endpoint and auth dependencies alike) shares this one session.
     """
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_user_cache(request: Request) -> dict:
+    """
+    Per-request memo for user lookups, keyed ("email" | "username" | "id", value).
+    Lives on request.state so every dependency in the same request shares it.
+    """
+    return request.state.__dict__.setdefault("user_cache", {})
@@ -1,4 +1,15 @@
 """Database base class for SQLAlchemy models"""
+from sqlalchemy import Boolean, Column
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
+
+
+class SoftDeleteMixin:
+    """
+    Marks a model whose is_deleted rows are hidden from every ORM SELECT
+    (see app.db.session). Opt a statement out with
+    .execution_options(include_deleted=True).
+    """
+    # Declared here so the loader criterion can be built against the mixin
+    is_deleted = Column(Boolean, default=False, nullable=False)
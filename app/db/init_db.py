@@ -6,6 +6,7 @@ from app.db.session import engine, SessionLocal
 from app.models.ocr_document import OCRDocument
 from app.models.user import User, UserRole
 from app.services.auth_service import get_password_hash
+from app.services.enterprise_service import ensure_admin_stats_view
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,8 @@ def init_db() -> None:
     """Create all database tables"""
     try:
         Base.metadata.create_all(bind=engine)
+        with SessionLocal() as db:
+            ensure_admin_stats_view(db)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {str(e)}")
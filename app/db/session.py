@@ -1,16 +1,53 @@
 """Database session management"""
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker, with_loader_criteria
 from app.core.config import settings
+from app.db.base import SoftDeleteMixin
 
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    # Compiled-SQL cache (default 500): room for every hot auth/document statement
+    query_cache_size=1200,
     echo=settings.DEBUG
 )
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: sessions are per-request, so objects returned by an
+# INSERT/UPDATE ... RETURNING stay usable after commit without a reload SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+# Soft-deleted rows are filtered centrally instead of by every caller. The
+# criterion renders as `is_deleted = false`, so the partial live-row indexes
+# still match. Relationship/column loads are left alone so cascades and
+# refreshes still see every row.
+_live_rows = with_loader_criteria(
+    SoftDeleteMixin, lambda cls: cls.is_deleted == False, include_aliases=True
+)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _hide_soft_deleted(state: ORMExecuteState) -> None:
+    if (
+        state.is_select
+        and not state.is_column_load
+        and not state.is_relationship_load
+        and not state.execution_options.get("include_deleted", False)
+    ):
+        state.statement = state.statement.options(_live_rows)
+
+
+def release_connection(db: Session) -> None:
+    """
+    End the session's current transaction so its pooled connection goes back
+    to the pool before a long await (upload read, remote OCR). Loaded objects
+    stay usable thanks to expire_on_commit=False; the next query checks a
+    connection out again.
+    """
+    db.commit()
@@ -11,7 +11,8 @@ from app.errors.exceptions import (
     ValidationException,
     DatabaseException,
     FileUploadException,
-    OCRProcessingException
+    OCRProcessingException,
+    TooManyRequestsException
 )
 from app.errors.response_codes import (
     SuccessCode,
@@ -34,6 +35,7 @@ __all__ = [
     "DatabaseException",
     "FileUploadException",
     "OCRProcessingException",
+    "TooManyRequestsException",
     "SuccessCode",
     "ErrorCode",
     "success_response",
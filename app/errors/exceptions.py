@@ -85,3 +85,15 @@ class FileUploadException(BadRequestException):
 class OCRProcessingException(InternalServerException):
     """OCR processing failed"""
     detail = "OCR processing failed"
+
+
+class TooManyRequestsException(BaseHTTPException):
+    """429 Too Many Requests"""
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    detail = "Too many requests. Please try again later."
+
+    def __init__(self, detail: str = None, retry_after: int = None):
+        super().__init__(
+            detail=detail,
+            headers={"Retry-After": str(retry_after)} if retry_after else None
+        )
@@ -1,6 +1,6 @@
 """Error handlers for the application"""
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 import logging
@@ -22,7 +22,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     
     logger.warning(f"Validation error on {request.url}: {errors}")
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": "Validation error",
@@ -37,7 +37,7 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     """
     logger.error(f"Database error on {request.url}: {str(exc)}")
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Database error occurred",
@@ -52,7 +52,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     """
     logger.error(f"Unhandled exception on {request.url}: {str(exc)}", exc_info=True)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Internal server error",
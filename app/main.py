@@ -1,15 +1,20 @@
 """Main FastAPI application"""
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi.openapi.utils import get_openapi
+import anyio.to_thread
 import logging
 
 from app.core.config import settings
 from app.utils.logger import setup_file_logging
 from app.api.v1.api import api_router
+from app.middleware.upload_limit import ContentLengthLimitMiddleware
 from app.db.init_db import init_db, create_initial_data
+from app.services.ocr_service import warm_up as warm_up_ocr
+from app.services.enterprise_service import flush_admin_stats_refresh
 from app.errors.handlers import (
     validation_exception_handler,
     sqlalchemy_exception_handler,
@@ -23,9 +28,11 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     description="Advanced OCR system with authentication, authorization, and PostgreSQL storage",
     version=settings.PROJECT_VERSION,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    docs_url="/docs" if settings.ENABLE_API_DOCS else None,
+    redoc_url="/redoc" if settings.ENABLE_API_DOCS else None,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.ENABLE_API_DOCS else None,
+    # orjson encodes response bodies (datetimes, enums, lists of models) in C
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -60,6 +67,10 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+# Oversize uploads are refused from the headers alone; GZip is deliberately not
+# added — uploads are already-compressed PDFs/images.
+app.add_middleware(ContentLengthLimitMiddleware, max_bytes=settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -78,6 +89,12 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and log application startup"""
+    # Size the threadpool used by run_in_threadpool / sync dependencies
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
+    # Load language profiles and OCR clients now rather than on the first upload
+    await anyio.to_thread.run_sync(warm_up_ocr)
+
     try:
         init_db()
         create_initial_data()
@@ -89,7 +106,9 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Log application shutdown"""
+    """Flush pending background work and log application shutdown"""
+    # Don't let enterprise writes from the last debounce window go unreflected
+    await anyio.to_thread.run_sync(flush_admin_stats_refresh)
     logger.warning(f"{settings.PROJECT_NAME} SHUTDOWN")
 
 
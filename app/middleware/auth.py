@@ -4,7 +4,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from typing import Optional, Union
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_db, get_user_cache
 from app.services.auth_service import decode_access_token, get_user_by_id
 from app.services.free_trial_service import (
     get_or_create_free_trial_user,
@@ -21,7 +21,8 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=F
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user_cache: dict = Depends(get_user_cache),
 ) -> User:
     """Get current authenticated user from JWT token"""
     token_data = decode_access_token(token)
@@ -29,7 +30,7 @@ async def get_current_user(
     if token_data is None or token_data.user_id is None:
         raise UnauthorizedException(detail="Could not validate credentials")
     
-    user = get_user_by_id(db, user_id=token_data.user_id)
+    user = get_user_by_id(db, user_id=token_data.user_id, cache=user_cache)
     
     if user is None:
         raise UnauthorizedException(detail="User not found")
@@ -63,6 +64,16 @@ require_admin = require_role(UserRole.ADMIN)
 require_user = require_role(UserRole.USER)
 
 
+async def require_regular_user(current_user: User = Depends(get_current_user)) -> User:
+    """Require a plain USER — admins and super-users have unlimited access and don't subscribe"""
+    if current_user.role != UserRole.USER:
+        raise ForbiddenException(
+            detail="Payment and subscriptions are only for regular users. "
+                   "Admins and super-users have unlimited OCR access."
+        )
+    return current_user
+
+
 def get_optional_user(
     token: Optional[str] = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
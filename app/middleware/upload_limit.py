@@ -0,0 +1,34 @@
+"""Reject request bodies over the upload ceiling before they are received"""
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class ContentLengthLimitMiddleware:
+    """
+    Answer 413 from the Content-Length header alone when it exceeds *max_bytes*.
+
+    Route handlers only run after Starlette has spooled the whole multipart
+    form, so a size check inside an endpoint still pays for receiving the body.
+    Checking here lets the client be turned away before any of it is read.
+    Chunked bodies carry no Content-Length and are still bounded by the
+    per-endpoint limit in read_upload_limited.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_bytes:
+                        response = JSONResponse(
+                            {"detail": f"Request body too large (max {self.max_bytes // (1024 * 1024)}MB)"},
+                            status_code=413,
+                            headers={"Connection": "close"},
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
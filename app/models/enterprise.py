@@ -1,12 +1,12 @@
 """Enterprise OCR models — enterprise contracts, OCR documents, and billing."""
 from sqlalchemy import (
     Column, Integer, String, Text, Float, DateTime, Date,
-    JSON, ForeignKey, Boolean, Enum as SQLEnum
+    JSON, ForeignKey, Enum as SQLEnum, Index, CheckConstraint, text, table, column
 )
 from sqlalchemy.sql import func
 from enum import Enum
 
-from app.db.base import Base
+from app.db.base import Base, SoftDeleteMixin
 
 
 class EnterprisePaymentStatus(str, Enum):
@@ -15,14 +15,26 @@ class EnterprisePaymentStatus(str, Enum):
     DUE          = "due"
 
 
-class Enterprise(Base):
+class Enterprise(SoftDeleteMixin, Base):
     """
     An enterprise contract created by an ADMIN (or SUPER_USER).
     Holds all billing, quota, and contact information for the client.
     """
     __tablename__ = "enterprises"
+    __table_args__ = (
+        # Admin dashboard / listings only ever look at a creator's live rows
+        Index(
+            "ix_enterprises_creator_active",
+            "created_by",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index("ix_enterprises_creator_status", "created_by", "payment_status"),
+        Index("ix_enterprises_is_deleted", "is_deleted"),
+        # Quota is charged with a conditional UPDATE; this is the backstop
+        CheckConstraint("pages_used <= total_pages", name="ck_enterprises_pages_used_within_quota"),
+    )
 
-    id              = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id              = Column(Integer, primary_key=True, autoincrement=True)
 
     # ── Contact & description ──────────────────────────────────────────────────
     name            = Column(String(255), nullable=False, index=True)
@@ -61,8 +73,6 @@ class Enterprise(Base):
     # ── Ownership ─────────────────────────────────────────────────────────────
     created_by      = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
-    is_deleted      = Column(Boolean, default=False, nullable=False, index=True)
-
     created_at  = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at  = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
@@ -79,15 +89,30 @@ class EnterpriseOCRDocument(Base):
     Mirrors OCRDocument but scoped to an enterprise instead of a regular user.
     """
     __tablename__ = "enterprise_ocr_documents"
+    __table_args__ = (
+        # Newest-first history, keyset-seeked on (created_at, id) — per enterprise and platform-wide
+        Index(
+            "ix_enterprise_ocr_documents_enterprise_created",
+            "enterprise_id", text("created_at DESC"), text("id DESC"),
+        ),
+        Index("ix_enterprise_ocr_documents_created_id", text("created_at DESC"), text("id DESC")),
+        # Re-uploads of the same bytes under one enterprise reuse the stored result
+        Index(
+            "ix_enterprise_ocr_documents_enterprise_hash",
+            "enterprise_id", "content_hash",
+            postgresql_where=text("content_hash IS NOT NULL"),
+        ),
+    )
 
-    id             = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    enterprise_id  = Column(Integer, ForeignKey("enterprises.id"), nullable=False, index=True)
+    id             = Column(Integer, primary_key=True, autoincrement=True)
+    enterprise_id  = Column(Integer, ForeignKey("enterprises.id"), nullable=False)
     processed_by   = Column(Integer, ForeignKey("users.id"),        nullable=False, index=True)
 
     filename       = Column(String(255), nullable=False, index=True)
     file_path      = Column(String(512), nullable=True)
     file_type      = Column(String(50),  nullable=False)
     file_size      = Column(Integer,     nullable=False)
+    content_hash   = Column(String(64),  nullable=True)                 # sha256 hex of the upload
 
     ocr_mode       = Column(String(50),  nullable=False)
     ocr_engine     = Column(String(255), nullable=False)
@@ -108,3 +133,37 @@ class EnterpriseOCRDocument(Base):
             f"<EnterpriseOCRDocument(id={self.id}, enterprise_id={self.enterprise_id}, "
             f"file='{self.filename}', pages={self.total_pages})>"
         )
+
+
+# Materialized view (see migration e16e57bd26a6). Declared as a lightweight
+# table() so it is queryable but never emitted by Base.metadata.create_all.
+# The defining query, used by enterprise_service.ensure_admin_stats_view for
+# schemas built with create_all. Keep it in step with the migration.
+ADMIN_ENTERPRISE_STATS_QUERY = """
+SELECT
+    created_by                                                AS admin_id,
+    count(*)                                                  AS total_enterprises,
+    coalesce(sum(total_pages), 0)                             AS total_pages_allocated,
+    coalesce(sum(pages_used), 0)                              AS total_pages_used,
+    coalesce(sum(advance_bill), 0.0)                          AS total_revenue_collected,
+    coalesce(sum(due_amount), 0.0)                            AS total_due_amount,
+    count(*) FILTER (WHERE payment_status = 'paid')           AS paid_count,
+    count(*) FILTER (WHERE payment_status = 'partial_paid')   AS partial_paid_count,
+    count(*) FILTER (WHERE payment_status = 'due')            AS due_count
+FROM enterprises
+WHERE is_deleted = false
+GROUP BY created_by
+"""
+
+admin_enterprise_stats = table(
+    "admin_enterprise_stats",
+    column("admin_id", Integer),
+    column("total_enterprises", Integer),
+    column("total_pages_allocated", Integer),
+    column("total_pages_used", Integer),
+    column("total_revenue_collected", Float),
+    column("total_due_amount", Float),
+    column("paid_count", Integer),
+    column("partial_paid_count", Integer),
+    column("due_count", Integer),
+)
@@ -1,5 +1,6 @@
 """Free trial user model for tracking anonymous users"""
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, Boolean, Index, text
+from sqlalchemy.dialects.postgresql import INET
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -10,22 +11,29 @@ class FreeTrialUser(Base):
     Allows 3 free OCR requests per device (not per browser) before requiring registration
     """
     __tablename__ = "free_trial_users"
+    __table_args__ = (
+        Index(
+            "ix_free_trial_users_cookie_id",
+            "cookie_id",
+            postgresql_where=text("cookie_id IS NOT NULL"),
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     device_id = Column(String(255), unique=True, nullable=False, index=True)
-    usage_count = Column(Integer, default=0, nullable=False)
-    max_usage = Column(Integer, default=3, nullable=False)
+    usage_count = Column(SmallInteger, default=0, nullable=False)
+    max_usage = Column(SmallInteger, default=3, nullable=False)
     
     first_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     last_used_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
     
-    cookie_id = Column(String(255), nullable=True, index=True)
+    cookie_id = Column(String(255), nullable=True)
     
     cookie_consent_given = Column(Boolean, nullable=True)
     cookie_consent_at = Column(DateTime(timezone=True), nullable=True)
     
     user_agent = Column(String(500), nullable=True)
-    ip_address = Column(String(45), nullable=True)
+    ip_address = Column(INET, nullable=True)
     
     is_blocked = Column(Boolean, default=False, nullable=False)
     
@@ -1,17 +1,31 @@
 """OCR Document database model"""
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, ForeignKey, Index, text
 from sqlalchemy.sql import func
-from app.db.base import Base
+from app.db.base import Base, SoftDeleteMixin
 
 
-class OCRDocument(Base):
+class OCRDocument(SoftDeleteMixin, Base):
     """
     Database model for storing OCR processed documents
     """
     __tablename__ = "ocr_documents"
+    __table_args__ = (
+        # Per-user listings keyset-seek on id. Kept over every row (not just
+        # live ones) so it also serves FK checks and include_deleted lookups —
+        # no separate single-column user_id index
+        Index("ix_ocr_documents_user_id_desc", "user_id", text("id DESC")),
+        # Offset-paged per-user listings are newest-first by created_at
+        Index(
+            "ix_ocr_documents_user_created_active",
+            "user_id", text("created_at DESC"), text("id DESC"),
+            postgresql_where=text("is_deleted = false"),
+        ),
+        # Unscoped (super-user) listings are newest-first across every user
+        Index("ix_ocr_documents_created_id", text("created_at DESC"), text("id DESC")),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     filename = Column(String(255), nullable=False, index=True)
     file_path = Column(String(512), nullable=True, index=True)
     file_type = Column(String(50), nullable=False)
@@ -28,7 +42,6 @@ class OCRDocument(Base):
     
     processing_time = Column(Float, nullable=True)
     character_count = Column(Integer, nullable=True)
-    is_deleted = Column(Boolean, default=False, nullable=False, index=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
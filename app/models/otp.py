@@ -1,7 +1,7 @@
 """EmailOTP — stores pending registration OTP codes."""
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, JSON, String
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, JSON, String, text
 from sqlalchemy.sql import func
 
 from app.db.base import Base
@@ -19,9 +19,20 @@ class EmailOTP(Base):
     """
 
     __tablename__ = "email_otps"
+    __table_args__ = (
+        # Resend path: newest OTP row for an email, used or not
+        Index("ix_email_otps_email_created", "email", text("created_at DESC")),
+        # Verification hot path: newest unused code for an email
+        Index(
+            "ix_email_otps_email_active",
+            "email",
+            text("created_at DESC"),
+            postgresql_where=text("is_used = false"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    email = Column(String(255), nullable=False, index=True)
+    email = Column(String(255), nullable=False)
     otp_code = Column(String(6), nullable=False)
 
     # Full UserCreate payload stored as JSON so we can reconstruct the user
@@ -1,5 +1,6 @@
 """PaymentHistory database model."""
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, Enum as SQLEnum, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from enum import Enum
 from app.db.base import Base
@@ -15,9 +16,16 @@ class PaymentStatus(str, Enum):
 class PaymentHistory(Base):
     """Tracks every payment attempt made by users for subscription pages."""
     __tablename__ = "payment_history"
+    __table_args__ = (
+        # History listings are newest-first by (created_at, id): per user,
+        # per status (admin filter), and unfiltered (admin view)
+        Index("ix_payment_history_user_created", "user_id", text("created_at DESC"), text("id DESC")),
+        Index("ix_payment_history_status_created", "status", text("created_at DESC"), text("id DESC")),
+        Index("ix_payment_history_created_id", text("created_at DESC"), text("id DESC")),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # Transaction identifiers
     invoice_number = Column(String(100), unique=True, nullable=False, index=True)
@@ -35,11 +43,10 @@ class PaymentHistory(Base):
         ),
         nullable=False,
         default=PaymentStatus.PENDING,
-        index=True,
     )
 
-    initiation_response = Column(JSON, nullable=True)
-    callback_payload = Column(JSON, nullable=True)
+    initiation_response = Column(JSONB, nullable=True)
+    callback_payload = Column(JSONB, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
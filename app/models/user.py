@@ -1,5 +1,5 @@
 """User model with role-based access control"""
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SQLEnum, Index, text
 from sqlalchemy.sql import func
 from enum import Enum
 from app.db.base import Base
@@ -17,15 +17,24 @@ class User(Base):
     User model with role-based access control
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Only Google-linked accounts are indexed; NULLs (local auth) stay out
+        Index(
+            "ix_users_google_id",
+            "google_id",
+            unique=True,
+            postgresql_where=text("google_id IS NOT NULL"),
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=True)  # nullable for OAuth-only users
     full_name = Column(String(255), nullable=True)
 
     # OAuth fields
-    google_id = Column(String(255), unique=True, nullable=True, index=True)
+    google_id = Column(String(255), nullable=True)
     auth_provider = Column(String(50), nullable=False, default="local")  # "local" or "google"
     
     role = Column(SQLEnum(UserRole), nullable=False, default=UserRole.USER)
@@ -72,3 +81,7 @@ class User(Base):
             UserRole.USER: 1
         }
         return role_hierarchy.get(self.role, 0) >= role_hierarchy.get(required_role, 0)
+
+
+# Email lookups are case-insensitive; this also forbids case-only duplicates
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
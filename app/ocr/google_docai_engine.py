@@ -11,6 +11,7 @@ from google.api_core import retry as api_retry
 from PIL import Image
 import io
 import logging
+import threading
 
 from app.core.config import settings
 
@@ -37,6 +38,22 @@ def _build_client_and_name():
     return client, name
 
 
+# One client per process — it holds the gRPC channel and loaded credentials,
+# and is safe to share between the conversion threads.
+_client_and_name = None
+_client_lock = threading.Lock()
+
+
+def get_client_and_name():
+    """Return the shared DocAI client and processor name, building them on first use."""
+    global _client_and_name
+    if _client_and_name is None:
+        with _client_lock:
+            if _client_and_name is None:
+                _client_and_name = _build_client_and_name()
+    return _client_and_name
+
+
 def _pil_to_jpeg(image: Image.Image, quality: int = 85) -> bytes:
     """Convert PIL Image to JPEG bytes at the given quality."""
     if image.mode not in ("RGB", "L"):
@@ -66,7 +83,7 @@ def run_docai_page(jpeg_bytes: bytes, page_number: int) -> dict:
         {"page_number": int, "text": str, "confidence": float, "character_count": int}
     """
     try:
-        client, name = _build_client_and_name()
+        client, name = get_client_and_name()
         raw = documentai.RawDocument(content=jpeg_bytes, mime_type="image/jpeg")
         result = client.process_document(
             request=documentai.ProcessRequest(name=name, raw_document=raw),
@@ -97,7 +114,7 @@ def run_docai(file_bytes: bytes) -> tuple[str, float]:
     else:
         mime = "image/png"
     try:
-        client, name = _build_client_and_name()
+        client, name = get_client_and_name()
         raw = documentai.RawDocument(content=file_bytes, mime_type=mime)
         result = client.process_document(
             request=documentai.ProcessRequest(name=name, raw_document=raw),
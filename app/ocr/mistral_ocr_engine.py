@@ -1,6 +1,7 @@
 import base64
 import logging
 import re
+import threading
 import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor
@@ -85,8 +86,17 @@ def _compute_page_confidence(text: str) -> float:
 
 # ── helpers ───────────────────────────────────────────────────────────────────
 
-def _get_client():
-    """Return a Mistral client using the configured API key."""
+# Built once and shared — the SDK client keeps its HTTP connection pool
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the shared Mistral client, building it from the configured API key on first use."""
+    global _client
+    if _client is not None:
+        return _client
+
     try:
         from mistralai import Mistral
     except ImportError as exc:
@@ -100,7 +110,10 @@ def _get_client():
             "MISTRAL_API_KEY is not configured. "
             "Add MISTRAL_API_KEY=<your-key> to your .env file."
         )
-    return Mistral(api_key=api_key)
+    with _client_lock:
+        if _client is None:
+            _client = Mistral(api_key=api_key)
+    return _client
 
 
 def _detect_image_mime(file_bytes: bytes) -> str:
@@ -488,7 +501,7 @@ def _run_mistral_ocr_sync(
         engine           – str
         features         – list[str]
     """
-    client = _get_client()
+    client = get_client()
     b64_doc = base64.b64encode(file_bytes).decode("utf-8")
 
     if file_type == "pdf":
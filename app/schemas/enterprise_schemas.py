@@ -119,6 +119,7 @@ class EnterpriseResponse(BaseModel):
 class EnterpriseListResponse(BaseModel):
     total:       int
     enterprises: List[EnterpriseResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
 
 
 class EnterpriseOCRDocumentCreate(BaseModel):
@@ -128,6 +129,7 @@ class EnterpriseOCRDocumentCreate(BaseModel):
     file_path:      Optional[str] = None
     file_type:      str
     file_size:      int
+    content_hash:   Optional[str] = None
     ocr_mode:       str
     ocr_engine:     str
     languages:      List[str]
@@ -166,8 +168,11 @@ class EnterpriseOCRDocumentResponse(BaseModel):
 
 
 class EnterpriseOCRHistoryResponse(BaseModel):
-    total:     int
-    documents: List[EnterpriseOCRDocumentResponse]
+    total:       int
+    documents:   List[EnterpriseOCRDocumentResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
+    has_more:    Optional[bool] = Field(None, description="True if rows exist beyond this page (set where the page is peeked)")
+    total_is_estimate: bool = Field(False, description="True when `total` is the planner's row estimate, not an exact count")
 
 class EnterpriseBillingSummary(BaseModel):
     total_enterprises:    int
@@ -69,3 +69,4 @@ class PaymentHistoryItem(BaseModel):
 class PaymentHistoryResponse(BaseModel):
     total: int
     payments: List[PaymentHistoryItem]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
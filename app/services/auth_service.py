@@ -1,17 +1,29 @@
 """Authentication service with password hashing and JWT"""
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import List, Optional
+import hmac
 import random
 import string
+import time
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.models.user import User, UserRole
 from app.models.otp import EmailOTP
 from app.schemas.auth_schemas import UserCreate, TokenData
 from app.core.config import settings
+from app.utils.lru import BoundedLRU
 import re
 
+# Token lifetime is fixed for the process — build the timedelta once
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_ACCESS_TOKEN_TTL_SECONDS = int(ACCESS_TOKEN_EXPIRES.total_seconds())
+
+# jose would otherwise run jwk.construct(SECRET_KEY, ALGORITHM) on every encode
+_SIGNING_KEY = jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
@@ -35,21 +47,28 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """
     Create a JWT access token
     """
+    ttl = int(expires_delta.total_seconds()) if expires_delta else _ACCESS_TOKEN_TTL_SECONDS
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    to_encode["exp"] = int(time.time()) + ttl   # NumericDate directly, no datetime → timegm
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+# ── Decoded-token cache ──────────────────────────────────────────────────────
+# Claims are immutable until the token expires, so a verified token only needs
+# its signature checked once. Entries are evicted LRU and dropped at "exp".
+_TOKEN_CACHE_MAX = 4096
+_token_cache = BoundedLRU(_TOKEN_CACHE_MAX, clock=time.time)   # "exp" is wall-clock
+
+
 def decode_access_token(token: str) -> Optional[TokenData]:
     """
     Decode and validate a JWT access token
     """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id_str: str = payload.get("sub")
@@ -64,7 +83,7 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         except (ValueError, TypeError):
             return None
         
-        return TokenData(user_id=user_id, username=username, role=UserRole(role) if role else None)
+        token_data = TokenData(user_id=user_id, username=username, role=UserRole(role) if role else None)
     except JWTError as e:
         import logging
         logger = logging.getLogger(__name__)
@@ -76,12 +95,16 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         logger.error(f"Unexpected error decoding token: {str(e)}")
         return None
 
+    exp = payload.get("exp")
+    _token_cache.put(token, token_data, expires_at=float(exp) if exp is not None else None)
+    return token_data
+
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """
     Authenticate a user with email and password
     """
-    user = db.query(User).filter(User.email == email).first()
+    user = get_user_by_email(db, email)
     if not user:
         return None
     if not verify_password(password, user.hashed_password):
@@ -95,48 +118,136 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     return user
 
 
-def create_user(db: Session, user_data: UserCreate) -> User:
+def create_user(db: Session, user_data: UserCreate, is_verified: bool = False) -> User:
     """
-    Create a new user with hashed password
+    Create a new user with hashed password.
+    Single INSERT ... RETURNING — server defaults come back without a refresh SELECT.
     """
     hashed_password = get_password_hash(user_data.password)
     
-    db_user = User(
-        username=user_data.username,
-        email=user_data.email,
-        full_name=user_data.full_name,
-        hashed_password=hashed_password,
-        role=user_data.role,
-        is_active=True,
-        is_verified=False
-    )
-    
-    db.add(db_user)
+    db_user = db.execute(
+        insert(User)
+        .values(
+            username=user_data.username,
+            email=user_data.email,
+            full_name=user_data.full_name,
+            hashed_password=hashed_password,
+            role=user_data.role,
+            is_active=True,
+            is_verified=is_verified,
+        )
+        .returning(User)
+    ).scalar_one()
     db.commit()
-    db.refresh(db_user)
     
     return db_user
 
 
-def get_user_by_username(db: Session, username: str) -> Optional[User]:
+_MISSING = object()
+
+
+def _cached_user_lookup(db: Session, cache: Optional[dict], key: str, value, column) -> Optional[User]:
+    """Run a single-user lookup, memoised in *cache* (a per-request dict) when given."""
+    if cache is not None:
+        hit = cache.get((key, value), _MISSING)
+        if hit is not _MISSING:
+            return hit
+    user = db.execute(select(User).where(column == value).limit(1)).scalar_one_or_none()
+    if cache is not None:
+        cache[(key, value)] = user
+    return user
+
+
+def get_user_by_username(db: Session, username: str, cache: Optional[dict] = None) -> Optional[User]:
     """
     Get user by username
     """
-    return db.query(User).filter(User.username == username).first()
+    return _cached_user_lookup(db, cache, "username", username, User.username)
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+def get_user_by_email(db: Session, email: str, cache: Optional[dict] = None) -> Optional[User]:
     """
-    Get user by email
+    Get user by email (case-insensitive — served by the lower(email) unique index)
     """
-    return db.query(User).filter(User.email == email).first()
+    return _cached_user_lookup(db, cache, "email", email.lower(), func.lower(User.email))
 
 
-def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
+def get_user_by_id(db: Session, user_id: int, cache: Optional[dict] = None) -> Optional[User]:
     """
     Get user by ID
     """
-    return db.query(User).filter(User.id == user_id).first()
+    return _cached_user_lookup(db, cache, "id", user_id, User.id)
+
+
+# Exactly the UserResponse fields — password hashes and quota counters stay in the table
+_USER_LISTING_COLUMNS = (
+    User.id, User.username, User.email, User.full_name, User.role,
+    User.is_active, User.is_verified, User.created_at, User.last_login,
+)
+
+
+def get_users(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[dict]:
+    """
+    Page through every user account in id order.
+    With *after_id* the page is seeked on the primary key instead of an OFFSET scan.
+
+    Rows are returned as plain dicts of the UserResponse columns straight from
+    a column select — no ORM instances, identity-map inserts, or unused columns.
+    """
+    stmt = select(*_USER_LISTING_COLUMNS)
+    if after_id is not None:
+        stmt = stmt.where(User.id > after_id)
+    return [dict(row) for row in db.execute(stmt.order_by(User.id).offset(skip).limit(limit)).mappings()]
+
+
+def users_change_stamp(db: Session) -> tuple:
+    """
+    (count, max id, max updated_at, max last_login) over users — changes whenever
+    a user is created, deleted, updated or logs in, so it can stand in for the
+    listing in an ETag. last_login is included because the Google sign-in upsert
+    bumps it through ON CONFLICT DO UPDATE, which skips updated_at's onupdate.
+    """
+    return tuple(db.execute(
+        select(
+            func.count(User.id), func.max(User.id),
+            func.max(User.updated_at), func.max(User.last_login),
+        )
+    ).one())
+
+
+def delete_user_by_id(db: Session, user_id: int) -> bool:
+    """
+    Hard-delete a user in one DELETE statement. Returns False if no such user.
+    """
+    deleted = db.execute(delete(User).where(User.id == user_id).returning(User.id)).scalar_one_or_none()
+    db.commit()
+    return deleted is not None
+
+
+def find_registration_conflict(db: Session, username: str, email: str) -> Optional[str]:
+    """
+    Check username and email uniqueness in one round-trip.
+    Returns which field is taken ("username" takes precedence) or None.
+    """
+    rows = db.execute(
+        select(User.username, User.email)
+        .where(or_(User.username == username, func.lower(User.email) == email.lower()))
+        .limit(2)
+    ).all()
+    if any(row.username == username for row in rows):
+        return "username"
+    if rows:
+        return "email"
+    return None
+
+
+def remember_user(cache: Optional[dict], user: User) -> None:
+    """Record a freshly created/updated *user* in a per-request lookup cache."""
+    if cache is None:
+        return
+    cache[("id", user.id)] = user
+    cache[("email", user.email.lower())] = user
+    cache[("username", user.username)] = user
 
 
 def get_or_create_google_user(db: Session, google_id: str, email: str, full_name: Optional[str]) -> User:
@@ -144,48 +255,67 @@ def get_or_create_google_user(db: Session, google_id: str, email: str, full_name
     Find an existing user by google_id or email, or create a new one.
     Links an existing email-based account to Google if not yet linked.
     """
-    # 1. Look up by google_id
-    user = db.query(User).filter(User.google_id == google_id).first()
+    now = datetime.now(timezone.utc)
+
+    # 1. Returning Google user — bump last_login and load the row in one UPDATE ... RETURNING
+    user = db.execute(
+        update(User)
+        .where(User.google_id == google_id)
+        .values(last_login=now)
+        .returning(User)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
     if user:
-        user.last_login = datetime.now(timezone.utc)
         db.commit()
         return user
 
     # 2. Look up by email – link the Google account to the existing user
-    user = db.query(User).filter(User.email == email).first()
+    user = get_user_by_email(db, email)
     if user:
         user.google_id = google_id
         user.auth_provider = "google"
         user.is_verified = True
         if full_name and not user.full_name:
             user.full_name = full_name
-        user.last_login = datetime.now(timezone.utc)
+        user.last_login = now
         db.commit()
         db.refresh(user)
         return user
 
     # 3. Create a brand-new user
     base_username = re.sub(r'[^a-zA-Z0-9_]', '', (full_name or email.split('@')[0]).replace(' ', '_'))[:40] or 'user'
+    taken = set(db.execute(
+        select(User.username).where(User.username.startswith(base_username, autoescape=True))
+    ).scalars())
     username = base_username
     counter = 1
-    while db.query(User).filter(User.username == username).first():
+    while username in taken:
         username = f"{base_username}{counter}"
         counter += 1
 
-    new_user = User(
-        username=username,
-        email=email,
-        full_name=full_name,
-        hashed_password=None,
-        google_id=google_id,
-        auth_provider="google",
-        role=UserRole.USER,
-        is_active=True,
-        is_verified=True,
-    )
-    db.add(new_user)
+    # Concurrent first logins for the same Google account race here; the
+    # loser's INSERT turns into a last_login bump on the winner's row.
+    new_user = db.execute(
+        pg_insert(User)
+        .values(
+            username=username,
+            email=email,
+            full_name=full_name,
+            hashed_password=None,
+            google_id=google_id,
+            auth_provider="google",
+            role=UserRole.USER,
+            is_active=True,
+            is_verified=True,
+        )
+        .on_conflict_do_update(
+            index_elements=[User.google_id],
+            index_where=User.google_id.isnot(None),
+            set_={"last_login": now},
+        )
+        .returning(User)
+    ).scalar_one()
     db.commit()
-    db.refresh(new_user)
     return new_user
 
 
@@ -249,7 +379,9 @@ def verify_email_otp(db: Session, email: str, otp_code: str) -> Optional[dict]:
         db.commit()
         raise ValueError("OTP has expired. Please request a new one.")
 
-    if otp_row.otp_code != otp_code.strip():
+    # Constant-time compare so response timing leaks nothing about the code.
+    # Compared as bytes: compare_digest raises TypeError on non-ASCII str
+    if not hmac.compare_digest(otp_row.otp_code.encode(), otp_code.strip().encode()):
         raise ValueError("Invalid OTP code.")
 
     # Mark as used
@@ -2,13 +2,23 @@
 from __future__ import annotations
 
 import logging
+import threading
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from sqlalchemy import func, select, text, tuple_, update
 from sqlalchemy.orm import Session
 
-from app.models.enterprise import Enterprise, EnterpriseOCRDocument, EnterprisePaymentStatus
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.enterprise import (
+    ADMIN_ENTERPRISE_STATS_QUERY,
+    Enterprise,
+    EnterpriseOCRDocument,
+    EnterprisePaymentStatus,
+)
 from app.models.user import User
+from app.utils.pagination import CursorKey, split_page
 from app.schemas.enterprise_schemas import (
     EnterpriseCreate,
     EnterpriseOCRDocumentCreate,
@@ -32,22 +42,117 @@ def _calc_duration(start: Optional[date], end: Optional[date]) -> Optional[int]:
     return None
 
 
-def _enrich_enterprise(db: Session, ent: Enterprise) -> EnterpriseResponse:
+def _enrich_enterprise(ent: Enterprise, creator_name: Optional[str]) -> EnterpriseResponse:
     """Build an EnterpriseResponse with computed/joined fields."""
-    creator = db.query(User).filter(User.id == ent.created_by).first()
     data = {c.name: getattr(ent, c.name) for c in ent.__table__.columns}
     data["pages_remaining"] = max(0, ent.total_pages - ent.pages_used)
-    data["created_by_name"] = creator.full_name or creator.username if creator else None
+    data["created_by_name"] = creator_name
     return EnterpriseResponse(**data)
 
 
-def _enrich_ocr_doc(db: Session, doc: EnterpriseOCRDocument) -> EnterpriseOCRDocumentResponse:
-    processor = db.query(User).filter(User.id == doc.processed_by).first()
+# full_name, or username when the name is empty — resolved in SQL via the joins below
+_display_name = func.coalesce(func.nullif(User.full_name, ""), User.username)
+_processor_name = _display_name.label("processor_name")
+_creator_name = _display_name.label("creator_name")
+
+
+def _creator_name_of(db: Session, user_id: int) -> Optional[str]:
+    """Display name of one user — for write paths that already hold the Enterprise row."""
+    return db.execute(select(_display_name).where(User.id == user_id)).scalar()
+
+
+def enterprise_query(db: Session, *extra):
+    """Enterprise rows joined with their creator's display name (one query per page)."""
+    return (
+        db.query(Enterprise, _creator_name, *extra)
+        .outerjoin(User, User.id == Enterprise.created_by)
+    )
+
+
+def ocr_history_query(db: Session):
+    """EnterpriseOCRDocument rows joined with their processor's display name (one query per page)."""
+    return (
+        db.query(EnterpriseOCRDocument, _processor_name)
+        .outerjoin(User, User.id == EnterpriseOCRDocument.processed_by)
+    )
+
+
+def _enrich_ocr_doc(doc: EnterpriseOCRDocument, processor_name: Optional[str]) -> EnterpriseOCRDocumentResponse:
     data = {c.name: getattr(doc, c.name) for c in doc.__table__.columns}
-    data["processor_name"] = processor.full_name or processor.username if processor else None
+    data["processor_name"] = processor_name
     return EnterpriseOCRDocumentResponse(**data)
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Admin stats materialized view
+# ─────────────────────────────────────────────────────────────────────────────
+
+def ensure_admin_stats_view(db: Session) -> None:
+    """Create the admin_enterprise_stats view if the schema came from create_all."""
+    db.execute(text(
+        f"CREATE MATERIALIZED VIEW IF NOT EXISTS admin_enterprise_stats AS {ADMIN_ENTERPRISE_STATS_QUERY}"
+    ))
+    db.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_admin_enterprise_stats_admin_id "
+        "ON admin_enterprise_stats (admin_id)"
+    ))
+    db.commit()
+
+
+def refresh_admin_stats_view(db: Session) -> None:
+    """Recompute admin_enterprise_stats (non-blocking for readers)."""
+    try:
+        db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY admin_enterprise_stats"))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[Enterprise] admin_enterprise_stats refresh failed: {e}")
+
+
+# A refresh rebuilds the whole view, so it is kept off the request path:
+# writes only arm a timer, and every write inside the window rides along
+# with the one refresh it fires. The timer is per worker process, so each
+# worker refreshes after its own writes; a refresh still pending at shutdown
+# is run by flush_admin_stats_refresh.
+_stats_refresh_timer: Optional[threading.Timer] = None
+_stats_refresh_lock = threading.Lock()
+
+
+def _run_scheduled_stats_refresh() -> None:
+    global _stats_refresh_timer
+    with _stats_refresh_lock:
+        # Writes from here on arm the next refresh — the view built below
+        # may not include them
+        _stats_refresh_timer = None
+    with SessionLocal() as db:
+        refresh_admin_stats_view(db)
+
+
+def schedule_admin_stats_refresh() -> None:
+    """Refresh admin_enterprise_stats shortly after an enterprise write (debounced)."""
+    global _stats_refresh_timer
+    with _stats_refresh_lock:
+        if _stats_refresh_timer is not None:
+            return
+        _stats_refresh_timer = threading.Timer(
+            settings.ADMIN_STATS_REFRESH_DELAY_SECONDS, _run_scheduled_stats_refresh
+        )
+        _stats_refresh_timer.daemon = True
+        _stats_refresh_timer.start()
+
+
+def flush_admin_stats_refresh() -> None:
+    """Run a pending admin_enterprise_stats refresh now instead of dropping it with the process."""
+    global _stats_refresh_timer
+    with _stats_refresh_lock:
+        timer, _stats_refresh_timer = _stats_refresh_timer, None
+    if timer is None:
+        return
+    timer.cancel()
+    with SessionLocal() as db:
+        refresh_admin_stats_view(db)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Enterprise CRUD
 # ─────────────────────────────────────────────────────────────────────────────
@@ -80,7 +185,32 @@ def create_enterprise(db: Session, payload: EnterpriseCreate, created_by: int) -
     db.commit()
     db.refresh(ent)
     logger.info(f"[Enterprise] Created id={ent.id} name='{ent.name}' by user_id={created_by}")
-    return _enrich_enterprise(db, ent)
+    response = _enrich_enterprise(ent, _creator_name_of(db, ent.created_by))
+    schedule_admin_stats_refresh()
+    return response
+
+
+def _enterprise_filters(enterprise_id: int, created_by: Optional[int]) -> list:
+    filters = [Enterprise.id == enterprise_id]
+    if created_by is not None:
+        filters.append(Enterprise.created_by == created_by)
+    return filters
+
+
+def get_enterprise_with_creator(
+    db: Session,
+    enterprise_id: int,
+    created_by: Optional[int] = None,   # None → any (super_user)
+    include_deleted: bool = False,
+) -> Optional[Tuple[Enterprise, Optional[str]]]:
+    """(Enterprise, creator display name) in a single SELECT, or None."""
+    row = (
+        enterprise_query(db)
+        .filter(*_enterprise_filters(enterprise_id, created_by))
+        .execution_options(include_deleted=include_deleted)
+        .first()
+    )
+    return (row.Enterprise, row.creator_name) if row else None
 
 
 def get_enterprise(
@@ -89,13 +219,8 @@ def get_enterprise(
     created_by: Optional[int] = None,   # None → any (super_user)
     include_deleted: bool = False,
 ) -> Optional[EnterpriseResponse]:
-    q = db.query(Enterprise).filter(Enterprise.id == enterprise_id)
-    if not include_deleted:
-        q = q.filter(Enterprise.is_deleted == False)
-    if created_by is not None:
-        q = q.filter(Enterprise.created_by == created_by)
-    ent = q.first()
-    return _enrich_enterprise(db, ent) if ent else None
+    found = get_enterprise_with_creator(db, enterprise_id, created_by, include_deleted)
+    return _enrich_enterprise(*found) if found else None
 
 
 def _get_enterprise_orm(
@@ -104,12 +229,12 @@ def _get_enterprise_orm(
     created_by: Optional[int] = None,
     include_deleted: bool = False,
 ) -> Optional[Enterprise]:
-    q = db.query(Enterprise).filter(Enterprise.id == enterprise_id)
-    if not include_deleted:
-        q = q.filter(Enterprise.is_deleted == False)
-    if created_by is not None:
-        q = q.filter(Enterprise.created_by == created_by)
-    return q.first()
+    return (
+        db.query(Enterprise)
+        .filter(*_enterprise_filters(enterprise_id, created_by))
+        .execution_options(include_deleted=include_deleted)
+        .first()
+    )
 
 
 def list_enterprises(
@@ -118,15 +243,45 @@ def list_enterprises(
     skip: int = 0,
     limit: int = 100,
     include_deleted: bool = False,
-) -> tuple[int, List[EnterpriseResponse]]:
-    q = db.query(Enterprise)
-    if not include_deleted:
-        q = q.filter(Enterprise.is_deleted == False)
+    after: Optional[CursorKey] = None,
+) -> tuple[int, List[EnterpriseResponse], bool]:
+    """
+    Newest-first page of enterprises, the unpaginated total, and whether
+    another page follows (one extra row is fetched to tell).
+
+    With *after* (the (created_at, id) of the last row already seen) the page
+    is seeked with a row comparison on the index instead of an OFFSET scan.
+    """
+    filters = []
     if created_by is not None:
-        q = q.filter(Enterprise.created_by == created_by)
-    total = q.count()
-    enterprises = q.order_by(Enterprise.created_at.desc()).offset(skip).limit(limit).all()
-    return total, [_enrich_enterprise(db, e) for e in enterprises]
+        filters.append(Enterprise.created_by == created_by)
+
+    # The total is an uncorrelated scalar subquery over the un-seeked filter, so
+    # it stays the full count in cursor mode and still shares the page's round-trip
+    total_sq = (
+        select(func.count(Enterprise.id)).where(*filters)
+        .correlate(None).scalar_subquery()
+    )
+    # The live-row criterion reaches the count subquery as well
+    q = (
+        enterprise_query(db, total_sq.label("total"))
+        .filter(*filters)
+        .execution_options(include_deleted=include_deleted)
+    )
+    if after is not None:
+        q = q.filter(tuple_(Enterprise.created_at, Enterprise.id) < after)
+    rows = (
+        q.order_by(Enterprise.created_at.desc(), Enterprise.id.desc())
+        .offset(skip).limit(limit + 1).all()
+    )
+    if rows:
+        total = rows[0].total
+    else:
+        total = db.execute(
+            select(total_sq).execution_options(include_deleted=include_deleted)
+        ).scalar() if skip or after else 0
+    rows, has_more = split_page(rows, limit)
+    return total, [_enrich_enterprise(row.Enterprise, row.creator_name) for row in rows], has_more
 
 
 def update_enterprise(
@@ -152,7 +307,9 @@ def update_enterprise(
 
     db.commit()
     db.refresh(ent)
-    return _enrich_enterprise(db, ent)
+    response = _enrich_enterprise(ent, _creator_name_of(db, ent.created_by))
+    schedule_admin_stats_refresh()
+    return response
 
 
 def update_payment_status(
@@ -180,7 +337,9 @@ def update_payment_status(
 
     db.commit()
     db.refresh(ent)
-    return _enrich_enterprise(db, ent)
+    response = _enrich_enterprise(ent, _creator_name_of(db, ent.created_by))
+    schedule_admin_stats_refresh()
+    return response
 
 
 def soft_delete_enterprise(
@@ -193,6 +352,7 @@ def soft_delete_enterprise(
         return False
     ent.is_deleted = True
     db.commit()
+    schedule_admin_stats_refresh()
     return True
 
 
@@ -203,22 +363,74 @@ def soft_delete_enterprise(
 def save_enterprise_ocr_document(
     db: Session,
     payload: EnterpriseOCRDocumentCreate,
-) -> EnterpriseOCRDocument:
+) -> Optional[Tuple[EnterpriseOCRDocument, int, int]]:
+    """
+    Charge the pages against the enterprise quota and insert the history row in
+    one transaction. Returns (doc, pages_used, total_pages) after the charge, or
+    None when the quota no longer covers the file (a concurrent upload won the race).
+    """
+    # Conditional increment — the WHERE clause is the quota check, so two
+    # concurrent uploads can never both squeeze into the last pages.
+    charged = db.execute(
+        update(Enterprise)
+        .where(
+            Enterprise.id == payload.enterprise_id,
+            Enterprise.pages_used + payload.total_pages <= Enterprise.total_pages,
+        )
+        .values(pages_used=Enterprise.pages_used + payload.total_pages)
+        .returning(Enterprise.pages_used, Enterprise.total_pages)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if charged is None:
+        db.rollback()
+        logger.warning(
+            f"[EnterpriseOCR] Quota exhausted for enterprise_id={payload.enterprise_id} "
+            f"pages={payload.total_pages}"
+        )
+        return None
+
     doc = EnterpriseOCRDocument(**payload.model_dump())
     db.add(doc)
-
-    # Increment enterprise pages_used counter
-    ent = db.query(Enterprise).filter(Enterprise.id == payload.enterprise_id).first()
-    if ent:
-        ent.pages_used = (ent.pages_used or 0) + payload.total_pages
-
     db.commit()
-    db.refresh(doc)
     logger.info(
         f"[EnterpriseOCR] Saved doc id={doc.id} enterprise_id={doc.enterprise_id} "
         f"pages={doc.total_pages} processed_by={doc.processed_by}"
     )
-    return doc
+    schedule_admin_stats_refresh()
+    return doc, charged.pages_used, charged.total_pages
+
+
+def find_enterprise_ocr_result(
+    db: Session,
+    enterprise_id: int,
+    content_hash: str,
+) -> Optional[dict]:
+    """
+    Return the stored OCR result of an earlier upload with identical bytes under
+    the same enterprise, shaped like process_file_auto's result — or None.
+    OCR output is deterministic per file, so retries and re-submissions skip
+    the engine round-trip entirely.
+    """
+    doc = (
+        db.query(EnterpriseOCRDocument)
+        .filter(
+            EnterpriseOCRDocument.enterprise_id == enterprise_id,
+            EnterpriseOCRDocument.content_hash == content_hash,
+        )
+        .order_by(EnterpriseOCRDocument.id.desc())
+        .first()
+    )
+    if doc is None:
+        return None
+    return {
+        "mode":       doc.ocr_mode,
+        "engine":     doc.ocr_engine,
+        "languages":  doc.languages,
+        "text":       doc.extracted_text,
+        "confidence": doc.confidence,
+        "pages":      doc.total_pages,
+        "pages_data": doc.pages_data,
+    }
 
 
 def get_enterprise_ocr_history(
@@ -227,19 +439,27 @@ def get_enterprise_ocr_history(
     skip: int = 0,
     limit: int = 100,
     created_by: Optional[int] = None,   # verify enterprise ownership
-) -> tuple[int, List[EnterpriseOCRDocumentResponse]]:
+    after: Optional[CursorKey] = None,
+) -> tuple[int, List[EnterpriseOCRDocumentResponse], bool]:
+    """Newest-first page of an enterprise's OCR history, its total, and whether another page follows."""
     # Ownership check: confirm enterprise belongs to caller (unless super_user)
     if created_by is not None:
         ent = _get_enterprise_orm(db, enterprise_id, created_by=created_by)
         if not ent:
-            return 0, []
+            return 0, [], False
 
-    q = db.query(EnterpriseOCRDocument).filter(
+    total = db.query(func.count(EnterpriseOCRDocument.id)).filter(
         EnterpriseOCRDocument.enterprise_id == enterprise_id
+    ).scalar()
+    q = ocr_history_query(db).filter(EnterpriseOCRDocument.enterprise_id == enterprise_id)
+    if after is not None:
+        q = q.filter(tuple_(EnterpriseOCRDocument.created_at, EnterpriseOCRDocument.id) < after)
+    rows = (
+        q.order_by(EnterpriseOCRDocument.created_at.desc(), EnterpriseOCRDocument.id.desc())
+        .offset(skip).limit(limit + 1).all()
     )
-    total = q.count()
-    docs = q.order_by(EnterpriseOCRDocument.created_at.desc()).offset(skip).limit(limit).all()
-    return total, [_enrich_ocr_doc(db, d) for d in docs]
+    rows, has_more = split_page(rows, limit)
+    return total, [_enrich_ocr_doc(doc, name) for doc, name in rows], has_more
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -247,7 +467,7 @@ def get_enterprise_ocr_history(
 # ─────────────────────────────────────────────────────────────────────────────
 
 def get_billing_summary(db: Session) -> EnterpriseBillingSummary:
-    enterprises = db.query(Enterprise).filter(Enterprise.is_deleted == False).all()
+    enterprises = db.query(Enterprise).all()
     return EnterpriseBillingSummary(
         total_enterprises     = len(enterprises),
         total_pages_allocated = sum(e.total_pages   for e in enterprises),
@@ -2,13 +2,18 @@
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
+from functools import lru_cache
 import hashlib
+import ipaddress
 import uuid
 
 from app.models.free_trial_user import FreeTrialUser
 from app.errors.exceptions import ForbiddenException
 
 
+# The same client sends many requests from one (ip, language) pair — repeat
+# calls are answered from the cache instead of re-hashing
+@lru_cache(maxsize=4096)
 def generate_device_fingerprint(
     ip_address: Optional[str] = None,
     accept_language: Optional[str] = None,
@@ -27,6 +32,16 @@ def generate_device_fingerprint(
     return hashlib.sha256(fingerprint_data.encode()).hexdigest()
 
 
+def _normalize_ip(ip_address: Optional[str]) -> Optional[str]:
+    """Return *ip_address* if it parses as IPv4/IPv6 (the column is INET), else None."""
+    if not ip_address:
+        return None
+    try:
+        return str(ipaddress.ip_address(ip_address))
+    except ValueError:
+        return None
+
+
 def get_or_create_free_trial_user(
     db: Session,
     device_fingerprint: str,
@@ -41,6 +56,7 @@ def get_or_create_free_trial_user(
     """
     trial_user = None
     is_new = False
+    ip_address = _normalize_ip(ip_address)
     
     trial_user = db.query(FreeTrialUser).filter(
         FreeTrialUser.device_id == device_fingerprint
@@ -1,9 +1,12 @@
 """CRUD operations for OCR documents"""
+from sqlalchemy import func, select
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.models.ocr_document import OCRDocument
 from app.schemas.ocr_schemas import OCRDocumentCreate
 from app.utils.file_storage import delete_uploaded_file
+from app.utils.lru import BoundedLRU
 
 
 def create_ocr_document(db: Session, ocr_data: OCRDocumentCreate) -> OCRDocument:
@@ -33,16 +36,52 @@ def create_ocr_document(db: Session, ocr_data: OCRDocumentCreate) -> OCRDocument
 
 
 def get_ocr_document(db: Session, document_id: int, user_id: Optional[int] = None, include_deleted: bool = False) -> Optional[OCRDocument]:
-    """Get an OCR document by ID, optionally filtered by user and deleted status."""
-    query = db.query(OCRDocument).filter(OCRDocument.id == document_id)
+    """Get an OCR document by ID, optionally filtered by user; soft-deleted rows only with include_deleted."""
+    stmt = select(OCRDocument).where(OCRDocument.id == document_id)
     
     if user_id is not None:
-        query = query.filter(OCRDocument.user_id == user_id)
-    
-    if not include_deleted:
-        query = query.filter(OCRDocument.is_deleted == False)
+        stmt = stmt.where(OCRDocument.user_id == user_id)
     
-    return query.first()
+    stmt = stmt.execution_options(include_deleted=include_deleted)
+    return db.execute(stmt).scalar_one_or_none()
+
+
+# ── Document detail cache ────────────────────────────────────────────────────
+# Detail views are re-fetched repeatedly while a result page is open. Detached
+# rows are kept for a short TTL and dropped whenever the document is deleted.
+# Invalidation only reaches the worker that handled the write; other workers
+# keep serving their copy until the TTL runs out, so keep it short.
+_DOCUMENT_CACHE_MAX = 4096
+_DOCUMENT_CACHE_TTL = 5.0
+_document_cache = BoundedLRU(_DOCUMENT_CACHE_MAX, ttl=_DOCUMENT_CACHE_TTL)
+
+
+def get_ocr_document_cached(db: Session, document_id: int, user_id: Optional[int] = None, include_deleted: bool = False) -> Optional[OCRDocument]:
+    """
+    Same as get_ocr_document, served from a short-lived in-process cache.
+
+    The cache is per process: invalidate_ocr_document() only clears this
+    worker, so a row changed elsewhere can be up to _DOCUMENT_CACHE_TTL
+    seconds stale here.
+    """
+    key = (document_id, user_id, include_deleted)
+    cached = _document_cache.get(key)
+    if cached is not None:
+        return cached
+
+    document = get_ocr_document(db, document_id, user_id=user_id, include_deleted=include_deleted)
+    if document is None:
+        return None
+
+    # Detach so the cached instance never triggers a refresh on another session
+    db.expunge(document)
+    _document_cache.put(key, document)
+    return document
+
+
+def invalidate_ocr_document(document_id: int) -> None:
+    """Drop every cached view of a document."""
+    _document_cache.discard_where(lambda key: key[0] == document_id)
 
 
 def get_ocr_documents(
@@ -51,21 +90,77 @@ def get_ocr_documents(
     limit: int = 100,
     ocr_mode: Optional[str] = None,
     user_id: Optional[int] = None,
-    include_deleted: bool = False
-) -> List[OCRDocument]:
-    """Get list of OCR documents with optional filtering by user, mode, and deleted status."""
-    query = db.query(OCRDocument)
+    include_deleted: bool = False,
+    before_id: Optional[int] = None
+) -> List[dict]:
+    """
+    Get list of OCR documents with optional filtering by user, mode, and deleted status.
+
+    Rows are newest-first by id on every page. With *before_id* (keyset
+    cursor = last id of the previous page) they are seeked by
+    ``id < before_id`` instead of skipped with OFFSET, so deep pages cost the
+    same as the first one — and since the first page uses the same order, a
+    cursor never skips or repeats rows.
+
+    Rows are returned as plain dicts straight from a Core select — list pages
+    are read-only, so ORM instrumentation and identity-map inserts are skipped.
+    """
+    columns = OCRDocument.__table__.c
+    stmt = select(columns)
     
     if user_id is not None:
-        query = query.filter(OCRDocument.user_id == user_id)
+        stmt = stmt.where(columns.user_id == user_id)
     
     if not include_deleted:
-        query = query.filter(OCRDocument.is_deleted == False)
+        stmt = stmt.where(columns.is_deleted == False)
     
     if ocr_mode:
-        query = query.filter(OCRDocument.ocr_mode == ocr_mode)
+        stmt = stmt.where(columns.ocr_mode == ocr_mode)
+    
+    if before_id is not None:
+        stmt = stmt.where(columns.id < before_id)
     
-    return query.order_by(OCRDocument.created_at.desc()).offset(skip).limit(limit).all()
+    stmt = stmt.order_by(columns.id.desc()).offset(skip).limit(limit)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def get_ocr_documents_with_total(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    ocr_mode: Optional[str] = None,
+    user_id: Optional[int] = None,
+    include_deleted: bool = False
+) -> Tuple[int, List[RowMapping]]:
+    """
+    Same filtering as get_ocr_documents, but also returns the unpaginated total.
+    The total comes from COUNT(*) OVER () so page rows and count share one round-trip.
+    Rows are returned as Core mappings (no ORM hydration) for read-only listings.
+    """
+    columns = OCRDocument.__table__.c
+    stmt = select(columns, func.count().over().label("total"))
+
+    if user_id is not None:
+        stmt = stmt.where(columns.user_id == user_id)
+
+    if not include_deleted:
+        stmt = stmt.where(columns.is_deleted == False)
+
+    if ocr_mode:
+        stmt = stmt.where(columns.ocr_mode == ocr_mode)
+
+    page = stmt.order_by(columns.created_at.desc(), columns.id.desc()).offset(skip).limit(limit)
+    rows = db.execute(page).mappings().all()
+    if rows:
+        return rows[0]["total"], rows
+
+    # An empty page past the end carries no window value — fall back to a plain count
+    if not skip:
+        return 0, []
+    total = db.execute(
+        select(func.count()).select_from(stmt.with_only_columns(columns.id).subquery())
+    ).scalar()
+    return total, []
 
 
 def delete_ocr_document(db: Session, document_id: int, user_id: Optional[int] = None, delete_from_storage: bool = False) -> bool:
@@ -73,7 +168,12 @@ def delete_ocr_document(db: Session, document_id: int, user_id: Optional[int] =
     Delete an OCR document. If delete_from_storage is True, hard-deletes the file and record.
     Otherwise performs a soft delete (marks is_deleted=True).
     """
-    query = db.query(OCRDocument).filter(OCRDocument.id == document_id)
+    # Super-users may hard-delete a document that was already soft-deleted
+    query = (
+        db.query(OCRDocument)
+        .filter(OCRDocument.id == document_id)
+        .execution_options(include_deleted=True)
+    )
     
     if user_id is not None:
         query = query.filter(OCRDocument.user_id == user_id)
@@ -88,5 +188,6 @@ def delete_ocr_document(db: Session, document_id: int, user_id: Optional[int] =
             document.is_deleted = True
         
         db.commit()
+        invalidate_ocr_document(document_id)
         return True
     return False
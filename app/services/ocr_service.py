@@ -30,16 +30,18 @@ import asyncio
 import io
 import logging
 import os
+import re
 import time
 from concurrent.futures import ThreadPoolExecutor
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 from PIL import Image
 from pdf2image import convert_from_bytes
 
-from app.ocr.google_docai_engine import run_docai_page, run_docai_image
-from app.ocr.mistral_ocr_engine import run_mistral_ocr
+from app.ocr.google_docai_engine import get_client_and_name, run_docai_page, run_docai_image
+from app.ocr.mistral_ocr_engine import get_client as get_mistral_client, run_mistral_ocr
 from app.utils.logger import setup_file_logging, log_ocr_operation, log_performance_metrics
+from app.utils.lru import BoundedLRU
 from app.utils.pdf_utils import count_pdf_pages
 
 # ── setup ─────────────────────────────────────────────────────────────────────
@@ -71,6 +73,10 @@ MISTRAL_MAX_FILE_BYTES = int(os.getenv("MISTRAL_MAX_FILE_BYTES", 50 * 1024 * 102
 # 45 MB gives a comfortable buffer under the 50 MB API limit.
 COMPRESS_THRESHOLD_BYTES = int(os.getenv("COMPRESS_THRESHOLD_BYTES", 45 * 1024 * 1024))
 
+# Finished OCR results kept in memory, keyed by (content sha256, engine).
+# Results hold the full extracted text, so keep this modest.
+RESULT_CACHE_SIZE = int(os.getenv("OCR_RESULT_CACHE_SIZE", 256))
+
 
 # ── file compression helpers ──────────────────────────────────────────────────
 
@@ -237,25 +243,23 @@ def compress_for_mistral(file_bytes: bytes, file_type: str) -> bytes:
     return file_bytes
 
 
-def detect_file_type(file_bytes: bytes) -> str:
-    """Detect file type based on magic bytes. Returns 'pdf', 'image', or 'unknown'."""
-    if len(file_bytes) < 10:
+# Every supported magic-byte signature in one anchored pattern, matched in a
+# single pass; the named group that matched is the file type
+_MAGIC_RE = re.compile(
+    rb"(?P<pdf>%PDF)"
+    rb"|(?P<image>\xff\xd8\xff|\x89PNG|GIF8[79]a|BM|II\*\x00|MM\x00\*|RIFF.{4}WEBP)",
+    re.DOTALL,
+)
+
+
+def detect_file_type(header: bytes) -> str:
+    """Detect file type from the first 16 magic bytes. Returns 'pdf', 'image', or 'unknown'."""
+    # Callers pass content[:16]; anything longer is cut to the header here
+    header = bytes(header[:16])
+    if len(header) < 10:
         return 'unknown'
-    if file_bytes.startswith(b'%PDF'):
-        return 'pdf'
-    if file_bytes.startswith(b'\xff\xd8\xff'):
-        return 'image'
-    if file_bytes.startswith(b'\x89PNG'):
-        return 'image'
-    if file_bytes.startswith(b'GIF87a') or file_bytes.startswith(b'GIF89a'):
-        return 'image'
-    if file_bytes.startswith(b'BM'):
-        return 'image'
-    if file_bytes.startswith(b'RIFF') and b'WEBP' in file_bytes[:12]:
-        return 'image'
-    if file_bytes.startswith(b'II*\x00') or file_bytes.startswith(b'MM\x00*'):
-        return 'image'
-    return 'unknown'
+    match = _MAGIC_RE.match(header)
+    return match.lastgroup if match else 'unknown'
 
 
 def _convert_page_range(pdf_bytes: bytes, first_page: int, last_page: int) -> List[bytes]:
@@ -298,38 +302,51 @@ async def _process_page(page_num: int, jpeg_bytes: bytes, sem: asyncio.Semaphore
         return await loop.run_in_executor(_EXECUTOR, run_docai_page, jpeg_bytes, page_num)
 
 
+# Conversion batches allowed to run at once. Each batch forks up to
+# CONVERT_BATCH pdftocairo processes, so this keeps the total near the thread budget.
+_CONCURRENT_CONVERSIONS = max(1, _CONVERSION_THREADS // CONVERT_BATCH)
+
+
+async def _convert_and_dispatch(
+    pdf_bytes: bytes, batch_start: int, batch_end: int,
+    convert_sem: asyncio.Semaphore, sem: asyncio.Semaphore,
+) -> List[dict]:
+    """Convert one page range, then OCR its pages as soon as the JPEGs exist."""
+    loop = asyncio.get_running_loop()
+    async with convert_sem:
+        # Blocking — pdftocairo subprocesses + JPEG encode, run in the thread pool
+        jpeg_batch: List[bytes] = await loop.run_in_executor(
+            _EXECUTOR, _convert_page_range, pdf_bytes, batch_start, batch_end
+        )
+    logger.debug(
+        f"Batch converted: pages {batch_start}-{batch_end} "
+        f"({sum(len(j) for j in jpeg_batch)//1024}KB total)"
+    )
+    return await asyncio.gather(*(
+        _process_page(batch_start + i, jpeg, sem) for i, jpeg in enumerate(jpeg_batch)
+    ))
+
+
 async def _pipeline_pdf(pdf_bytes: bytes, total_pages: int) -> List[dict]:
     """
     Pipelined PDF processing:
-      - Convert CONVERT_BATCH pages at a time in a thread-pool.
+      - Convert CONVERT_BATCH pages at a time, up to _CONCURRENT_CONVERSIONS
+        batches in parallel (each batch is its own set of pdftocairo processes).
       - Dispatch each batch to DocAI immediately after conversion.
-      - Conversion of the next batch overlaps with DocAI calls for the current batch.
+      - Conversion of later batches overlaps with DocAI calls for earlier ones.
     """
-    loop = asyncio.get_running_loop()
     sem = asyncio.Semaphore(MAX_PARALLEL)
-    all_tasks = []
+    convert_sem = asyncio.Semaphore(_CONCURRENT_CONVERSIONS)
 
-    for batch_start in range(1, total_pages + 1, CONVERT_BATCH):
-        batch_end = min(batch_start + CONVERT_BATCH - 1, total_pages)
-
-        # Convert this batch (blocking, runs in thread pool)
-        jpeg_batch: List[bytes] = await loop.run_in_executor(
-            _EXECUTOR, _convert_page_range, pdf_bytes, batch_start, batch_end
-        )
-        logger.debug(
-            f"Batch converted: pages {batch_start}-{batch_end} "
-            f"({sum(len(j) for j in jpeg_batch)//1024}KB total)"
+    batches = await asyncio.gather(*(
+        _convert_and_dispatch(
+            pdf_bytes, batch_start, min(batch_start + CONVERT_BATCH - 1, total_pages),
+            convert_sem, sem,
         )
-
-        # Dispatch each page to DocAI immediately (non-blocking tasks)
-        for i, jpeg in enumerate(jpeg_batch):
-            page_num = batch_start + i
-            all_tasks.append(asyncio.create_task(_process_page(page_num, jpeg, sem)))
-
-    # Wait for all DocAI tasks (many are already done due to pipelining)
-    results = await asyncio.gather(*all_tasks)
-    results.sort(key=lambda p: p["page_number"])
-    return results
+        for batch_start in range(1, total_pages + 1, CONVERT_BATCH)
+    ))
+    # gather preserves batch order and each batch is in page order
+    return [page for batch in batches for page in batch]
 
 async def process_file(file_bytes: bytes, langs: list, mode: str = "english",
                        user_id: Optional[int] = None, user_email: Optional[str] = None):
@@ -345,7 +362,7 @@ async def process_file(file_bytes: bytes, langs: list, mode: str = "english",
     file_size = len(file_bytes)
 
     try:
-        file_type = detect_file_type(file_bytes)
+        file_type = detect_file_type(file_bytes[:16])
 
         if file_size > 10 * 1024 * 1024:
             logger.warning(f"LARGE FILE - Type: {file_type}, Size: {file_size // 1024}KB")
@@ -549,7 +566,7 @@ async def process_file_mistral(
     file_size = len(file_bytes)
 
     try:
-        file_type = detect_file_type(file_bytes)
+        file_type = detect_file_type(file_bytes[:16])
         if file_type == "unknown":
             raise ValueError("Unsupported file format — cannot identify file type.")
 
@@ -657,7 +674,7 @@ async def process_file_auto(
         # If the file exceeds the 45 MB compression threshold, compress first.
         if len(file_bytes) > COMPRESS_THRESHOLD_BYTES:
             loop = asyncio.get_running_loop()
-            file_type_for_compress = detect_file_type(file_bytes)
+            file_type_for_compress = detect_file_type(file_bytes[:16])
             mistral_bytes = await loop.run_in_executor(
                 _EXECUTOR, compress_for_mistral, file_bytes, file_type_for_compress
             )
@@ -706,3 +723,48 @@ async def process_file_auto(
     result["languages"] = detected_langs
     result["mode"]      = detected_mode
     return result
+
+
+# ── result cache ──────────────────────────────────────────────────────────────
+# OCR output is a pure function of the bytes and the engine, so retries and
+# re-submitted forms are answered from memory instead of another API round-trip.
+_result_cache = BoundedLRU(RESULT_CACHE_SIZE)
+
+
+async def process_file_auto_cached(
+    file_bytes: bytes,
+    content_hash: str,
+    user=None,
+    user_id: Optional[int] = None,
+    user_email: Optional[str] = None,
+) -> Tuple[dict, bool]:
+    """Same as process_file_auto, keyed on *content_hash* (sha256 hex). Returns (result, cache_hit)."""
+    key = (content_hash, select_ocr_engine(user))
+    cached = _result_cache.get(key)
+    if cached is not None:
+        logger.info(f"OCR result cache hit | sha256={content_hash[:12]} user_id={user_id}")
+        return cached, True
+
+    result = await process_file_auto(
+        file_bytes, user=user, user_id=user_id, user_email=user_email,
+    )
+    _result_cache.put(key, result)
+    return result, False
+
+
+# ── warm-up ───────────────────────────────────────────────────────────────────
+
+def warm_up() -> None:
+    """
+    Initialise what the OCR path would otherwise build on its first request:
+    langdetect's language profiles and the DocAI / Mistral clients.
+    Best-effort — an engine that isn't configured only fails the requests that use it.
+    """
+    start = time.time()
+    detect_language("Loading the language detector profiles before the first request.")
+    for engine, build in (("DocAI", get_client_and_name), ("Mistral", get_mistral_client)):
+        try:
+            build()
+        except Exception as e:
+            logger.warning(f"OCR warm-up: {engine} client not initialised: {e}")
+    logger.info(f"OCR warm-up finished in {time.time() - start:.2f}s")
@@ -3,9 +3,10 @@ from __future__ import annotations
 import logging
 import uuid
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import httpx
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -13,12 +14,12 @@ from app.models.payment import PaymentHistory, PaymentStatus
 from app.models.user import User
 from app.schemas.payment_schemas import (
     PAGE_COST,
-    PaymentHistoryItem,
-    PaymentHistoryResponse,
     PaymentInitiateResponse,
 )
 from app.utils.invoice import generate_invoice_pdf
+from app.utils.lru import BoundedLRU
 from app.utils.email import send_invoice_email
+from app.utils.pagination import CursorKey, next_cursor, split_page
 
 logger = logging.getLogger(__name__)
 
@@ -144,24 +145,80 @@ async def initiate_payment(
     )
 
 
+# Invoices this worker has already seen settle as SUCCESS. PayStation delivers
+# callbacks at least once; a repeat for one of these is answered without
+# opening a transaction or taking the row lock. SUCCESS is terminal, so no
+# TTL is needed — the row-locked status check below stays the authority.
+_SETTLED_INVOICES_MAX = 4096
+_settled_invoices = BoundedLRU(_SETTLED_INVOICES_MAX)
+
+_ALREADY_PROCESSED = {"success": True, "message": "Payment already processed"}
+
+
+def _remember_settled(invoice_number: str) -> None:
+    _settled_invoices.put(invoice_number, True)
+
+
+def send_payment_invoice(
+    invoice_number: str,
+    full_name: str,
+    email: str,
+    pages_purchased: int,
+    payment_amount: float,
+    currency: str,
+    paid_at: datetime,
+) -> None:
+    """Render the invoice PDF and email it. Failures are logged, never raised."""
+    try:
+        pdf_bytes = generate_invoice_pdf(
+            invoice_number=invoice_number,
+            user_full_name=full_name,
+            user_email=email,
+            pages_purchased=pages_purchased,
+            payment_amount=payment_amount,
+            currency=currency,
+            paid_at=paid_at,
+        )
+        send_invoice_email(
+            to=email,
+            full_name=full_name,
+            invoice_pdf_bytes=pdf_bytes,
+            invoice_number=invoice_number,
+        )
+    except Exception as email_exc:
+        logger.error(
+            f"[Callback] Invoice email failed for {invoice_number}: {email_exc}"
+        )
+
+
 def process_payment_callback(
     db: Session,
     invoice_number: str,
     reported_status: str,
     reported_amount: Optional[float],
     raw_payload: dict,
+    schedule: Optional[Callable[..., Any]] = None,
 ) -> dict:
     """
     Handle the POST callback from PayStation after a payment attempt.
 
     Returns a dict with {"success": bool, "message": str}.
 
+    The quota credit is committed before returning. The invoice PDF and email
+    are handed to *schedule(fn, *args)* (e.g. BackgroundTasks.add_task) when
+    given, so the callback is acknowledged without waiting on SMTP; otherwise
+    they run inline.
+
     Transaction safety
     ───────────────────
     • Entire handler runs inside a single DB transaction.
     • On any exception → db.rollback() + log + return failure response.
       (We never raise to the caller so PayStation always gets HTTP 200.)
     """
+    if invoice_number in _settled_invoices:
+        logger.info(f"[Callback] Duplicate callback for settled invoice {invoice_number}")
+        return dict(_ALREADY_PROCESSED)
+
     try:
         # ── 1. Look up the invoice ────────────────────────────────────────────
         payment_row: Optional[PaymentHistory] = (
@@ -178,7 +235,9 @@ def process_payment_callback(
         # ── 2. Idempotency guard ──────────────────────────────────────────────
         if payment_row.status == PaymentStatus.SUCCESS:
             logger.info(f"[Callback] Duplicate callback for already-SUCCESS invoice {invoice_number}")
-            return {"success": True, "message": "Payment already processed"}
+            db.rollback()  # release the row lock
+            _remember_settled(invoice_number)
+            return dict(_ALREADY_PROCESSED)
 
         # ── 3. Store raw callback payload ─────────────────────────────────────
         payment_row.callback_payload = raw_payload
@@ -216,6 +275,7 @@ def process_payment_callback(
         payment_row.paid_at = datetime.now(timezone.utc)
 
         db.commit()
+        _remember_settled(invoice_number)
 
         logger.info(
             f"[Callback] SUCCESS invoice={invoice_number} user_id={user.id} "
@@ -223,27 +283,20 @@ def process_payment_callback(
             f"new_total={user.subscription_pages_total}"
         )
 
-        # ── Send invoice email (non-blocking — failure must not affect callback) ──
-        try:
-            pdf_bytes = generate_invoice_pdf(
-                invoice_number=invoice_number,
-                user_full_name=user.full_name or user.username,
-                user_email=user.email,
-                pages_purchased=payment_row.pages_purchased,
-                payment_amount=payment_row.payment_amount,
-                currency=payment_row.currency or "BDT",
-                paid_at=payment_row.paid_at,
-            )
-            send_invoice_email(
-                to=user.email,
-                full_name=user.full_name or user.username,
-                invoice_pdf_bytes=pdf_bytes,
-                invoice_number=invoice_number,
-            )
-        except Exception as email_exc:
-            logger.error(
-                f"[Callback] Invoice email failed for {invoice_number}: {email_exc}"
-            )
+        # ── Send invoice email (after the response when *schedule* is given) ──
+        invoice_args = (
+            invoice_number,
+            user.full_name or user.username,
+            user.email,
+            payment_row.pages_purchased,
+            payment_row.payment_amount,
+            payment_row.currency or "BDT",
+            payment_row.paid_at,
+        )
+        if schedule is not None:
+            schedule(send_payment_invoice, *invoice_args)
+        else:
+            send_payment_invoice(*invoice_args)
 
         return {"success": True, "message": "Payment confirmed and subscription activated"}
 
@@ -253,20 +306,89 @@ def process_payment_callback(
         return {"success": False, "message": "Internal processing error"}
 
 
+# Exactly the PaymentHistoryItem fields — the JSONB payloads stay in the table
+_HISTORY_COLUMNS = (
+    PaymentHistory.id, PaymentHistory.user_id, PaymentHistory.invoice_number,
+    PaymentHistory.pages_purchased, PaymentHistory.payment_amount, PaymentHistory.currency,
+    PaymentHistory.status, PaymentHistory.created_at, PaymentHistory.updated_at,
+    PaymentHistory.paid_at,
+)
+
+
+def _payment_history_page(
+    db: Session,
+    filters: list,
+    skip: int,
+    limit: int,
+    after: Optional[CursorKey],
+) -> dict:
+    """
+    Newest-first page of payments matching *filters* plus the unpaginated total,
+    shaped like PaymentHistoryResponse.
+
+    With *after* (the (created_at, id) of the last row already seen) the page
+    is seeked with a row comparison on the index instead of an OFFSET scan.
+    Rows come back as plain column dicts — no ORM instances are built.
+    """
+    # Uncorrelated scalar subquery: the full count rides along with the page
+    total_sq = (
+        select(func.count(PaymentHistory.id)).where(*filters)
+        .correlate(None).scalar_subquery()
+    )
+    stmt = select(*_HISTORY_COLUMNS, total_sq.label("total")).where(*filters)
+    if after is not None:
+        stmt = stmt.where(tuple_(PaymentHistory.created_at, PaymentHistory.id) < after)
+    rows = db.execute(
+        stmt.order_by(PaymentHistory.created_at.desc(), PaymentHistory.id.desc())
+        .offset(skip).limit(limit + 1)
+    ).all()
+    if rows:
+        total = rows[0].total
+    else:
+        total = db.execute(select(total_sq)).scalar() if skip or after else 0
+
+    rows, has_more = split_page(rows, limit)
+    payments = []
+    for row in rows:
+        payment = row._asdict()
+        del payment["total"]
+        payments.append(payment)
+    return {"total": total, "payments": payments, "next_cursor": next_cursor(rows, has_more)}
+
+
+def _status_filters(status_filter: Optional[str]) -> list:
+    """WHERE clauses for an optional status filter; an unknown status filters nothing."""
+    if status_filter:
+        try:
+            return [PaymentHistory.status == PaymentStatus(status_filter)]
+        except ValueError:
+            pass  # ignore invalid filter value
+    return []
+
+
+def payment_history_stamp(db: Session, status_filter: Optional[str] = None) -> tuple:
+    """
+    (count, max id, max updated_at) over the payments the admin listing would
+    show — changes on every new, removed, or updated payment.
+    """
+    return tuple(db.execute(
+        select(
+            func.count(PaymentHistory.id),
+            func.max(PaymentHistory.id),
+            func.max(PaymentHistory.updated_at),
+        ).where(*_status_filters(status_filter))
+    ).one())
+
+
 def get_user_payment_history(
     db: Session,
     user_id: int,
     skip: int = 0,
     limit: int = 50,
-) -> PaymentHistoryResponse:
+    after: Optional[CursorKey] = None,
+) -> dict:
     """Return paginated payment history for a single user."""
-    query = db.query(PaymentHistory).filter(PaymentHistory.user_id == user_id)
-    total = query.count()
-    rows = query.order_by(PaymentHistory.created_at.desc()).offset(skip).limit(limit).all()
-    return PaymentHistoryResponse(
-        total=total,
-        payments=[PaymentHistoryItem.from_orm(r) for r in rows],
-    )
+    return _payment_history_page(db, [PaymentHistory.user_id == user_id], skip, limit, after)
 
 
 def get_all_payment_history(
@@ -274,17 +396,7 @@ def get_all_payment_history(
     skip: int = 0,
     limit: int = 100,
     status_filter: Optional[str] = None,
-) -> PaymentHistoryResponse:
+    after: Optional[CursorKey] = None,
+) -> dict:
     """Return paginated payment history across all users (super_user view)."""
-    query = db.query(PaymentHistory)
-    if status_filter:
-        try:
-            query = query.filter(PaymentHistory.status == PaymentStatus(status_filter))
-        except ValueError:
-            pass  # ignore invalid filter value
-    total = query.count()
-    rows = query.order_by(PaymentHistory.created_at.desc()).offset(skip).limit(limit).all()
-    return PaymentHistoryResponse(
-        total=total,
-        payments=[PaymentHistoryItem.from_orm(r) for r in rows],
-    )
+    return _payment_history_page(db, _status_filters(status_filter), skip, limit, after)
@@ -1,5 +1,7 @@
 """Subscription service — free-trial & paid-page quota management for regular users."""
 import logging
+from functools import lru_cache
+
 from sqlalchemy.orm import Session
 
 from app.models.user import User, UserRole
@@ -58,6 +60,9 @@ def get_subscription_status(user: User) -> SubscriptionStatus:
     )
 
 
+# Pure function of *pages*, hit on every keystroke of the checkout form.
+# The cached model is shared, so callers must not mutate it.
+@lru_cache(maxsize=1024)
 def calculate_subscription_cost(pages: int) -> SubscriptionCostResponse:
     """Return cost breakdown for *pages* pages."""
     return SubscriptionCostResponse(
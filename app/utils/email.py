@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import logging
+import queue
 import smtplib
+import time
 from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
@@ -24,6 +26,70 @@ def _build_smtp_connection() -> smtplib.SMTP:
     return conn
 
 
+class SMTPPool:
+    """
+    Small pool of authenticated SMTP sessions.
+
+    TCP + STARTTLS + AUTH costs seconds per connection, so sessions are kept
+    open and reused across sends. A session idle for longer than
+    *idle_check_seconds* is probed with NOOP before reuse; dead sessions are
+    discarded and a fresh one is opened transparently.
+    """
+
+    def __init__(self, size: int = 2, idle_check_seconds: float = 30.0):
+        self._idle = queue.LifoQueue(maxsize=size)   # (conn, last_used_at)
+        self._idle_check_seconds = idle_check_seconds
+
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return _build_smtp_connection()
+            if time.monotonic() - last_used < self._idle_check_seconds:
+                return conn
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except (smtplib.SMTPException, OSError):
+                # A reset socket surfaces as OSError, not an SMTP error
+                pass
+            self._discard(conn)
+
+    def _checkin(self, conn: smtplib.SMTP) -> None:
+        try:
+            self._idle.put_nowait((conn, time.monotonic()))
+        except queue.Full:
+            self._discard(conn)
+
+    @staticmethod
+    def _discard(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    def sendmail(self, from_addr: str, to_addrs: list, msg: str) -> None:
+        """Send through a pooled session, reconnecting once if the server dropped it."""
+        conn = self._checkout()
+        try:
+            conn.sendmail(from_addr, to_addrs, msg)
+        except smtplib.SMTPServerDisconnected:
+            conn = _build_smtp_connection()
+            try:
+                conn.sendmail(from_addr, to_addrs, msg)
+            except Exception:
+                self._discard(conn)
+                raise
+        except Exception:
+            self._discard(conn)
+            raise
+        self._checkin(conn)
+
+
+_smtp_pool = SMTPPool(size=settings.SMTP_POOL_SIZE)
+
+
 def send_email(
     to: str,
     subject: str,
@@ -62,8 +128,7 @@ def send_email(
             )
             msg.attach(part)
 
-        with _build_smtp_connection() as conn:
-            conn.sendmail(settings.EMAIL_FROM, [to], msg.as_string())
+        _smtp_pool.sendmail(settings.EMAIL_FROM, [to], msg.as_string())
 
         logger.info(f"[Email] Sent '{subject}' → {to}")
         return True
@@ -1,6 +1,7 @@
 """Enterprise invoice PDF generator - uses fpdf2 (already in requirements.txt)."""
 from __future__ import annotations
 
+import hashlib
 from datetime import date, datetime, timezone
 from typing import Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
@@ -8,6 +9,7 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from fpdf import FPDF
 
 from app.models.enterprise import Enterprise, EnterprisePaymentStatus
+from app.utils.lru import BoundedLRU
 
 
 def _resolve_tz(tz_name: str) -> ZoneInfo:
@@ -252,3 +254,51 @@ def generate_enterprise_invoice_pdf(
     if isinstance(raw, (bytes, bytearray)):
         return bytes(raw)
     return raw.encode('latin-1')
+
+
+# ── Rendered invoice cache ───────────────────────────────────────────────────
+# An invoice is a pure function of the enterprise row, so repeat downloads of
+# an unchanged contract reuse the bytes. The key carries updated_at (bumped on
+# every write), so any edit renders afresh; the TTL bounds how stale the
+# "generated on" timestamp printed in the header can get.
+_INVOICE_CACHE_MAX = 256
+_INVOICE_CACHE_TTL = 300.0
+_invoice_cache = BoundedLRU(_INVOICE_CACHE_MAX, ttl=_INVOICE_CACHE_TTL)
+
+
+def _invoice_key(enterprise: Enterprise, creator_name: str, display_timezone: str) -> tuple:
+    """Everything the rendered invoice depends on, apart from the print time."""
+    return (
+        enterprise.id, display_timezone, enterprise.updated_at,
+        enterprise.pages_used, creator_name,
+    )
+
+
+def invoice_etag(enterprise: Enterprise, creator_name: str = "", display_timezone: str = "UTC") -> str:
+    """
+    Weak ETag for an invoice — changes whenever the rendered content would.
+    Weak because the PDF embeds its print time, so the same key does not
+    give byte-identical bodies.
+    """
+    digest = hashlib.blake2b(
+        repr(_invoice_key(enterprise, creator_name, display_timezone)).encode(), digest_size=16
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def generate_enterprise_invoice_pdf_cached(
+    enterprise: Enterprise,
+    creator_name: str = "",
+    display_timezone: str = "UTC",
+) -> bytes:
+    """Same as generate_enterprise_invoice_pdf, served from a short-lived in-process cache."""
+    key = _invoice_key(enterprise, creator_name, display_timezone)
+    cached = _invoice_cache.get(key)
+    if cached is not None:
+        return cached
+
+    pdf_bytes = generate_enterprise_invoice_pdf(
+        enterprise, creator_name=creator_name, display_timezone=display_timezone,
+    )
+    _invoice_cache.put(key, pdf_bytes)
+    return pdf_bytes
@@ -0,0 +1,24 @@
+"""Conditional-GET helpers for listings that are polled but rarely change"""
+import hashlib
+
+from fastapi import Request
+
+# Revalidate on every poll — the 304 path is what saves the body
+LISTING_CACHE_CONTROL = "private, no-cache"
+
+
+def listing_etag(*parts) -> str:
+    """Strong ETag over a listing's change stamp and the page parameters."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names *etag* (weak comparison)."""
+    if_none_match = request.headers.get("if-none-match", "")
+    wanted = _opaque_tag(etag)
+    return any(_opaque_tag(tag.strip()) == wanted for tag in if_none_match.split(","))
@@ -3,8 +3,13 @@ import os
 import uuid
 from pathlib import Path
 from datetime import datetime, timezone
+from typing import Optional
+from fastapi import UploadFile
 from app.core.config import settings
 
+# Large enough to keep threadpool hops per upload low, small enough to bound over-reads
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 def generate_unique_filename(original_filename: str) -> str:
     """
@@ -28,6 +33,42 @@ def generate_unique_filename(original_filename: str) -> str:
     return unique_filename
 
 
+async def read_upload_limited(upload: UploadFile, max_bytes: int, hasher=None) -> Optional[bytes]:
+    """
+    Read an uploaded file, giving up as soon as it exceeds *max_bytes*.
+    Returns the content, or None if the file is too large. When the size is
+    known up front the file is read in one go; otherwise it is read in chunks
+    and an oversize upload is rejected after at most one chunk past the limit
+    instead of after being read into memory in full.
+
+    If *hasher* (a hashlib object) is given it is fed each chunk as it arrives,
+    so the digest is ready without a second pass over the content.
+    """
+    if upload.size is not None:
+        if upload.size > max_bytes:
+            return None
+        # Starlette records the size while spooling the part, so the limit is
+        # already settled — one read allocates the content once, instead of a
+        # chunk list plus the joined copy holding the file twice at peak.
+        content = await upload.read()
+        if len(content) > max_bytes:
+            return None
+        if hasher is not None:
+            hasher.update(content)
+        return content
+
+    chunks = []
+    total = 0
+    while chunk := await upload.read(_UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > max_bytes:
+            return None
+        if hasher is not None:
+            hasher.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
 def save_uploaded_file(file_content: bytes, original_filename: str) -> str:
     """
     Save uploaded file to disk and return the file path
@@ -39,9 +80,7 @@ def save_uploaded_file(file_content: bytes, original_filename: str) -> str:
     Returns:
         str: Relative path to saved file (e.g., 'app/uploads/20260219_123456_abc123_document.pdf')
     """
-    # Ensure uploads directory exists
     upload_dir = Path(settings.UPLOAD_DIR)
-    upload_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate unique filename
     unique_filename = generate_unique_filename(original_filename)
@@ -49,8 +88,14 @@ def save_uploaded_file(file_content: bytes, original_filename: str) -> str:
     # Full path to save file
     file_path = upload_dir / unique_filename
     
-    # Write file to disk
-    with open(file_path, 'wb') as f:
+    # Write file to disk — the directory is created on first use only, not
+    # re-checked with a mkdir syscall on every upload
+    try:
+        f = open(file_path, 'wb')
+    except FileNotFoundError:
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        f = open(file_path, 'wb')
+    with f:
         f.write(file_content)
     
     # Return relative path as string
@@ -1,5 +1,9 @@
+import atexit
+import copy
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -135,12 +139,48 @@ class StructuredFileHandler(logging.FileHandler):
 
 # ── setup ─────────────────────────────────────────────────────────────────────
 
+_QUEUE_MAX = 10_000
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread; never blocks the caller."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process, so exc_info can travel as-is — only freeze the message
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # Drop rather than stall a request when the writer falls behind
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 def setup_file_logging(log_level: int = logging.WARNING) -> logging.Logger:
     """Configure structured file + console logging.
 
     File handler records WARNING and above (to reduce noise).
     Console handler uses *log_level* (INFO by default when called from service).
+    Both run on a QueueListener thread; loggers only enqueue the record.
     """
+    global _listener
+
     log_dir = Path(__file__).parent.parent / "logs"
     log_dir.mkdir(exist_ok=True)
     log_file_path = log_dir / "logs.txt"
@@ -156,7 +196,15 @@ def setup_file_logging(log_level: int = logging.WARNING) -> logging.Logger:
         logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
     )
 
-    logging.basicConfig(level=log_level, handlers=[file_handler, console_handler], force=True)
+    # Re-configuring replaces the previous listener (and flushes what it had queued)
+    _stop_listener()
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=_QUEUE_MAX)
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+    logging.basicConfig(level=log_level, handlers=[_NonBlockingQueueHandler(log_queue)], force=True)
 
     logger = logging.getLogger(__name__)
     logger.warning("OCR Pipeline SESSION STARTED at %s", datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"))
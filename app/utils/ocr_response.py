@@ -0,0 +1,93 @@
+"""Shape OCR results into the response bodies shared by the OCR endpoints"""
+from operator import itemgetter
+from typing import Any, Dict, List
+
+# Per-page fields copied into every formatted response, fetched in one C call
+_page_fields = itemgetter("page_number", "confidence", "character_count", "text")
+
+
+def build_pages_info(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-page breakdown of a result; a single-page result is reported from its full text."""
+    pages_data = result.get('pages_data')
+    if pages_data and len(pages_data) > 1:
+        return [
+            {
+                "page_number": page_number,
+                "confidence": round(page_confidence, 2),
+                "character_count": character_count,
+                "text": page_text,
+            }
+            for page_number, page_confidence, character_count, page_text in map(_page_fields, pages_data)
+        ]
+
+    text = result['text']
+    return [{
+        "page_number": 1,
+        "confidence": round(result['confidence'], 2),
+        "character_count": len(text),
+        "text": text,
+    }]
+
+
+def format_plain_text_response(result: Dict[str, Any]) -> Dict[str, str]:
+    """Format response for plain text output mode"""
+    return {"text": result['text']}
+
+
+def format_page_by_page_response(result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Format response for page-by-page text output mode with detailed page info"""
+    pages_data = result.get('pages_data')
+    confidence = round(result['confidence'], 2)
+
+    if pages_data and len(pages_data) > 1:
+        # Multi-page format with detailed information
+        return {
+            "pages_info": build_pages_info(result),
+            "summary": {
+                "total_pages": result['pages'],
+                "average_confidence": confidence,
+                "total_characters": sum(map(itemgetter("character_count"), pages_data)),
+                "processing_details": f"{result['pages']} pages processed with {result['confidence']:.2f}% average confidence"
+            }
+        }
+
+    # Single page format
+    text = result['text']
+    return {
+        "pages_info": build_pages_info(result),
+        "summary": {
+            "total_pages": 1,
+            "average_confidence": confidence,
+            "total_characters": len(text),
+            "processing_details": f"1 page processed with {result['confidence']:.2f}% confidence"
+        }
+    }
+
+
+def format_json_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Format response for JSON output mode with clean structured data"""
+
+    # Create clean JSON response
+    json_response = {
+        "text": result['text'],
+        "confidence": round(result['confidence'], 2),
+        "pages": result['pages'],
+        "languages": result['languages'],
+        "mode": result['mode'],
+        "engine": result['engine']
+    }
+
+    # Add page-by-page data if available
+    pages_data = result.get('pages_data')
+    if pages_data and len(pages_data) > 1:
+        json_response["pages_data"] = [
+            {
+                "page_number": page_number,
+                "text": page_text,
+                "confidence": round(page_confidence, 2),
+                "character_count": character_count,
+            }
+            for page_number, page_confidence, character_count, page_text in map(_page_fields, pages_data)
+        ]
+
+    return json_response
@@ -0,0 +1,41 @@
+"""Opaque keyset cursors for newest-first listings"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from app.errors.exceptions import BadRequestException
+
+# (created_at, id) of the last row a client has already seen
+CursorKey = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Pack a (created_at, id) position into a URL-safe token."""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[CursorKey]:
+    """Inverse of encode_cursor. Raises BadRequestException on a malformed token."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise BadRequestException(detail="Invalid pagination cursor")
+
+
+def split_page(rows: list, limit: int) -> Tuple[List, bool]:
+    """Split rows fetched with LIMIT limit + 1 into (page, has_more)."""
+    return rows[:limit], len(rows) > limit
+
+
+def next_cursor(items: list, has_more: bool) -> Optional[str]:
+    """Cursor for the page after *items*, or None when the peeked row showed it was the last."""
+    if not has_more or not items:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
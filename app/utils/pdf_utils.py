@@ -1,11 +1,44 @@
 import io
+import re
+from typing import Optional
+
 import pikepdf
 
+# Linearization dictionary — always the first object of a linearized ("fast web
+# view") PDF. It carries the document's page count as /N
+_LINEARIZED_DICT_RE = re.compile(rb"/Linearized\s[^>]*")
+_LINEARIZED_N_RE = re.compile(rb"/N\s+(\d+)")
+
+# The linearization dictionary has to sit within the first KB of the file
+_LINEARIZED_HEAD_BYTES = 1024
+
+
+def _linearized_dict(head: bytes) -> Optional[bytes]:
+    """Raw linearization dictionary entries, or None if the file is not linearized."""
+    match = _LINEARIZED_DICT_RE.search(head[:_LINEARIZED_HEAD_BYTES])
+    return match.group(0) if match else None
+
 
 def count_pdf_pages(file_bytes: bytes) -> int:
     """
     Cheaply count the number of pages in a PDF without rendering.
+    Quota is charged from this count, so it comes from qpdf's own page tree
+    walk — the same count process_file OCRs — rather than a byte heuristic.
     Returns the page count, or raises ValueError if the bytes are not a valid PDF.
     """
     with pikepdf.open(io.BytesIO(file_bytes)) as pdf:
         return len(pdf.pages)
+
+
+def linearized_page_count(head: bytes) -> Optional[int]:
+    """
+    Page count from the linearization dictionary in the first KB of a PDF,
+    or None if the file is not linearized. Lets a caller reject an upload
+    on page count before reading the rest of it. The value comes from the
+    uploader, so it is only fit for that early rejection — never bill from it.
+    """
+    linearized = _linearized_dict(head)
+    if linearized is None:
+        return None
+    match = _LINEARIZED_N_RE.search(linearized)
+    return int(match.group(1)) if match else None
@@ -0,0 +1,72 @@
+"""In-process sliding-window rate limiting for public endpoints"""
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class RateLimiter:
+    """Allow at most *max_calls* per *period* seconds for each key.
+
+    State is per worker process, which is enough to stop a single client from
+    tying up SMTP and the database with repeated hits on one email.
+    """
+
+    # Idle keys are swept once the table grows past this many entries
+    _SWEEP_THRESHOLD = 10_000
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._hits: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str) -> Optional[float]:
+        """Record a call for *key*. Returns seconds to wait if the limit is exceeded, else None."""
+        now = time.monotonic()
+        cutoff = now - self.period
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                if len(self._hits) >= self._SWEEP_THRESHOLD:
+                    self._sweep(cutoff)
+                hits = self._hits[key] = deque()
+            while hits and hits[0] <= cutoff:
+                hits.popleft()
+            if len(hits) >= self.max_calls:
+                return hits[0] - cutoff
+            hits.append(now)
+            return None
+
+    def _sweep(self, cutoff: float) -> None:
+        for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= cutoff]:
+            del self._hits[key]
+
+
+class RecentlySeen:
+    """Remembers keys for *ttl* seconds — used to absorb duplicate submissions."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def seen(self, key: str) -> bool:
+        """True if *key* was marked within the last *ttl* seconds."""
+        now = time.monotonic()
+        with self._lock:
+            marked_at = self._seen.get(key)
+            if marked_at is None:
+                return False
+            if now - marked_at < self.ttl:
+                return True
+            del self._seen[key]
+            return False
+
+    def mark(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._seen) >= RateLimiter._SWEEP_THRESHOLD:
+                for stale in [k for k, t in self._seen.items() if now - t >= self.ttl]:
+                    del self._seen[stale]
+            self._seen[key] = now
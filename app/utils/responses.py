@@ -0,0 +1,19 @@
+"""JSON responses for rows that skip the response_model pass"""
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class RowJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse for plain column dicts. Writes UTC datetimes as `...Z`,
+    the way Pydantic does, so skipping the response_model leaves the JSON
+    identical to the validated path (bare orjson writes `...+00:00`).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z,
+        )